@@ -0,0 +1,51 @@
+# Authors ---------------------------------------------------------#
+#  Younes Tasra ~ https://younestasra-r4z3rsw0rd.github.io/        #
+#  Ayman Zerda  ~ https://aymanzerda-sudotime.github.io/           #
+#------------------------------------------------------------------#
+
+# Master Boot Record and FAT32 file system parser.
+#
+#   from fat32parser import ImageReader, decode_mbr
+#
+# The names below are imported from their module on first access, so importing the package
+# only loads what is used: decoding an MBR or a boot sector needs nothing but the standard
+# library, NumPy is imported with the modules working on the FAT array (fat, recovery, fsck,
+# fragmentation, timeline, clustermap, search) and the presentation libraries with the command line interface only.
+
+_EXPORTS = {
+    'image': ('ImageReader', 'ImageLayout', 'raw2hex'),
+    'aio': ('AsyncImageReader', 'analyzePartitionsAsync', 'imageAnalysisAsync', 'pipelinedAnalyzePartitions', 'pipelinedImageAnalysis'),
+    'structures': ('MBR', 'PartitionEntry', 'BootSector', 'FSInfo', 'decode_mbr', 'decode_boot_sector', 'decode_fsinfo',
+                   'GPTHeader', 'GPTPartitionEntry', 'decode_gpt_header', 'decode_gpt_entry',
+                   'ValidationWarning', 'validateMBR', 'validateBootSector', 'validateFSInfo'),
+    'partitions': ('Partition', 'PartitionTable', 'discoverPartitions'),
+    'fat': ('FAT',),
+    'directory': ('DirEntry', 'Volume'),
+    'index': ('PathIndex',),
+    'recovery': ('scanDeleted',),
+    'carving': ('CarvedFile', 'carveVolume'),
+    'clustermap': ('ClusterMap', 'Whois', 'whois'),
+    'search': ('SearchHit', 'searchVolume'),
+    'hashing': ('FileHash', 'hashFile', 'hashVolume', 'hashImage'),
+    'fsck': ('FsckReport', 'checkVolume'),
+    'fragmentation': ('FragmentationReport', 'fragmentationReport'),
+    'timeline': ('TimelineEntry', 'timelineEntries', 'writeBodyfile', 'writeTimeline'),
+    'synthetic': ('ImageSpec', 'SyntheticImage', 'generateImage'),
+    'profiling': ('Profiler', 'StageProfile'),
+    'analysis': ('PartitionAnalysis', 'ImageAnalysis', 'analyzePartition', 'analyzePartitions', 'imageAnalysis',
+                 'imageAnalysisToDict', 'analyzeImage', 'analyzeBatch', 'fat32Partitions'),
+}
+_MODULES = {name: module for module, names in _EXPORTS.items() for name in names}
+
+__all__ = list(_MODULES)
+
+def __getattr__(name):
+    if name not in _MODULES:
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+    from importlib import import_module
+    value = getattr(import_module('.' + _MODULES[name], __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
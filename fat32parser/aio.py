@@ -0,0 +1,284 @@
+import asyncio
+import bisect
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .analysis import ImageAnalysis, PartitionAnalysis, treeStats
+from .constants import GPT_PROTECTIVE_TYPE, SECTOR_SIZE
+from .directory import Volume
+from .image import ImageLayout, io_counters
+from .partitions import GPT_MAX_ENTRIES, GPT_MAX_ENTRY_SIZE, GPT_SIGNATURE, discoverPartitions, partitionInImage
+from .profiling import NULL_PROFILER
+from .structures import (GPT_ENTRY_STRUCT, GPT_HEADER_STRUCT, activeFAT, decode_fsinfo, decode_gpt_entry, decode_gpt_header,
+                         decode_mbr, validateBootSector, validateFSInfo, validateMBR)
+
+# ------------------------------------------------------------ #
+# Asynchronous reads for images on slow (network) storage      #
+# ------------------------------------------------------------ #
+
+PARTITION_TABLE_SECTORS = 34    # MBR, GPT header and the 128 entries of a standard GPT entry array
+PARTITION_HEAD_SECTORS = 8      # Boot sector, FSINFO (sector 1) and backup boot sector (sector 6) of a FAT32 partition
+PREFETCH_CHUNK_SIZE = 1 << 20   # Large regions (FATs) are fetched as concurrent requests of this size
+
+class AsyncImageReader(ImageLayout):
+    # Reader for images whose reads are latency-bound (NFS, object-store FUSE mounts). The regions the parser is
+    # about to need are prefetched with concurrent requests (at most `max_in_flight` of them in flight) and kept
+    # in a cache, the synchronous read() the parser uses then returns memoryview slices of the cached blocks.
+    # Any read outside of the cache is a blocking read (a cache miss in image.io_counters). `latency` (seconds) is
+    # added to every request to test the pipeline against a local file.
+
+    def __init__(self, image_path, max_in_flight=16, latency=0.0, chunk_size=PREFETCH_CHUNK_SIZE):
+        self.path = image_path
+        self._fd = os.open(image_path, os.O_RDONLY)
+        self.size = os.fstat(self._fd).st_size
+        if self.size == 0:
+            os.close(self._fd)
+            raise ValueError(f"The image '{image_path}' is empty")
+        self.max_in_flight = max(1, max_in_flight)
+        self.latency = latency
+        self.chunk_size = chunk_size
+        self._executor = ThreadPoolExecutor(max_workers=self.max_in_flight)
+        self._semaphore = None
+        self._starts = []       # Sorted offsets of the cached blocks
+        self._blocks = {}       # offset -> [data, references]
+        self._longest = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._fd is None:
+            return
+        self._executor.shutdown()
+        self._blocks.clear()
+        self._starts.clear()
+        os.close(self._fd)
+        self._fd = None
+
+    def fileno(self):
+        return self._fd
+
+    def _pread_into(self, view, offset):
+        done = 0
+        while done < len(view):
+            data = os.pread(self._fd, len(view) - done, offset + done)
+            if not data:
+                break
+            view[done:done+len(data)] = data
+            done += len(data)
+        return done
+
+    async def fetch(self, offset, view):
+        # One request: fills `view` with the bytes at `offset`, waits for a free slot first
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+        async with self._semaphore:
+            if self.latency:
+                await asyncio.sleep(self.latency)
+            count = await asyncio.get_running_loop().run_in_executor(self._executor, self._pread_into, view, offset)
+        io_counters.read_syscalls += 1
+        io_counters.bytes_read += count
+        return count
+
+    async def prefetch(self, offset, size):
+        # Caches [offset, offset+size) (clipped to the image), fetched as concurrent chunks of at most chunk_size bytes.
+        # Every prefetch of an offset must be paired with an evict() of that offset.
+        size = max(0, min(size, self.size - offset))
+        if offset in self._blocks and len(self._blocks[offset][0]) >= size:
+            self._blocks[offset][1] += 1
+            return
+        data = bytearray(size)
+        view = memoryview(data)
+        chunks = [view[start:start+self.chunk_size] for start in range(0, size, self.chunk_size)]
+        counts = await asyncio.gather(*(self.fetch(offset + i*self.chunk_size, chunk) for i, chunk in enumerate(chunks)))
+        for chunk in chunks:
+            chunk.release()
+        view.release()
+        if sum(counts) < size:
+            del data[sum(counts):]     # The image shrank while being read
+        block = self._blocks.get(offset)
+        if block is not None:       # Prefetched by another task (keep the longest block)
+            block[0] = max(block[0], data, key=len)
+            block[1] += 1
+        else:
+            self._blocks[offset] = [data, 1]
+            bisect.insort(self._starts, offset)
+        self._longest = max(self._longest, len(data))
+
+    async def prefetch_many(self, regions):
+        # regions: [(offset, size), ...], all fetched concurrently
+        await asyncio.gather(*(self.prefetch(offset, size) for offset, size in regions))
+
+    def evict(self, offset):
+        block = self._blocks.get(offset)
+        if block is None:
+            return
+        block[1] -= 1
+        if block[1] <= 0:
+            del self._blocks[offset]
+            del self._starts[bisect.bisect_left(self._starts, offset)]
+
+    def _cached(self, offset, size):
+        # The cached block holding [offset, offset+size), blocks ending at the end of the image hold any longer read
+        i = bisect.bisect_right(self._starts, offset) - 1
+        while i >= 0 and self._starts[i] + self._longest > offset:
+            start = self._starts[i]
+            data = self._blocks[start][0]
+            if offset + size <= start + len(data) or (start + len(data) >= self.size and offset <= start + len(data)):
+                return start, data
+            i -= 1
+        return None, None
+
+    def read(self, offset, size=None):
+        size = max(0, self.size - offset) if size is None else size
+        io_counters.reads += 1
+        start, data = self._cached(offset, size)
+        if data is not None:
+            io_counters.cache_hits += 1
+            return memoryview(data)[offset-start:offset-start+size]
+        io_counters.cache_misses += 1
+        if self.latency:
+            time.sleep(self.latency)
+        data = os.pread(self._fd, max(0, min(size, self.size - offset)), offset)
+        io_counters.read_syscalls += 1
+        io_counters.bytes_read += len(data)
+        return memoryview(data)
+
+def _partitionHeads(reader, mbr):
+    # Start sectors of the partitions announced by the (already prefetched) partition table sectors: the primary MBR
+    # partitions and the first EBR, or the entries of the GPT. The EBR chain itself can only be followed one EBR at a time.
+    if not any(entry.type == GPT_PROTECTIVE_TYPE for entry in mbr.partitions):
+        return [entry.start_lba for entry in mbr.partitions if entry.start_lba and entry.type]
+    data = reader.sector(1)
+    if len(data) < GPT_HEADER_STRUCT.size or bytes(data[:8]) != GPT_SIGNATURE:
+        return []
+    header = decode_gpt_header(data)
+    if not GPT_ENTRY_STRUCT.size <= header.entry_size <= GPT_MAX_ENTRY_SIZE:
+        return []
+    count = min(header.num_entries, GPT_MAX_ENTRIES)
+    entries = reader.read(header.entries_lba*SECTOR_SIZE, count*header.entry_size)
+    heads = []
+    for index in range(len(entries) // header.entry_size):
+        entry = decode_gpt_entry(entries, index*header.entry_size)
+        if entry.type_guid != bytes(16) and entry.first_lba*SECTOR_SIZE < reader.size:
+            heads.append(entry.first_lba)
+    entries.release()
+    return heads
+
+async def discoverPartitionsAsync(reader):
+    # Partition table sectors first, then the heads of every announced partition in one round of concurrent requests,
+    # so that discoverPartitions (FAT32 detection of GPT partitions) is served from the cache.
+    await reader.prefetch(0, PARTITION_TABLE_SECTORS*SECTOR_SIZE)
+    mbr = decode_mbr(reader.mbr())
+    heads = sorted(set(_partitionHeads(reader, mbr)))
+    await reader.prefetch_many([(lba*SECTOR_SIZE, PARTITION_HEAD_SECTORS*SECTOR_SIZE) for lba in heads])
+    table = discoverPartitions(reader, mbr)
+    logical = sorted({partition.start_lba for partition in table.partitions} - set(heads))
+    await reader.prefetch_many([(lba*SECTOR_SIZE, PARTITION_HEAD_SECTORS*SECTOR_SIZE) for lba in logical])
+    return mbr, table
+
+async def walkAsync(reader, volume, visit):
+    # Breadth-first walk of the directory tree by max_in_flight concurrent workers: the runs of a directory are
+    # fetched concurrently, decoded, evicted, and its subdirectories queued. visit(entries) is called once per directory.
+    root = volume.boot_sector.root_cluster
+    visited = {root}
+    queue = asyncio.Queue()
+    queue.put_nowait((root, '/'))
+
+    async def worker():
+        while True:
+            cluster_number, parent_path = await queue.get()
+            try:
+                regions = [(volume.cluster_offset(first), count*volume.cluster_size) for first, count in volume.fat.runs(cluster_number)]
+                await reader.prefetch_many(regions)
+                try:
+                    entries = list(volume.iter_directory(cluster_number, parent_path))
+                finally:
+                    for offset, _ in regions:
+                        reader.evict(offset)
+                visit(entries)
+                for entry in entries:
+                    if entry.is_directory and entry.first_cluster not in visited:
+                        visited.add(entry.first_cluster)
+                        queue.put_nowait((entry.first_cluster, entry.path))
+            finally:
+                queue.task_done()
+
+    workers = [asyncio.create_task(worker()) for _ in range(reader.max_in_flight)]
+    joined = asyncio.create_task(queue.join())
+    try:
+        await asyncio.wait([joined, *workers], return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for task in [joined, *workers]:
+            task.cancel()
+        results = await asyncio.gather(joined, *workers, return_exceptions=True)
+    for result in results:
+        if isinstance(result, Exception):
+            raise result
+
+async def analyzePartitionAsync(reader, number, partition_lba, scan=False):
+    # Same record as analysis.analyzePartition, the partition head is expected to be prefetched already
+    volume = Volume(reader, partition_lba, number=number)
+    fsinfo = decode_fsinfo(reader.fsinfo(partition_lba, volume.boot_sector.fsinfo_sector))
+    active_fat = fat_entries = fat_stats = tree_stats = None
+    if scan:
+        offset = reader.fat_offset(partition_lba, volume.boot_sector, activeFAT(volume.boot_sector))
+        await reader.prefetch(offset, volume.boot_sector.fat_length)
+        try:
+            active_fat, fat_entries, fat_stats = volume.fat.index, len(volume.fat), volume.fat.stats()
+        finally:
+            reader.evict(offset)
+        tree_stats = treeStats(())
+        await walkAsync(reader, volume, lambda entries: treeStats(entries, tree_stats))
+    warnings = validateBootSector(volume.boot_sector) + validateFSInfo(fsinfo)
+    return PartitionAnalysis(number, partition_lba, volume.boot_sector, fsinfo, active_fat, fat_entries, fat_stats, tree_stats, warnings)
+
+async def analyzePartitionsAsync(reader, partitions, scan=None):
+    # Partition heads are fetched concurrently, then the partitions are analyzed concurrently (results in partition order)
+    scan = scan or ()
+    heads = [(partition_lba*SECTOR_SIZE, PARTITION_HEAD_SECTORS*SECTOR_SIZE) for _, partition_lba in partitions]
+    await reader.prefetch_many(heads)
+    try:
+        results = await asyncio.gather(*(analyzePartitionAsync(reader, number, partition_lba, number in scan) for number, partition_lba in partitions))
+    finally:
+        for offset, _ in heads:
+            reader.evict(offset)
+    return {result.number: result for result in results}
+
+async def imageAnalysisAsync(reader, selected=None, scan=False, mbr_only=False, profiler=NULL_PROFILER):
+    # The partitions are analyzed concurrently, they are profiled as a single stage
+    with profiler.stage("mbr"):
+        mbr, table = await discoverPartitionsAsync(reader)
+    partitions = []
+    if not mbr_only:
+        partitions = [(partition.number, partition.start_lba) for partition in table.partitions
+                      if partition.start_lba != 0 and 'FAT32' in partition.file_system and partitionInImage(reader, partition)
+                      and (not selected or selected == str(partition.number))]
+    with profiler.stage("partitions"):
+        analyses = await analyzePartitionsAsync(reader, partitions, scan={number for number, _ in partitions} if scan else None)
+    return ImageAnalysis(reader.path, mbr, table, list(analyses.values()), validateMBR(mbr) + table.warnings)
+
+# Synchronous entry points, same results as analysis.analyzePartitions and analysis.imageAnalysis
+
+def pipelinedAnalyzePartitions(image_path, partitions, scan=None, max_in_flight=16, latency=0.0, profiler=NULL_PROFILER):
+    async def run():
+        async with AsyncImageReader(image_path, max_in_flight, latency) as reader:
+            with profiler.stage("partitions"):
+                return await analyzePartitionsAsync(reader, partitions, scan)
+    return asyncio.run(run())
+
+def pipelinedImageAnalysis(image_path, selected=None, scan=False, mbr_only=False, max_in_flight=16, latency=0.0, profiler=NULL_PROFILER):
+    async def run():
+        async with AsyncImageReader(image_path, max_in_flight, latency) as reader:
+            return await imageAnalysisAsync(reader, selected, scan, mbr_only, profiler)
+    return asyncio.run(run())
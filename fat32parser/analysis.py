@@ -0,0 +1,150 @@
+import glob
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from .directory import Volume
+from .image import ImageReader
+from .partitions import discoverPartitions, partitionInImage
+from .profiling import NULL_PROFILER
+from .structures import (bootable, clusterCount, clusterSize, decode_fsinfo, decode_mbr, fileSys, firstDataSector,
+                         validateBootSector, validateFSInfo, validateMBR)
+
+# ------------------------------------------------- #
+# Per-partition analysis (runs in worker processes) #
+# ------------------------------------------------- #
+
+PartitionAnalysis = namedtuple('PartitionAnalysis', [
+    'number', 'partition_lba', 'boot_sector', 'fsinfo', 'active_fat', 'fat_entries', 'fat_stats', 'tree_stats', 'warnings',
+])
+
+ImageAnalysis = namedtuple('ImageAnalysis', ['image', 'mbr', 'partition_table', 'partitions', 'warnings'])
+
+def treeStats(entries, stats=None):
+    # Files, directories and bytes of the walked entries (added to `stats` if given)
+    stats = {"Files": 0, "Directories": 0, "Bytes": 0} if stats is None else stats
+    for entry in entries:
+        if entry.is_directory:
+            stats["Directories"] += 1
+        else:
+            stats["Files"] += 1
+            stats["Bytes"] += entry.size
+    return stats
+
+def analyzePartition(image_path, number, partition_lba, scan=False, profiler=NULL_PROFILER):
+    # Decodes the boot sector and FSINFO of a partition and, if `scan` is set, loads its FAT and walks
+    # its directory tree. Only picklable records are returned so that it can run in a process pool.
+    with ImageReader(image_path) as image:
+        with profiler.stage("partition {} boot sector".format(number)):
+            volume = Volume(image, partition_lba, number=number)
+        with profiler.stage("partition {} fsinfo".format(number)):
+            fsinfo = decode_fsinfo(image.fsinfo(partition_lba, volume.boot_sector.fsinfo_sector))
+        active_fat = fat_entries = fat_stats = tree_stats = None
+        if scan:
+            with profiler.stage("partition {} fat".format(number)):
+                active_fat, fat_entries, fat_stats = volume.fat.index, len(volume.fat), volume.fat.stats()
+            with profiler.stage("partition {} directory walk".format(number)):
+                tree_stats = treeStats(volume.walk())
+    warnings = validateBootSector(volume.boot_sector) + validateFSInfo(fsinfo)
+    return PartitionAnalysis(number, partition_lba, volume.boot_sector, fsinfo, active_fat, fat_entries, fat_stats, tree_stats, warnings)
+
+def analyzePartitions(image_path, partitions, scan=None, jobs=1, profiler=NULL_PROFILER):
+    # partitions: [(number, partition_lba), ...], scan: set of the partition numbers to scan.
+    # Results are returned in partition order whatever the order in which the workers finish.
+    # The stages of worker processes cannot be profiled, partitions are analyzed in this process when profiling.
+    scan = scan or ()
+    if jobs > 1 and len(partitions) > 1 and not profiler.enabled:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = [pool.submit(analyzePartition, image_path, number, partition_lba, number in scan) for number, partition_lba in partitions]
+            results = [future.result() for future in futures]
+    else:
+        results = [analyzePartition(image_path, number, partition_lba, number in scan, profiler) for number, partition_lba in partitions]
+    return {result.number: result for result in results}
+
+# ------------------------------------------------- #
+# Batch analysis of many images in one interpreter  #
+# ------------------------------------------------- #
+
+BATCH_EXTENSIONS = ('.001', '.dd', '.img', '.raw', '.bin')
+TEXT_FIELDS = ('oem', 'volume_label', 'fs_type')
+
+def record_to_dict(record):
+    # namedtuple -> JSON serializable dict (labels are decoded, other raw bytes are hex encoded)
+    result = {}
+    for name, value in record._asdict().items():
+        if isinstance(value, bytes):
+            value = value.decode('ascii', 'replace') if name in TEXT_FIELDS else value.hex()
+        elif hasattr(value, '_asdict'):
+            value = record_to_dict(value)
+        elif isinstance(value, (tuple, list)):
+            value = [record_to_dict(item) if hasattr(item, '_asdict') else item for item in value]
+        result[name] = value
+    return result
+
+def imageAnalysis(image_path, selected=None, scan=False, jobs=1, mbr_only=False, profiler=NULL_PROFILER):
+    # Builds the typed result model of an image: MBR, partition table (MBR/EBR or GPT), selected FAT32 partitions and validation warnings
+    with profiler.stage("mbr"), ImageReader(image_path) as image:
+        mbr = decode_mbr(image.mbr())
+        table = discoverPartitions(image, mbr)
+        partitions = []
+        if not mbr_only:
+            # Partitions beyond the end of a truncated image are skipped, the partition table warns about them
+            partitions = [(partition.number, partition.start_lba) for partition in table.partitions
+                          if partition.start_lba != 0 and 'FAT32' in partition.file_system and partitionInImage(image, partition)
+                          and (not selected or selected == str(partition.number))]
+    analyses = analyzePartitions(image_path, partitions, scan={number for number, _ in partitions} if scan else None, jobs=jobs, profiler=profiler)
+    return ImageAnalysis(image_path, mbr, table, list(analyses.values()), validateMBR(mbr) + table.warnings)
+
+def imageAnalysisToDict(analysis):
+    result = record_to_dict(analysis)
+    for i, entry in enumerate(result["mbr"]["partitions"]):
+        entry["bootable"] = bootable(analysis.mbr, i)
+        entry["file_system"] = fileSys(analysis.mbr, i)
+    if analysis.partition_table.gpt_header is not None:
+        result["partition_table"]["gpt_header"]["disk_guid"] = analysis.partition_table.gpt_header.guid
+    for partition, partition_analysis in zip(result["partitions"], analysis.partitions):
+        partition["cluster_size"] = clusterSize(partition_analysis.boot_sector)
+        partition["first_data_sector"] = firstDataSector(partition_analysis.boot_sector)
+        partition["cluster_count"] = clusterCount(partition_analysis.boot_sector)
+    return result
+
+def analyzeImage(image_path, scan=False):
+    # One result record per image. Errors are returned in the record instead of being raised,
+    # so that a corrupted image never aborts a batch.
+    try:
+        result = imageAnalysisToDict(imageAnalysis(image_path, scan=scan))
+        result["status"] = "ok"
+        return result
+    except Exception as e:
+        return {"image": image_path, "status": "error", "error": "{}: {}".format(type(e).__name__, e)}
+
+def batchImages(pattern):
+    # A directory is expanded to the disk images it contains, anything else is treated as a glob pattern
+    if os.path.isdir(pattern):
+        return sorted(os.path.join(pattern, name) for name in os.listdir(pattern)
+                      if name.lower().endswith(BATCH_EXTENSIONS) and os.path.isfile(os.path.join(pattern, name)))
+    return sorted(path for path in glob.glob(pattern, recursive=True) if os.path.isfile(path))
+
+def analyzeBatch(image_paths, scan=False, jobs=1):
+    # Yields the result record of every image as soon as it is ready (completion order)
+    if jobs <= 1:
+        for image_path in image_paths:
+            yield analyzeImage(image_path, scan)
+        return
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = {pool.submit(analyzeImage, image_path, scan): image_path for image_path in image_paths}
+        for future in as_completed(futures):
+            try:
+                yield future.result()
+            except Exception as e:     # The worker itself died (e.g. BrokenProcessPool)
+                yield {"image": futures[future], "status": "error", "error": "{}: {}".format(type(e).__name__, e)}
+
+def fat32Partitions(image, mbr, selected=None):
+    # Yields a Volume for every FAT32 partition of the image, primary, logical or GPT (or only for the selected partition number).
+    # Partitions beyond the end of a truncated image are skipped (see the warnings of discoverPartitions).
+    for partition in discoverPartitions(image, mbr).partitions:
+        if partition.start_lba == 0 or 'FAT32' not in partition.file_system or not partitionInImage(image, partition):
+            continue
+        if selected and selected != str(partition.number):
+            continue
+        yield Volume(image, partition.start_lba, number=partition.number)
@@ -0,0 +1,260 @@
+import argparse
+import hashlib
+import json
+import math
+import multiprocessing
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from .synthetic import SYNTHETIC_VERSION, ImageSpec, generateImage
+
+# ----------------------------------------------------------- #
+# Benchmarks: parser stages timed on synthetic FAT32 images   #
+# ----------------------------------------------------------- #
+
+#   python -m fat32parser.benchmark --preset all --output baseline.json
+#   python -m fat32parser.benchmark --preset all --baseline baseline.json
+
+PRESETS = {
+    'small': ImageSpec(size_mb=64, files=500),
+    'files': ImageSpec(size_mb=512, files=50000, file_size=2048, depth=3, fanout=8),
+    'fragmented': ImageSpec(size_mb=256, files=5000, fragmentation=0.3),
+    'deep': ImageSpec(size_mb=128, files=2000, depth=8, fanout=2),
+    'partitions': ImageSpec(size_mb=512, partitions=4, files=8000),
+    'large-clusters': ImageSpec(size_mb=1024, cluster_size=32768, files=2000, file_size=262144),
+}
+
+STAGES = ('mbr', 'boot_sector', 'fsinfo', 'fat_load', 'directory_walk', 'extraction')
+MIN_STAGE_TIME = 0.05       # Fast stages are run in a loop for at least this long, the time of one run is reported
+MAX_STAGE_LOOPS = 10000
+DEFAULT_TOLERANCE = 0.25
+DEFAULT_NOISE_FLOOR = 0.0005    # Seconds, slowdowns below it are never regressions
+
+def peakRSS():
+    # Peak resident set size in KiB: VmHWM on Linux (reset by resetPeakRSS), the getrusage peak elsewhere
+    try:
+        with open('/proc/self/status') as status:
+            for line in status:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+def resetPeakRSS():
+    # Linux only: sets VmHWM back to the current RSS, so that each stage reports its own peak
+    try:
+        with open('/proc/self/clear_refs', 'w') as clear_refs:
+            clear_refs.write('5')
+    except OSError:
+        pass
+
+def timeStage(function, repeat):
+    # Best time of `repeat` measures, a measure runs `function` enough times to last MIN_STAGE_TIME. Returns (seconds, result)
+    start = time.perf_counter()
+    result = function()
+    elapsed = time.perf_counter() - start
+    loops = min(MAX_STAGE_LOOPS, max(1, math.ceil(MIN_STAGE_TIME / elapsed))) if elapsed > 0 else MAX_STAGE_LOOPS
+    best = elapsed if loops == 1 else math.inf
+    for _ in range(repeat if loops > 1 else repeat - 1):
+        start = time.perf_counter()
+        for _ in range(loops):
+            result = function()
+        best = min(best, (time.perf_counter() - start) / loops)
+    return best, result
+
+def runScenario(image_path, stages=STAGES, repeat=3, workdir=None):
+    # Runs in a fresh process (see benchmarkScenario) so that the memory of a scenario does not depend on the previous ones
+    from .directory import Volume
+    from .fat import FAT
+    from .image import ImageReader
+    from .partitions import discoverPartitions
+    from .structures import decode_boot_sector, decode_fsinfo, decode_mbr
+
+    results = {}
+    def record(stage, function, unit_bytes, unit_items):
+        if stage not in stages:
+            return None
+        resetPeakRSS()
+        seconds, result = timeStage(function, repeat)
+        size, items = unit_bytes(result), unit_items(result)
+        results[stage] = {
+            "seconds": seconds, "bytes": size, "items": items,
+            "mb_per_second": size / seconds / 1e6 if seconds and size else None,
+            "items_per_second": items / seconds if seconds else None,
+            "peak_rss_kb": peakRSS(),
+        }
+        return result
+
+    with ImageReader(image_path) as image:
+        def partition_table():
+            return discoverPartitions(image, decode_mbr(image.mbr()))
+        table = partition_table()
+        record('mbr', partition_table, lambda table: 512, lambda table: len(table.partitions))
+        lbas = [partition.start_lba for partition in table.partitions if 'FAT32' in partition.file_system]
+
+        def boot_sectors():
+            return [decode_boot_sector(image.boot_sector(lba)) for lba in lbas]
+        boot = boot_sectors()
+        record('boot_sector', boot_sectors, lambda result: 512*len(result), len)
+        record('fsinfo', lambda: [decode_fsinfo(image.fsinfo(lba, bs.fsinfo_sector)) for lba, bs in zip(lbas, boot)],
+               lambda result: 512*len(result), len)
+
+        def fats():
+            return [FAT(image, lba, bs) for lba, bs in zip(lbas, boot)]
+        record('fat_load', fats, lambda result: sum(len(fat)*4 for fat in result), lambda result: sum(len(fat) for fat in result))
+        volumes = [Volume(image, lba, bs, number) for number, (lba, bs) in enumerate(zip(lbas, boot), 1)]
+        for volume in volumes:
+            volume.fat
+
+        def walk():
+            return sum(1 for volume in volumes for _ in volume.walk())
+        entries = walk()
+        record('directory_walk', walk, lambda result: 0, lambda result: result)
+
+        if 'extraction' in stages:
+            destination = tempfile.mkdtemp(prefix='fat32bench-', dir=workdir)
+            runs = iter(range(MAX_STAGE_LOOPS*repeat + 1))
+            try:
+                def extract():
+                    # Every run writes new files (overwriting the files of the previous run would be measured as well)
+                    output = os.path.join(destination, 'run{}'.format(next(runs)))
+                    return [written for volume in volumes
+                            for _, _, written in volume.extract_tree(None, os.path.join(output, 'partition{}'.format(volume.number)))]
+                record('extraction', extract, sum, len)
+            finally:
+                shutil.rmtree(destination, ignore_errors=True)
+    peaks = [measure["peak_rss_kb"] for measure in results.values() if measure["peak_rss_kb"] is not None]
+    return {"entries": entries, "stages": results, "peak_rss_kb": max(peaks, default=None)}
+
+def imagePath(spec, workdir):
+    # Images are cached in workdir by the hash of their spec (and of the generator version)
+    digest = hashlib.sha1(repr((SYNTHETIC_VERSION, tuple(spec))).encode()).hexdigest()[:12]
+    return os.path.join(workdir, 'synthetic-{}.img'.format(digest))
+
+def benchmarkScenario(name, spec, workdir, stages=STAGES, repeat=3, regenerate=False):
+    path = imagePath(spec, workdir)
+    generation = None
+    if regenerate or not os.path.exists(path):
+        start = time.perf_counter()
+        try:
+            generateImage(path + '.tmp', spec)
+        except BaseException:
+            if os.path.exists(path + '.tmp'):
+                os.remove(path + '.tmp')
+            raise
+        os.replace(path + '.tmp', path)
+        generation = time.perf_counter() - start
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as pool:
+        result = pool.submit(runScenario, path, stages, repeat, workdir).result()
+    result.update({"name": name, "spec": spec._asdict(), "image": path, "image_bytes": os.path.getsize(path), "generation_seconds": generation})
+    return result
+
+def compareResults(baseline, current, tolerance=DEFAULT_TOLERANCE, noise_floor=DEFAULT_NOISE_FLOOR):
+    # [(scenario, stage, baseline value, current value, change, regression)] for the stages (seconds) and the peak RSS (KiB) of both runs
+    rows = []
+    for name, scenario in current["scenarios"].items():
+        reference = baseline["scenarios"].get(name)
+        if reference is None:
+            continue
+        if reference["spec"] != scenario["spec"]:
+            rows.append((name, 'spec', None, None, None, False))
+            continue
+        for stage, measure in scenario["stages"].items():
+            before = reference["stages"].get(stage)
+            if before is None:
+                continue
+            change = measure["seconds"] / before["seconds"] - 1 if before["seconds"] else 0.0
+            regression = change > tolerance and measure["seconds"] - before["seconds"] > noise_floor
+            rows.append((name, stage, before["seconds"], measure["seconds"], change, regression))
+        if reference.get("peak_rss_kb") and scenario.get("peak_rss_kb"):
+            change = scenario["peak_rss_kb"] / reference["peak_rss_kb"] - 1
+            rows.append((name, 'peak_rss_kb', reference["peak_rss_kb"], scenario["peak_rss_kb"], change, change > tolerance))
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m fat32parser.benchmark",
+                                     description="Time the parser stages on synthetic FAT32 images and compare the results with a baseline")
+    parser.add_argument("--preset", help="Benchmark scenario(s): " + ", ".join(PRESETS) + " or all (default: a custom scenario built from the options below)",
+                        nargs="+", default=None, choices=list(PRESETS) + ["all"], metavar="NAME")
+    parser.add_argument("--size", help="Image size in MiB", type=int, default=ImageSpec().size_mb, metavar="MB")
+    parser.add_argument("--partitions", help="Number of FAT32 partitions (1 to 4)", type=int, default=ImageSpec().partitions, metavar="N")
+    parser.add_argument("--cluster-size", help="Cluster size in bytes", type=int, default=ImageSpec().cluster_size, metavar="BYTES")
+    parser.add_argument("--files", help="Number of files", type=int, default=ImageSpec().files, metavar="N")
+    parser.add_argument("--file-size", help="Mean file size in bytes", type=int, default=ImageSpec().file_size, metavar="BYTES")
+    parser.add_argument("--fragmentation", help="Probability for each cluster of a file to start a new fragment (0 to 1)", type=float, default=ImageSpec().fragmentation, metavar="F")
+    parser.add_argument("--depth", help="Depth of the directory tree", type=int, default=ImageSpec().depth, metavar="N")
+    parser.add_argument("--fanout", help="Subdirectories per directory", type=int, default=ImageSpec().fanout, metavar="N")
+    parser.add_argument("--deleted", help="Fraction of deleted files (0 to 1)", type=float, default=ImageSpec().deleted, metavar="F")
+    parser.add_argument("--seed", help="Seed of the generator", type=int, default=ImageSpec().seed)
+    parser.add_argument("--stages", help="Stages to time (default: all of " + ",".join(STAGES) + ")", default=",".join(STAGES), metavar="LIST")
+    parser.add_argument("--repeat", help="Measures per stage, the best one is kept (default: 3)", type=int, default=3, metavar="N")
+    parser.add_argument("--workdir", help="Directory of the generated images, reused by later runs (default: a fat32bench directory in the temporary directory)",
+                        default=os.path.join(tempfile.gettempdir(), 'fat32bench'), metavar="DIR")
+    parser.add_argument("--regenerate", help="Generate the images even if they are cached in the work directory", default=False, action="store_true")
+    parser.add_argument("--output", help="Write the results (a baseline for later runs) to FILE", default=None, metavar="FILE")
+    parser.add_argument("--baseline", help="Compare the results with a baseline written by --output, exit with status 1 on a regression", default=None, metavar="FILE")
+    parser.add_argument("--tolerance", help="Relative slowdown (or peak RSS increase) counted as a regression (default: 0.25)", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--noise-floor", help="Slowdowns of less than MS milliseconds are never regressions (default: 0.5)", type=float, default=DEFAULT_NOISE_FLOOR*1000, metavar="MS")
+    args = parser.parse_args()
+
+    stages = tuple(stage.strip() for stage in args.stages.split(",") if stage.strip())
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        parser.error("unknown stage(s): " + ", ".join(sorted(unknown)))
+    if args.preset:
+        scenarios = PRESETS if "all" in args.preset else {name: PRESETS[name] for name in args.preset}
+    else:
+        scenarios = {'custom': ImageSpec(args.size, args.partitions, args.cluster_size, args.files, args.file_size, args.fragmentation,
+                                         args.depth, args.fanout, args.deleted, args.seed)}
+    os.makedirs(args.workdir, exist_ok=True)
+
+    from prettytable import PrettyTable
+    results = {"version": 1, "python": platform.python_version(), "platform": platform.platform(), "repeat": args.repeat, "scenarios": {}}
+    table = PrettyTable(["Scenario", "Stage", "Time (ms)", "MB/s", "Items/s", "Peak RSS (MiB)"])
+    for name, spec in scenarios.items():
+        try:
+            result = benchmarkScenario(name, spec, args.workdir, stages, args.repeat, args.regenerate)
+        except ValueError as e:
+            print("[!] {}: {}".format(name, e), file=sys.stderr)
+            continue
+        results["scenarios"][name] = result
+        for stage, measure in result["stages"].items():
+            table.add_row([name, stage, "{:.3f}".format(measure["seconds"]*1000),
+                           "{:.1f}".format(measure["mb_per_second"]) if measure["mb_per_second"] else "-",
+                           "{:.0f}".format(measure["items_per_second"]) if measure["items_per_second"] else "-",
+                           "{:.1f}".format(measure["peak_rss_kb"] / 1024) if measure["peak_rss_kb"] else "-"])
+    print(table)
+
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(results, output, indent=2)
+            output.write("\n")
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        rows = compareResults(baseline, results, args.tolerance, args.noise_floor/1000)
+        comparison = PrettyTable(["Scenario", "Stage", "Baseline", "Current", "Change", "Status"])
+        for name, stage, before, after, change, regression in rows:
+            if stage == 'spec':
+                comparison.add_row([name, "-", "-", "-", "-", "image spec changed, not compared"])
+                continue
+            scale, unit = (1000, " ms") if stage != 'peak_rss_kb' else (1 / 1024, " MiB")
+            comparison.add_row([name, stage, "{:.3f}{}".format(before*scale, unit), "{:.3f}{}".format(after*scale, unit),
+                                "{:+.1%}".format(change), "REGRESSION" if regression else "ok"])
+        print(comparison)
+        if any(row[5] for row in rows):
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+import re
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from .image import ImageReader, io_counters
+
+# -------------------------------------------- #
+# File carving over unallocated clusters       #
+# -------------------------------------------- #
+
+# Type: (header regex, footer, bytes kept after the footer, maximum file size)
+CARVING_SIGNATURES = {
+    "jpg": (re.escape(b'\xff\xd8\xff'), b'\xff\xd9', 0, 20*1024*1024),
+    "png": (re.escape(b'\x89PNG\r\n\x1a\n'), b'IEND\xaeB`\x82', 0, 20*1024*1024),
+    "gif": (b'GIF8[79]a', b'\x00\x3b', 0, 10*1024*1024),
+    "pdf": (re.escape(b'%PDF-'), b'%%EOF', 0, 50*1024*1024),
+    "zip": (re.escape(b'PK\x03\x04'), b'PK\x05\x06', 18, 50*1024*1024),     # End of central directory record is 22 bytes
+}
+# All headers are searched in a single pass: one alternation without groups (a group around each header keeps re from
+# skipping ahead to the bytes that can start a header, which makes the scan an order of magnitude slower). The type is
+# then told from the matched header, which only one of the signatures matches.
+CARVING_PATTERN = re.compile(b'|'.join(header for header, _, _, _ in CARVING_SIGNATURES.values()), re.DOTALL)
+CARVING_HEADERS = [(name, re.compile(header, re.DOTALL)) for name, (header, _, _, _) in CARVING_SIGNATURES.items()]
+CARVING_OVERLAP = 16            # Longer than any header: a header crossing a chunk boundary is still found
+CARVING_CHUNK_SIZE = 64*1024*1024
+
+CarvedFile = namedtuple('CarvedFile', ['type', 'offset', 'size'])
+
+def carvingType(header):
+    # Type of a header matched by CARVING_PATTERN
+    return next(name for name, pattern in CARVING_HEADERS if pattern.fullmatch(header))
+
+def carveRange(image_path, start, end, limit):
+    # Headers starting in [start, end) and their footers before `limit` (the end of the free extent)
+    carved = []
+    with ImageReader(image_path) as image:
+        io_counters.reads += 1     # The chunk is searched through the mapping, not read()
+        io_counters.bytes_read += max(0, min(end + CARVING_OVERLAP, limit, image.size) - start)
+        for match in CARVING_PATTERN.finditer(image.mmap, start, min(end + CARVING_OVERLAP, limit)):
+            if match.start() >= end:
+                break
+            file_type = carvingType(match.group())
+            _, footer, trailer, max_size = CARVING_SIGNATURES[file_type]
+            footer_offset = image.mmap.find(footer, match.end(), min(match.start() + max_size, limit))
+            if footer_offset == -1:
+                continue    # No footer in the free extent: the file is fragmented or overwritten
+            carved.append(CarvedFile(file_type, match.start(), footer_offset + len(footer) + trailer - match.start()))
+    return carved
+
+def carveVolume(volume, jobs=1):
+    # Scans only the free clusters (FAT value 0), split into chunks dispatched to a process pool
+    tasks = []
+    for first, count in volume.fat.free_runs():
+        run_start = volume.cluster_offset(int(first))
+        run_end = min(run_start + int(count)*volume.cluster_size, volume.image.size)
+        for chunk_start in range(run_start, run_end, CARVING_CHUNK_SIZE):
+            tasks.append((volume.image.path, chunk_start, min(chunk_start + CARVING_CHUNK_SIZE, run_end), run_end))
+    if jobs > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(carveRange, *zip(*tasks)))
+    else:
+        results = [carveRange(*task) for task in tasks]
+    return [carved for result in results for carved in result]
@@ -0,0 +1,961 @@
+# Authors ---------------------------------------------------------#
+#  Younes Tasra ~ https://younestasra-r4z3rsw0rd.github.io/        #
+#  Ayman Zerda  ~ https://aymanzerda-sudotime.github.io/           #
+#------------------------------------------------------------------#
+
+# Command line interface. The presentation libraries (termcolor, colorama, prettytable)
+# and the NumPy based modules are only imported by the output and the modes that need them.
+
+# Built-in Python Libraries:
+from time import sleep
+import argparse
+import csv
+import hashlib
+import json
+import os
+import re
+import sys
+
+from .analysis import analyzeBatch, analyzePartitions, batchImages, fat32Partitions, imageAnalysis, imageAnalysisToDict
+from .carving import carveVolume
+from .hashing import hashImage, hashVolume
+from .image import ImageReader
+from .index import INDEX_SUFFIX, PathIndex
+from .partitions import discoverPartitions, partitionInImage
+from .profiling import NULL_PROFILER
+from .structures import (BackupBootSector, BIOSDriveNumber, bootable, BootRecordSignature_1, bytesPerSector,
+                        clusterCount, clusterSize, decode_fsinfo, decode_mbr, endingSector_CHS, extendedBootSignature,
+                        FAT32_version, FATSize, fileSys, FileSystemType, firstDataSector, Flags, FSINFOSectorNumber,
+                        FsinfoSectorSignature, FSINFOSignature_1, FSINFOSignature_2, jumpCode, MBRSignature,
+                        mediaType, NextFreeClusterSectorNumber, numOfFAT, NumOfFreeClusters, numOfHeads,
+                        numOfHiddenSectors, numOfRootDirEntries, numOfSectors, numOfSectorsPerTrack, oem,
+                        partitionSerialNumber, reservedArea, RootDirClusterNumber, sectorsPerCluster,
+                        startingSector_CHS, startingSector_LBA, totalNumberOfSectors, totalSectors, validateMBR,
+                        volumeName)
+
+# Non-interactive output: no artificial delays and no color escape codes
+FAST_MODE = False
+
+class NoColor:
+    def __getattr__(self, name):
+        return ''
+
+# termcolor and colorama are only imported when the output is colored (see enable_color)
+Fore = Style = NoColor()
+colored = lambda text, *args, **kwargs: text
+
+def enable_color():
+    global Fore, Style, colored
+    from termcolor import colored
+    from colorama import Fore, Style
+
+def enable_fast_mode():
+    global FAST_MODE
+    FAST_MODE = True
+
+def pause(seconds=1):
+    # Only slows down interactive sessions, where the delay makes the output easier to follow
+    if not FAST_MODE:
+        sleep(seconds)
+
+# Printing messages with context:
+def print_message(message, type, file=None):
+    if type == 'SUCCESS':
+        print('[' + colored('+', 'green') +  '] ' + message, file=file)    # Success
+    elif type == 'INFO':
+        print('[' + colored('*', 'blue') +  '] ' + message, file=file)     # Info
+    elif type == 'WARNING':
+        print('[' + colored('!', 'yellow') +  '] ' + message, file=file)   # Warning
+    elif type == 'ALERT':
+        print('[' + colored('!!', 'yellow') +  '] ' + message, file=file)  # Alert
+    elif type == 'ERROR':
+        print('[' + colored('-', 'red') +  '] ' + message, file=file)      # Error
+
+# Printing Documentation:
+def print_docs(message, byte_range, size, essential=None):
+   if (essential == "yes"):
+      if (size == 1) :
+         print("\t" + Style.BRIGHT + Fore.WHITE + "[" + Fore.GREEN + "ESSENTIAL" + Fore.WHITE + "] " + "[" + Fore.MAGENTA + byte_range + Fore.WHITE + "] " + Fore.YELLOW + message + Fore.WHITE + ' (' + Fore.CYAN + str(size) + " byte" + Fore.WHITE + ')' + Style.NORMAL + Fore.WHITE + "\n")
+      else:
+         print("\t" + Style.BRIGHT + Fore.WHITE + "[" + Fore.GREEN + "ESSENTIAL" + Fore.WHITE + "] " + "[" + Fore.MAGENTA + byte_range + Fore.WHITE + "] " + Fore.YELLOW + message + Fore.WHITE + ' (' + Fore.CYAN + str(size) + " bytes" + Fore.WHITE + ')' + Style.NORMAL + Fore.WHITE + "\n")
+   elif essential == "no":
+      if (size == 1) :
+         print("\t" + Style.BRIGHT + Fore.WHITE + "[" + Fore.RED + "NOT ESSENTIAL" + Fore.WHITE + "] " + "[" + Fore.MAGENTA + byte_range + Fore.WHITE + "] " + Fore.YELLOW + message + Fore.WHITE + ' (' + Fore.CYAN + str(size) + " byte" + Fore.WHITE + ')' + Style.NORMAL + Fore.WHITE + "\n")
+      else:
+         print("\t" + Style.BRIGHT + Fore.WHITE + "[" + Fore.RED + "NOT ESSENTIAL" + Fore.WHITE + "] " + "[" + Fore.MAGENTA + byte_range + Fore.WHITE + "] " + Fore.YELLOW + message + Fore.WHITE + ' (' + Fore.CYAN + str(size) + " bytes" + Fore.WHITE + ')' + Style.NORMAL + Fore.WHITE + "\n")
+   else:
+      if (size == 1) :
+         print("\t" + Style.BRIGHT + Fore.WHITE + "[" + Fore.MAGENTA + byte_range + Fore.WHITE + "] " + Fore.YELLOW + message + Fore.WHITE + ' (' + Fore.CYAN + str(size) + " byte" + Fore.WHITE + ')' + Style.NORMAL + Fore.WHITE + "\n")
+      else:
+         print("\t" + Style.BRIGHT + Fore.WHITE + "[" + Fore.MAGENTA + byte_range + Fore.WHITE + "] " + Fore.YELLOW + message + Fore.WHITE + ' (' + Fore.CYAN + str(size) + " bytes" + Fore.WHITE + ')' + Style.NORMAL + Fore.WHITE + "\n")
+
+# Printing the warning of a field (if any), right below the printed value:
+def print_warning(warnings, structure, field):
+   for warning in warnings:
+      if warning.structure == structure and warning.field == field:
+         print("\t", end='')
+         print_message(warning.message, warning.level)
+
+def print_profile(profiler, output=None, format="json"):
+    # Summary table on the standard error (the standard output may be a JSON document), metrics in FILE
+    print("\n" + profiler.table().get_string(title="Profile"), file=sys.stderr)
+    if output:
+        with open(output, 'w') as f:
+            f.write(profiler.to_prometheus() if format == "prometheus" else profiler.to_json() + "\n")
+
+def main():
+
+    image = None
+    profiler = NULL_PROFILER
+    try: 
+        parser = argparse.ArgumentParser(description="Master Boot Record and FAT32 file system parser.")
+        parser.add_argument("-i", "--image", help="Enter the path to the file system raw image")
+        parser.add_argument("--batch", help="Analyze every image of a directory (or matching a glob pattern) and stream one JSON record per image", default=None, metavar="DIR|GLOB")
+        parser.add_argument("--batch-output", help="Write the --batch records to FILE instead of the standard output", default=None, metavar="FILE")
+        parser.add_argument("-m", "--mbr", help="Parse Master Boot Record Only", default=False, action="store_true")
+        parser.add_argument("-p", "--partition", help="Select the partition number (1 to 4 for the primary partitions, 5 and up for the logical ones, the entry number for GPT) for which you would like to retrieve the boot sector information.", default=False)
+        parser.add_argument("-v", "--verbose", help="Be verbose and print out more information", default=False, action="store_true")
+        parser.add_argument("-f", "--fat", help="Load the File Allocation Table of each FAT32 partition, walk its directory tree and print an allocation summary", default=False, action="store_true")
+        parser.add_argument("--fast", help="Non-interactive mode: no delays and no colors (default when the output is not a terminal, use --no-fast to force the interactive output)", default=None, action=argparse.BooleanOptionalAction)
+        parser.add_argument("--format", help="Output format: colored text report (default), a JSON document or one JSON record per line", choices=["text", "json", "ndjson"], default="text")
+        parser.add_argument("-j", "--jobs", help="Number of worker processes used to analyze the partitions (or the images with --batch) in parallel (default: 1)", type=int, default=1, metavar="N")
+        parser.add_argument("--ls", help="List the content of a directory (default: the root directory) of each FAT32 partition", nargs="?", const="/", default=None, metavar="PATH")
+        parser.add_argument("--tree", help="Print the whole directory tree of each FAT32 partition", default=False, action="store_true")
+        parser.add_argument("--find", help="Look up one or more paths through the cached path index of each FAT32 partition", nargs="+", default=None, metavar="PATH")
+        parser.add_argument("--extract", help="Extract a file or a directory of each FAT32 partition into the output directory", default=None, metavar="PATH")
+        parser.add_argument("--extract-all", help="Extract every file of each FAT32 partition into DIR", default=None, metavar="DIR")
+        parser.add_argument("-o", "--output", help="Output directory used by --extract (default: current directory)", default=".", metavar="DIR")
+        parser.add_argument("--deleted", help="List the deleted entries of each FAT32 partition and whether their clusters are still free", default=False, action="store_true")
+        parser.add_argument("--recover", help="Recover the deleted files whose clusters are still free into DIR (their chain is lost: the files are assumed to be contiguous)", default=None, metavar="DIR")
+        parser.add_argument("--carve", help="Carve files (JPEG, PNG, GIF, PDF, ZIP) from the free clusters of each FAT32 partition into DIR", default=None, metavar="DIR")
+        parser.add_argument("--search", help="Search a regular expression (over the raw bytes) in the file data, the file slack and the unallocated clusters of each FAT32 partition, using --jobs processes", default=None, metavar="PATTERN")
+        parser.add_argument("--search-areas", help="Comma separated areas searched by --search: allocated, slack, unallocated (default: all of them)", default="allocated,slack,unallocated", metavar="AREAS")
+        parser.add_argument("--ignore-case", help="Case insensitive --search", default=False, action="store_true")
+        parser.add_argument("--whois", help="Tell which file owns each byte offset (or sector with an 's' suffix, e.g. 2048s) of the image, @FILE reads the offsets from FILE", default=None, metavar="OFFSET[,OFFSET...]")
+        parser.add_argument("--check", help="Check the consistency of the FAT of each FAT32 partition (FAT copies, cross-links, loops, lost chains, FSINFO counters)", default=False, action="store_true")
+        parser.add_argument("--fragmentation", help="Print the fragments of each file, the free extents and an allocation heatmap of each FAT32 partition", default=False, action="store_true")
+        parser.add_argument("--timeline", help="Write a timeline of the created/modified/accessed times of every directory entry (deleted ones included) of each FAT32 partition: a sorted CSV timeline (default) or a Sleuth Kit bodyfile", nargs="?", const="csv", choices=["csv", "bodyfile"], default=None)
+        parser.add_argument("--timeline-output", help="Write the --timeline to FILE instead of the standard output", default=None, metavar="FILE")
+        parser.add_argument("--timeline-memory", help="Memory budget of the --timeline sort in MB (at least 1), larger timelines are sorted on disk (default: 256)", type=int, default=256, metavar="MB")
+        parser.add_argument("--hash", help="Hash every file of each FAT32 partition with the given algorithms (e.g. md5,sha1,sha256) and print a hash manifest", default=None, metavar="ALGORITHMS")
+        parser.add_argument("--image-hash", help="Hash the whole image and each partition in a single read of the image (default algorithms: md5,sha1)", nargs="?", const="md5,sha1", default=None, metavar="ALGORITHMS")
+        parser.add_argument("--manifest", help="Write the --hash manifest (CSV) to FILE instead of the standard output", default=None, metavar="FILE")
+        parser.add_argument("--async-io", help="Read the image with concurrent asynchronous requests (partition heads, FAT and directories are prefetched), for images on network or slow storage", default=False, action="store_true")
+        parser.add_argument("--in-flight", help="Maximum number of concurrent read requests with --async-io (default: 16)", type=int, default=16, metavar="N")
+        parser.add_argument("--latency", help="Simulated latency added to every read request with --async-io, in milliseconds (default: 0)", type=float, default=0.0, metavar="MS")
+        parser.add_argument("--profile", help="Print the wall time, bytes read, read calls and cache hits of each stage of the parser", default=False, action="store_true")
+        parser.add_argument("--profile-output", help="Write the profile metrics to FILE (implies --profile)", default=None, metavar="FILE")
+        parser.add_argument("--profile-format", help="Format of the --profile-output metrics: JSON (default) or Prometheus text", choices=["json", "prometheus"], default="json")
+        parser.add_argument("--cache", help="Path of the path index cache file (default: ~/.cache/fat32parser/IMAGE-HASH" + INDEX_SUFFIX + ")", default=None, metavar="FILE")
+        args = parser.parse_args()
+        if not args.image and not args.batch:
+           parser.error("one of the arguments -i/--image --batch is required")
+        if args.fast or (args.fast is None and not sys.stdout.isatty()):
+           enable_fast_mode()
+        else:
+           enable_color()
+        if args.profile or args.profile_output:
+           from .profiling import Profiler
+           profiler = Profiler()
+
+        # Batch mode: one JSON record per image, written as soon as the image has been analyzed (--format json writes a single array instead)
+        if args.batch:
+           image_paths = batchImages(args.batch)
+           output = open(args.batch_output, 'w') if args.batch_output else sys.stdout
+           errors = 0
+           records = []
+           profiler.start("batch")
+           try:
+              for record in analyzeBatch(image_paths, scan=args.fat, jobs=args.jobs):
+                 errors += record["status"] != "ok"
+                 if args.format == "json":
+                    records.append(record)
+                    continue
+                 output.write(json.dumps(record) + "\n")
+                 output.flush()
+              if args.format == "json":
+                 json.dump(records, output, indent=2)
+                 output.write("\n")
+           finally:
+              if args.batch_output:
+                 output.close()
+           if args.batch_output:
+              print_message("{} images analyzed, {} errors, records written to {}".format(len(image_paths), errors, args.batch_output), 'SUCCESS')
+           sys.exit()
+
+        Allowed_Values = ['1', '2', '3', '4'] # Allowed values for the --partition option
+        Partitions_StartingSector = []    # Saving Partitons Starting Sector values for later use.
+        FoundFileSystems = []             # Saving found filesystems for later use.
+        FSINFO_StartingSector = {}        # Saving FSINFO Starting Sector values for later use.
+        partition_counter = 0             # Keeping track of how many partition has been parsed
+        check = 0                         # Checking how many partition is bootable
+
+        # Machine readable output, built from the result model instead of the text report:
+        if args.format != "text":
+           if args.async_io:
+              from .aio import pipelinedImageAnalysis
+              analysis = imageAnalysisToDict(pipelinedImageAnalysis(args.image, args.partition, scan=args.fat, mbr_only=args.mbr,
+                                                                    max_in_flight=args.in_flight, latency=args.latency/1000, profiler=profiler))
+           else:
+              analysis = imageAnalysisToDict(imageAnalysis(args.image, args.partition, scan=args.fat, jobs=args.jobs, mbr_only=args.mbr, profiler=profiler))
+           print(json.dumps(analysis, indent=2 if args.format == "json" else None))
+           sys.exit()
+
+        profiler.start("mbr")
+        image = ImageReader(args.image)
+        mbr = decode_mbr(image.mbr())
+        # The rest of the run is one stage named after the selected mode (the partitions of the text report are profiled separately)
+        mode = next((name for name, selected in (("ls", args.ls), ("tree", args.tree), ("extract", args.extract or args.extract_all),
+                                                 ("deleted", args.deleted or args.recover), ("carve", args.carve), ("search", args.search), ("whois", args.whois), ("check", args.check),
+                                                 ("fragmentation", args.fragmentation), ("timeline", args.timeline), ("image-hash", args.image_hash), ("hash", args.hash),
+                                                          ("find", args.find)) if selected), "report")
+        profiler.start(mode)
+        # The modes skip the partitions starting beyond the end of a truncated image, the text report prints their warnings itself.
+        # On the standard error: the output of a mode may be a CSV file.
+        if mode != "report":
+           for warning in discoverPartitions(image, mbr).warnings:
+              if warning.structure == 'partition':
+                 print_message(warning.message, warning.level, file=sys.stderr)
+
+        # Directory listing modes: skip the structure dump and only print the file system content
+        if args.ls or args.tree:
+           for volume in fat32Partitions(image, mbr, args.partition):
+              print_message("Partition {}".format(Style.BRIGHT + Fore.CYAN + str(volume.number) + Style.NORMAL + Fore.WHITE) + (" : " + args.ls if args.ls else ""), 'SUCCESS')
+              print("---------------------------------------\n")
+              if args.ls:
+                 directory = volume.lookup(args.ls)
+                 if directory is not None and not directory.is_directory:
+                    entries = [directory]
+                 else:
+                    entries = volume.iter_directory(directory.first_cluster if directory else volume.boot_sector.root_cluster, args.ls)
+                 for entry in entries:
+                    modified = entry.modified.strftime('%Y-%m-%d %H:%M:%S') if entry.modified else '-' * 19
+                    name = Fore.BLUE + Style.BRIGHT + entry.name + '/' + Style.NORMAL + Fore.WHITE if entry.is_directory else entry.name
+                    print("  {}  {:>12}  {}  {}".format(entry.attribute_string(), entry.size, modified, name))
+              else:
+                 for entry in volume.walk():
+                    depth = entry.path.count('/') - 1
+                    name = Fore.BLUE + Style.BRIGHT + entry.name + '/' + Style.NORMAL + Fore.WHITE if entry.is_directory else entry.name + " ({} bytes)".format(entry.size)
+                    print("  " + "|   " * depth + "|-- " + name)
+              print("")
+           sys.exit()
+
+        # File extraction:
+        if args.extract or args.extract_all:
+           volumes = list(fat32Partitions(image, mbr, args.partition))
+           for volume in volumes:
+              destination = args.extract_all or args.output
+              if len(volumes) > 1:
+                 destination = os.path.join(destination, "partition{}".format(volume.number))
+              print_message("Extracting from Partition {} into {}".format(Style.BRIGHT + Fore.CYAN + str(volume.number) + Style.NORMAL + Fore.WHITE, destination), 'SUCCESS')
+              print("---------------------------------------\n")
+              entry = volume.lookup(args.extract) if args.extract else None
+              files = total = 0
+              for item, output, written in volume.extract_tree(entry, destination):
+                 files += 1
+                 total += written
+                 if written < item.size:
+                    print_message(f"{item.path}: only {written} of {item.size} bytes are present in the image", 'WARNING')
+                 elif args.verbose:
+                    print_message(f"{item.path} -> {output} ({written} bytes)", 'INFO')
+              print_message("{} files extracted ({} bytes)".format(Fore.GREEN + Style.BRIGHT + str(files) + Style.NORMAL + Fore.WHITE, total), 'SUCCESS')
+              print("")
+           sys.exit()
+
+        # Deleted entries listing and recovery:
+        if args.deleted or args.recover:
+           from .recovery import STATUS_PARTIAL, STATUS_RECOVERABLE, scanDeleted
+           volumes = list(fat32Partitions(image, mbr, args.partition))
+           for volume in volumes:
+              print_message("Deleted entries of Partition {}".format(Style.BRIGHT + Fore.CYAN + str(volume.number) + Style.NORMAL + Fore.WHITE), 'SUCCESS')
+              print("---------------------------------------\n")
+              destination = args.recover
+              if destination and len(volumes) > 1:
+                 destination = os.path.join(destination, "partition{}".format(volume.number))
+              print_message("The FAT chains of deleted files are lost: their data is read from the clusters following the first one, assuming they were contiguous", 'INFO')
+              print("")
+              found = recovered = 0
+              for entry, status in scanDeleted(volume):
+                 found += 1
+                 modified = entry.modified.strftime('%Y-%m-%d %H:%M:%S') if entry.modified else '-' * 19
+                 color = Fore.GREEN if status == STATUS_RECOVERABLE else Fore.YELLOW if status == STATUS_PARTIAL else Fore.RED
+                 print("  {}  {:>12}  {}  {:<25}  {}".format(entry.attribute_string(), entry.size, modified, color + status + Fore.WHITE, entry.path))
+                 if destination and not entry.is_directory and status == STATUS_RECOVERABLE:
+                    output = os.path.normpath(os.path.join(destination, entry.path.lstrip('/')))
+                    if output.startswith(os.path.normpath(destination) + os.sep):
+                       os.makedirs(os.path.dirname(output), exist_ok=True)
+                       volume.extract(entry.first_cluster, entry.size, output, contiguous=True)
+                       recovered += 1
+              print("")
+              print_message("{} deleted entries found".format(Fore.GREEN + Style.BRIGHT + str(found) + Style.NORMAL + Fore.WHITE) + (", {} files recovered into {}".format(recovered, destination) if destination else ""), 'SUCCESS')
+              print("")
+           sys.exit()
+
+        # Carving of the unallocated clusters:
+        if args.carve:
+           volumes = list(fat32Partitions(image, mbr, args.partition))
+           for volume in volumes:
+              print_message("Carving the free clusters of Partition {}".format(Style.BRIGHT + Fore.CYAN + str(volume.number) + Style.NORMAL + Fore.WHITE), 'SUCCESS')
+              print("---------------------------------------\n")
+              destination = os.path.join(args.carve, "partition{}".format(volume.number)) if len(volumes) > 1 else args.carve
+              os.makedirs(destination, exist_ok=True)
+              carved_files = carveVolume(volume, args.jobs)
+              for carved in carved_files:
+                 output = os.path.join(destination, "{:012x}.{}".format(carved.offset, carved.type))
+                 data = image.read(carved.offset, carved.size)
+                 with open(output, 'wb') as f:
+                    f.write(data)
+                 data.release()
+                 print_message("{} at offset {} (cluster {}), {} bytes -> {}".format(Fore.GREEN + Style.BRIGHT + carved.type.upper() + Style.NORMAL + Fore.WHITE, carved.offset,
+                               (carved.offset - image.data_offset(volume.partition_lba, volume.boot_sector)) // volume.cluster_size + 2, carved.size, output), 'INFO')
+              print("")
+              print_message("{} files carved into {}".format(Fore.GREEN + Style.BRIGHT + str(len(carved_files)) + Style.NORMAL + Fore.WHITE, destination), 'SUCCESS')
+              print("")
+           sys.exit()
+
+        # FAT consistency check (fsck):
+        if args.check:
+           from .fsck import checkVolume
+           def clusterList(clusters, limit=8):
+              return ", ".join(str(cluster) for cluster in clusters[:limit]) + (", ..." if len(clusters) > limit else "")
+           for volume in fat32Partitions(image, mbr, args.partition):
+              print_message("Checking the FAT of Partition {}".format(Style.BRIGHT + Fore.CYAN + str(volume.number) + Style.NORMAL + Fore.WHITE), 'SUCCESS')
+              print("---------------------------------------\n")
+              report = checkVolume(volume, decode_fsinfo(image.fsinfo(volume.partition_lba, volume.boot_sector.fsinfo_sector)))
+              if len(volume.fat) < clusterCount(volume.boot_sector) + 2:
+                 print_message("The FAT is truncated in this image !! Only {} of its {} entries are present".format(len(volume.fat), clusterCount(volume.boot_sector) + 2), 'WARNING')
+              errors = 0
+              for index, differences in report.mirror_differences.items():
+                 if differences:
+                    errors += 1
+                    print_message("FAT #{} differs from the active FAT #{} in {} entries".format(index, volume.fat.index, Fore.RED + Style.BRIGHT + str(differences) + Style.NORMAL + Fore.WHITE), 'ALERT')
+              if len(report.cross_linked):
+                 errors += 1
+                 print_message("{} cross-linked clusters (reached from two chains): {}".format(Fore.RED + Style.BRIGHT + str(len(report.cross_linked)) + Style.NORMAL + Fore.WHITE, clusterList(report.cross_linked)), 'ALERT')
+              if len(report.shared_first_clusters):
+                 errors += 1
+                 print_message("{} first clusters shared by several files: {}".format(Fore.RED + Style.BRIGHT + str(len(report.shared_first_clusters)) + Style.NORMAL + Fore.WHITE, clusterList(report.shared_first_clusters)), 'ALERT')
+              if report.looping_clusters:
+                 errors += 1
+                 print_message("{} clusters belong to chains that never end, loop clusters: {}".format(Fore.RED + Style.BRIGHT + str(report.looping_clusters) + Style.NORMAL + Fore.WHITE, clusterList(report.loop_clusters)), 'ALERT')
+              if report.invalid_pointers:
+                 errors += 1
+                 print_message("{} entries point to a free, reserved or out of range cluster".format(Fore.RED + Style.BRIGHT + str(report.invalid_pointers) + Style.NORMAL + Fore.WHITE), 'ALERT')
+              if report.lost_clusters:
+                 errors += 1
+                 print_message("{} lost clusters in {} chains not referenced by any directory entry: {}".format(Fore.YELLOW + Style.BRIGHT + str(report.lost_clusters) + Style.NORMAL + Fore.WHITE, len(report.lost_chains), clusterList(report.lost_chains)), 'WARNING')
+              if report.fsinfo_free_clusters is None:
+                 print_message("FSINFO counters not checked, {} clusters are free in the FAT present".format(report.actual_free_clusters), 'INFO')
+              elif report.fsinfo_free_clusters == 0xFFFFFFFF:
+                 print_message("FSINFO free cluster count is unknown (0xFFFFFFFF), {} clusters are free".format(report.actual_free_clusters), 'INFO')
+              elif report.fsinfo_free_clusters != report.actual_free_clusters:
+                 errors += 1
+                 print_message("FSINFO free cluster count is {} but {} clusters are free".format(Fore.YELLOW + Style.BRIGHT + str(report.fsinfo_free_clusters) + Style.NORMAL + Fore.WHITE, report.actual_free_clusters), 'WARNING')
+              if report.next_free_cluster_ok is False:
+                 errors += 1
+                 print_message("FSINFO next free cluster hint is not a valid cluster number", 'WARNING')
+              if errors:
+                 print_message("{} problems found".format(Fore.RED + Style.BRIGHT + str(errors) + Style.NORMAL + Fore.WHITE), 'ALERT')
+              else:
+                 print_message("No problems found, {} free clusters".format(Fore.GREEN + Style.BRIGHT + str(report.actual_free_clusters) + Style.NORMAL + Fore.WHITE), 'SUCCESS')
+              print("")
+           sys.exit()
+
+        # Fragmentation and allocation map:
+        if args.fragmentation:
+           import numpy as np
+           from prettytable import PrettyTable
+           from .fragmentation import CLUSTER_BAD, CLUSTER_RESERVED, CLUSTER_USED, HEATMAP_SHADES, fragmentationReport
+           for volume in fat32Partitions(image, mbr, args.partition):
+              print_message("Fragmentation of Partition {}".format(Style.BRIGHT + Fore.CYAN + str(volume.number) + Style.NORMAL + Fore.WHITE), 'SUCCESS')
+              print("---------------------------------------\n")
+              report = fragmentationReport(volume)
+              if len(volume.fat) < clusterCount(volume.boot_sector) + 2:
+                 print_message("The FAT is truncated in this image !! Only {} of its {} entries are present".format(len(volume.fat), clusterCount(volume.boot_sector) + 2), 'WARNING')
+              fragmented = np.flatnonzero(report.fragments > 1)
+              print_message("Files: {}, fragmented: {} ({:.1f}%), fragments per file: {:.2f} on average, {} at most".format(
+                            Fore.GREEN + Style.BRIGHT + str(len(report.files)) + Style.NORMAL + Fore.WHITE, Fore.GREEN + Style.BRIGHT + str(len(fragmented)) + Style.NORMAL + Fore.WHITE,
+                            100 * len(fragmented) / max(1, len(report.files)), report.fragments[report.fragments > 0].mean() if np.any(report.fragments) else 0, report.fragments.max(initial=0)), 'INFO')
+              if len(fragmented):
+                 table = PrettyTable(["Fragments", "Size", "Path"])
+                 table.align["Path"] = "l"
+                 for index in fragmented[np.argsort(-report.fragments[fragmented], kind='stable')][:10]:
+                    table.add_row([report.fragments[index], report.files[index].size, report.files[index].path])
+                 print(table)
+              first, length = report.largest_free_extent
+              print_message("Free clusters: {} in {} extents, largest free extent: {} clusters ({} bytes) at cluster {}".format(
+                            Fore.GREEN + Style.BRIGHT + str(int(report.free_extents[:, 1].sum())) + Style.NORMAL + Fore.WHITE, len(report.free_extents),
+                            Fore.GREEN + Style.BRIGHT + str(length) + Style.NORMAL + Fore.WHITE, length * volume.cluster_size, first), 'INFO')
+              print_message("Allocation map, {} clusters per cell ('{}' free to '{}' full, {} bad clusters):".format(
+                            report.region_size, HEATMAP_SHADES[0], HEATMAP_SHADES[-1], Fore.RED + "B" + Fore.WHITE), 'INFO')
+              used = (report.heatmap[:, CLUSTER_USED] + report.heatmap[:, CLUSTER_RESERVED]) / np.maximum(1, report.heatmap.sum(axis=1))
+              cells = [Fore.RED + "B" + Fore.WHITE if bad else HEATMAP_SHADES[int(round(fraction * (len(HEATMAP_SHADES) - 1)))]
+                       for fraction, bad in zip(used, report.heatmap[:, CLUSTER_BAD])]
+              for row in range(0, len(cells), 64):
+                 print("\t|" + "".join(cells[row:row+64]) + "|")
+              print("")
+           sys.exit()
+
+        # MAC timeline of the directory entries:
+        if args.timeline:
+           from .timeline import timelineEntries, writeBodyfile, writeTimeline
+           volumes = list(fat32Partitions(image, mbr, args.partition))
+           output = open(args.timeline_output, 'w', newline='') if args.timeline_output else sys.stdout
+           try:
+              if args.timeline == "bodyfile":
+                 entries = sum(writeBodyfile(timelineEntries(volume), output, "partition{}".format(volume.number) if len(volumes) > 1 else "") for volume in volumes)
+                 summary = "{} entries".format(Fore.GREEN + Style.BRIGHT + str(entries) + Style.NORMAL + Fore.WHITE)
+              else:
+                 entries, events, runs = writeTimeline(volumes, output, args.timeline_memory * 1024 * 1024,
+                                                       os.path.dirname(os.path.abspath(args.timeline_output)) if args.timeline_output else None)
+                 summary = "{} events of {} entries{}".format(Fore.GREEN + Style.BRIGHT + str(events) + Style.NORMAL + Fore.WHITE, entries,
+                                                              ", sorted in {} runs on disk".format(runs) if runs else "")
+           finally:
+              if args.timeline_output:
+                 output.close()
+           if args.timeline_output:
+              print_message("{}, timeline written to {}".format(summary, args.timeline_output), 'SUCCESS')
+           sys.exit()
+
+        # Keyword / regex search:
+        if args.search:
+           from prettytable import PrettyTable
+           from .search import SEARCH_AREAS, searchVolume
+           areas = [area.strip().lower() for area in args.search_areas.split(',') if area.strip()]
+           unknown = [area for area in areas if area not in SEARCH_AREAS]
+           if unknown:
+              parser.error("unknown search area(s): " + ", ".join(unknown))
+           try:
+              pattern = re.compile(args.search.encode('utf-8', 'surrogateescape'), re.DOTALL | (re.IGNORECASE if args.ignore_case else 0))
+           except re.error as e:
+              parser.error("invalid search pattern: {}".format(e))
+           for volume in fat32Partitions(image, mbr, args.partition):
+              print_message("Searching Partition {} ({})".format(Style.BRIGHT + Fore.CYAN + str(volume.number) + Style.NORMAL + Fore.WHITE, ", ".join(areas)), 'SUCCESS')
+              print("---------------------------------------\n")
+              table = PrettyTable(["Offset", "Cluster", "Area", "Path", "File Offset", "Match"])
+              table.align["Path"] = "l"
+              table.align["Match"] = "l"
+              counts = {}
+              for hit in searchVolume(volume, pattern, areas, args.jobs):
+                 counts[hit.area] = counts.get(hit.area, 0) + 1
+                 table.add_row([hit.offset, hit.cluster, hit.area, hit.path or "-", "-" if hit.file_offset is None else hit.file_offset, repr(hit.match)[2:-1]])
+              if counts:
+                 print(table)
+              print_message("{} hits{}".format(Fore.GREEN + Style.BRIGHT + str(sum(counts.values())) + Style.NORMAL + Fore.WHITE,
+                                               " ({})".format(", ".join("{} {}".format(count, area) for area, count in sorted(counts.items()))) if counts else ""), 'INFO')
+              print("")
+           sys.exit()
+
+        # Owner of byte offsets through the cluster map:
+        if args.whois:
+           from prettytable import PrettyTable
+           from .clustermap import parseOffset, whois
+           tokens = []
+           for item in args.whois.split(','):
+              if item.strip().startswith('@'):
+                 with open(item.strip()[1:]) as f:
+                    tokens += f.read().replace(',', ' ').split()
+              elif item.strip():
+                 tokens.append(item)
+           try:
+              offsets = [parseOffset(token) for token in tokens]
+           except ValueError as e:
+              parser.error("invalid offset: {}".format(e))
+           table = PrettyTable(["Offset", "Sector", "Partition", "Area", "Cluster", "Path", "File Offset"])
+           table.align["Path"] = "l"
+           for result in whois(image, mbr, offsets, args.partition):
+              table.add_row([result.offset, result.offset // 512, "-" if result.partition is None else result.partition, result.area,
+                             "-" if result.cluster is None else result.cluster, result.path or "-", "-" if result.file_offset is None else result.file_offset])
+           print(table)
+           print("")
+           sys.exit()
+
+        # Hashing modes:
+        if args.hash or args.image_hash:
+           algorithms = [algorithm.strip().lower() for algorithm in (args.hash or args.image_hash).split(',') if algorithm.strip()]
+           def supported(algorithm):
+              # Variable length digests (shake_128, shake_256) have no default length: their digest_size is 0
+              try:
+                 return algorithm in hashlib.algorithms_available and hashlib.new(algorithm).digest_size > 0
+              except ValueError:
+                 return False    # Listed but disabled by the OpenSSL build
+           unknown = [algorithm for algorithm in algorithms if not supported(algorithm)]
+           if unknown:
+              parser.error("unsupported hash algorithm(s): " + ", ".join(unknown))
+
+        # Whole image and per-partition digests:
+        if args.image_hash:
+           image_digests, partition_digests = hashImage(image, mbr, algorithms)
+           print_message("Image {} ({} bytes)".format(Style.BRIGHT + Fore.CYAN + args.image + Style.NORMAL + Fore.WHITE, image.size), 'SUCCESS')
+           for algorithm, digest in image_digests.items():
+              print_message("{}: {}".format(algorithm.upper(), Fore.GREEN + Style.BRIGHT + digest + Style.NORMAL + Fore.WHITE), 'INFO')
+           print("")
+           for number, ((start, end), digests, truncated) in partition_digests.items():
+              print_message("Partition {} (bytes {}-{})".format(Style.BRIGHT + Fore.CYAN + str(number) + Style.NORMAL + Fore.WHITE, start, end - 1), 'SUCCESS')
+              if truncated:
+                 print("\t", end='')
+                 print_message("The partition is truncated in this image !! Only the bytes present in the image are hashed", 'WARNING')
+              for algorithm, digest in digests.items():
+                 print_message("{}: {}".format(algorithm.upper(), Fore.GREEN + Style.BRIGHT + digest + Style.NORMAL + Fore.WHITE), 'INFO')
+              print("")
+           sys.exit()
+
+        # Hash manifest of every file:
+        if args.hash:
+           output = open(args.manifest, 'w', newline='') if args.manifest else sys.stdout
+           try:
+              writer = csv.writer(output)
+              writer.writerow(["partition", "size", "hashed", "truncated"] + algorithms + ["path"])
+              files = truncated = 0
+              for volume in fat32Partitions(image, mbr, args.partition):
+                 for entry, file_hash in hashVolume(volume, algorithms, args.jobs):
+                    writer.writerow([volume.number, entry.size, file_hash.hashed, int(file_hash.truncated)] + file_hash.digests + [entry.path])
+                    files += 1
+                    truncated += file_hash.truncated
+           finally:
+              if args.manifest:
+                 output.close()
+           if args.manifest:
+              print_message("{} files hashed, manifest written to {}".format(Fore.GREEN + Style.BRIGHT + str(files) + Style.NORMAL + Fore.WHITE, args.manifest), 'SUCCESS')
+           if truncated:
+              # On the standard error when the manifest is written to the standard output
+              print_message("{} files could not be read entirely (truncated image or chain) !! Their digests only cover the bytes in the 'hashed' column".format(Fore.YELLOW + Style.BRIGHT + str(truncated) + Style.NORMAL + Fore.WHITE),
+                            'WARNING', file=None if args.manifest else sys.stderr)
+           sys.exit()
+
+        # Path lookups through the persistent index:
+        if args.find:
+           for volume in fat32Partitions(image, mbr, args.partition):
+              with PathIndex(volume, args.cache) as index:
+                 print_message("Partition {} : {} indexed entries ({})".format(Style.BRIGHT + Fore.CYAN + str(volume.number) + Style.NORMAL + Fore.WHITE, len(index), "loaded from " + index.cache_path if index.cached else "built"), 'SUCCESS')
+                 print("---------------------------------------\n")
+                 for path in args.find:
+                    entry = index.lookup(path)
+                    if entry is None:
+                       print_message(f"{path}: not found", 'WARNING')
+                       continue
+                    print_message("{}: first cluster {}, {} bytes, attributes 0x{:02x}, parent {}".format(Fore.GREEN + Style.BRIGHT + entry.path + Style.NORMAL + Fore.WHITE, entry.first_cluster, entry.size, entry.attributes, entry.parent), 'INFO')
+              print("")
+           sys.exit()
+        
+        print("")
+        print_message("Starting Parsing Of " + Fore.MAGENTA + "Master Boot Record :" + Style.NORMAL + Fore.WHITE, 'SUCCESS')
+        print("--------------------------------------------\n")
+        pause()
+
+# Parsing the Master Boot Record:
+
+        from prettytable import PrettyTable
+
+        table = PrettyTable()
+        table1 = PrettyTable()
+        table2 = PrettyTable()
+        table3 = PrettyTable()
+        table4 = PrettyTable()
+
+        table.field_names = ["", "Bootable", "Start Head", "Start Sector", "Start Cylinder", "File System", "End Head", "End Sector", "End Cylinder", "Start Sector (LBA)", "Number of Sectors", "Size (KB)"]
+        table1.field_names = ["", "Bootable", "Start Head", "Start Sector", "Start Cylinder", "File System", "End Head", "End Sector", "End Cylinder", "Start Sector (LBA)", "Number of Sectors", "Size (KB)"]
+        table2.field_names = ["", "Bootable", "Start Head", "Start Sector", "Start Cylinder", "File System", "End Head", "End Sector", "End Cylinder", "Start Sector (LBA)", "Number of Sectors", "Size (KB)"]
+        table3.field_names = ["", "Bootable", "Start Head", "Start Sector", "Start Cylinder", "File System", "End Head", "End Sector", "End Cylinder", "Start Sector (LBA)", "Number of Sectors", "Size (KB)"]
+        table4.field_names = ["", "Bootable", "Start Head", "Start Sector", "Start Cylinder", "File System", "End Head", "End Sector", "End Cylinder", "Start Sector (LBA)", "Number of Sectors", "Size (KB)"]
+
+        print_message("Bootstrap Code located in the first 446 bytes of the first 512-byte sector (MBR)", 'INFO')
+        print("")
+        if (args.verbose):
+           print_docs("This area contains the code that is executed when the computer starts up. It is responsible for loading the operating system and is typically written by the operating system vendor.", "0-445", 446)
+        start = 446
+        while True:
+           print(Style.BRIGHT + Fore.GREEN + "==> " + Fore.WHITE + "Partition n°" + Fore.CYAN + str(partition_counter+1) + Style.NORMAL + Fore.WHITE)
+           print("")
+           if bootable(mbr, partition_counter) == "Bootable":
+              print_message("Bootable Flag: " + Style.BRIGHT + Fore.CYAN + "0x80" + Style.NORMAL + Fore.WHITE + " => Partition {}".format(Style.BRIGHT +Fore.MAGENTA + str(partition_counter+1)) + Style.NORMAL + Fore.WHITE + " is " + Style.BRIGHT +  Fore.GREEN + "Bootable" + Style.NORMAL + Fore.WHITE, 'INFO')
+           elif bootable(mbr, partition_counter) == "NOT Bootable":
+              print_message("Bootable Flag: " + Style.BRIGHT + Fore.CYAN + "0x00" + Style.NORMAL + Fore.WHITE + " => Partition {}".format(Style.BRIGHT +Fore.MAGENTA + str(partition_counter+1)) + Style.NORMAL + Fore.WHITE + " is " + Style.BRIGHT + Fore.RED + "NOT Bootable" + Style.NORMAL + Fore.WHITE, 'INFO')
+           else: # Checking the bootable flag:
+              print("\t", end='')
+              print_message(f'The Bootable Flag value is invalid !!', 'ALERT')
+           if (args.verbose) :
+              print_docs("Only two values are allowed: 0x80 means that the partition is bootable & 0x00 means that the partition is not bootable.", f"{str(start)}-{str(start)}", 1)
+           print_message("Start Head: {}".format(Fore.GREEN + Style.BRIGHT + "0x" + startingSector_CHS(mbr, partition_counter)[0:2])+ Style.NORMAL + Fore.WHITE, 'INFO')
+           if (args.verbose) :
+              print_docs("The head number specifies which of the disk's platters the sector is located on", f"{str(start+1)}-{str(start+1)}", 1)
+           print_message("Start Sector: {}".format(Fore.GREEN + Style.BRIGHT + "0x" + startingSector_CHS(mbr, partition_counter)[2:4])+ Style.NORMAL + Fore.WHITE, 'INFO')
+           if (args.verbose) :
+              print_docs("The sector number specifies which sector on the track the partition begins.", f"{str(start+2)}-{str(start+2)}", 1)
+           print_message("Start Cylinder: {}".format(Fore.GREEN + Style.BRIGHT + "0x" + startingSector_CHS(mbr, partition_counter)[4:6])+ Style.NORMAL + Fore.WHITE, 'INFO')
+           if (args.verbose) :
+              print_docs("The cylinder number specifies which cylinder the partition begins on.", f"{str(start+3)}-{str(start+3)}", 1)
+           print_message("File System: {}".format(Fore.GREEN + Style.BRIGHT + fileSys(mbr, partition_counter)) + Style.NORMAL + Fore.WHITE, 'INFO')
+           FoundFileSystems.append(fileSys(mbr, partition_counter))
+           if (args.verbose) :
+              print_docs("The partition type field identifies the file system type that should be in the partition.", f"{str(start+4)}-{str(start+4)}", 1)
+           print_message("End Head: {}".format(Fore.GREEN + Style.BRIGHT + "0x" + endingSector_CHS(mbr, partition_counter)[0:2])+ Style.NORMAL + Fore.WHITE, 'INFO')
+           if (args.verbose) :
+              print_docs("The ending head value indicates the head number of the last sector in the partition.", f"{str(start+5)}-{str(start+5)}", 1)
+           print_message("End Sector: {}".format(Fore.GREEN + Style.BRIGHT + "0x" + endingSector_CHS(mbr, partition_counter)[2:4])+ Style.NORMAL + Fore.WHITE, 'INFO')
+           if (args.verbose) :
+              print_docs("The ending sector value represents the sector number of the last sector in the partition.", f"{str(start+6)}-{str(start+6)}", 1)
+           print_message("End Cylinder: {}".format(Fore.GREEN + Style.BRIGHT + "0x" + endingSector_CHS(mbr, partition_counter)[4:6])+ Style.NORMAL + Fore.WHITE, 'INFO')
+           if (args.verbose) :
+              print_docs("The ending cylinder value represents the cylinder number of the last sector in the partition", f"{str(start+7)}-{str(start+7)}", 1)
+           print_message("The starting sector of partition {}: {}".format(partition_counter+1, Fore.GREEN + Style.BRIGHT + str(startingSector_LBA(mbr, partition_counter)))+ Style.NORMAL + Fore.WHITE, 'INFO')
+           if (args.verbose) :
+              print_docs("A 32-bit value that specifies the first sector of the partition relative to the beginning of the disk.", f"{str(start+8)}-{str(start+11)}", 4)
+           print_message("Partition {} contains {} sector".format(partition_counter+1, Fore.GREEN + Style.BRIGHT + str(totalSectors(mbr, partition_counter)))+ Style.NORMAL + Fore.WHITE, 'INFO')
+           print_message("Partition size: {} Bytes ≃ {} KB".format(Fore.GREEN + Style.BRIGHT + str(totalSectors(mbr, partition_counter)*512) , round(totalSectors(mbr, partition_counter)*512/1024))+ Style.NORMAL + Fore.WHITE + "\n", 'INFO')
+           if (args.verbose) :
+              print_docs("A 32-bit value that specifies the size of the partition in sectors.", f"{str(start+12)}-{str(start+15)}", 4)
+           
+           if (partition_counter == 0) :
+              table1.add_row( ["Partition {}".format(partition_counter+1), bootable(mbr, partition_counter), "0x" + startingSector_CHS(mbr, partition_counter)[0:2], "0x" + startingSector_CHS(mbr, partition_counter)[2:4], "0x" + startingSector_CHS(mbr, partition_counter)[4:6], fileSys(mbr, partition_counter), "0x" + endingSector_CHS(mbr, partition_counter)[0:2], "0x" + endingSector_CHS(mbr, partition_counter)[2:4], "0x" + endingSector_CHS(mbr, partition_counter)[4:6], startingSector_LBA(mbr, partition_counter), totalSectors(mbr, partition_counter), round(totalSectors(mbr, partition_counter)*512/1024)])
+              table.add_row( ["Partition {}".format(partition_counter+1), bootable(mbr, partition_counter), "0x" + startingSector_CHS(mbr, partition_counter)[0:2], "0x" + startingSector_CHS(mbr, partition_counter)[2:4], "0x" + startingSector_CHS(mbr, partition_counter)[4:6], fileSys(mbr, partition_counter), "0x" + endingSector_CHS(mbr, partition_counter)[0:2], "0x" + endingSector_CHS(mbr, partition_counter)[2:4], "0x" + endingSector_CHS(mbr, partition_counter)[4:6], startingSector_LBA(mbr, partition_counter), totalSectors(mbr, partition_counter), round(totalSectors(mbr, partition_counter)*512/1024)])
+              print(Style.BRIGHT + "[" + Fore.GREEN + "+" + Fore.WHITE + "] " + "Partition Table Entry " + Fore.GREEN + "#1" + Style.NORMAL + Fore.WHITE)
+              print(table1)
+              print("")
+           if (partition_counter == 1) :
+              table2.add_row( ["Partition {}".format(partition_counter+1), bootable(mbr, partition_counter), "0x" + startingSector_CHS(mbr, partition_counter)[0:2], "0x" + startingSector_CHS(mbr, partition_counter)[2:4], "0x" + startingSector_CHS(mbr, partition_counter)[4:6], fileSys(mbr, partition_counter), "0x" + endingSector_CHS(mbr, partition_counter)[0:2], "0x" + endingSector_CHS(mbr, partition_counter)[2:4], "0x" + endingSector_CHS(mbr, partition_counter)[4:6], startingSector_LBA(mbr, partition_counter), totalSectors(mbr, partition_counter), round(totalSectors(mbr, partition_counter)*512/1024)])
+              table.add_row( ["Partition {}".format(partition_counter+1), bootable(mbr, partition_counter), "0x" + startingSector_CHS(mbr, partition_counter)[0:2], "0x" + startingSector_CHS(mbr, partition_counter)[2:4], "0x" + startingSector_CHS(mbr, partition_counter)[4:6], fileSys(mbr, partition_counter), "0x" + endingSector_CHS(mbr, partition_counter)[0:2], "0x" + endingSector_CHS(mbr, partition_counter)[2:4], "0x" + endingSector_CHS(mbr, partition_counter)[4:6], startingSector_LBA(mbr, partition_counter), totalSectors(mbr, partition_counter), round(totalSectors(mbr, partition_counter)*512/1024)])
+              print(Style.BRIGHT + "[" + Fore.GREEN + "+" + Fore.WHITE + "] " + "Partition Table Entry " + Fore.GREEN + "#2" + Style.NORMAL + Fore.WHITE)
+              print(table2)
+              print("\n")
+           if (partition_counter == 2) :
+              table3.add_row( ["Partition {}".format(partition_counter+1), bootable(mbr, partition_counter), "0x" + startingSector_CHS(mbr, partition_counter)[0:2], "0x" + startingSector_CHS(mbr, partition_counter)[2:4], "0x" + startingSector_CHS(mbr, partition_counter)[4:6], fileSys(mbr, partition_counter), "0x" + endingSector_CHS(mbr, partition_counter)[0:2], "0x" + endingSector_CHS(mbr, partition_counter)[2:4], "0x" + endingSector_CHS(mbr, partition_counter)[4:6], startingSector_LBA(mbr, partition_counter), totalSectors(mbr, partition_counter), round(totalSectors(mbr, partition_counter)*512/1024)])
+              table.add_row( ["Partition {}".format(partition_counter+1), bootable(mbr, partition_counter), "0x" + startingSector_CHS(mbr, partition_counter)[0:2], "0x" + startingSector_CHS(mbr, partition_counter)[2:4], "0x" + startingSector_CHS(mbr, partition_counter)[4:6], fileSys(mbr, partition_counter), "0x" + endingSector_CHS(mbr, partition_counter)[0:2], "0x" + endingSector_CHS(mbr, partition_counter)[2:4], "0x" + endingSector_CHS(mbr, partition_counter)[4:6], startingSector_LBA(mbr, partition_counter), totalSectors(mbr, partition_counter), round(totalSectors(mbr, partition_counter)*512/1024)])
+              print(Style.BRIGHT + "[" + Fore.GREEN + "+" + Fore.WHITE + "] " + "Partition Table Entry " + Fore.GREEN + "#3" + Style.NORMAL + Fore.WHITE)
+              print(table3)
+              print("\n")
+           if (partition_counter == 3) :
+              table4.add_row( ["Partition {}".format(partition_counter+1), bootable(mbr, partition_counter), "0x" + startingSector_CHS(mbr, partition_counter)[0:2], "0x" + startingSector_CHS(mbr, partition_counter)[2:4], "0x" + startingSector_CHS(mbr, partition_counter)[4:6], fileSys(mbr, partition_counter), "0x" + endingSector_CHS(mbr, partition_counter)[0:2], "0x" + endingSector_CHS(mbr, partition_counter)[2:4], "0x" + endingSector_CHS(mbr, partition_counter)[4:6], startingSector_LBA(mbr, partition_counter), totalSectors(mbr, partition_counter), round(totalSectors(mbr, partition_counter)*512/1024)])
+              table.add_row( ["Partition {}".format(partition_counter+1), bootable(mbr, partition_counter), "0x" + startingSector_CHS(mbr, partition_counter)[0:2], "0x" + startingSector_CHS(mbr, partition_counter)[2:4], "0x" + startingSector_CHS(mbr, partition_counter)[4:6], fileSys(mbr, partition_counter), "0x" + endingSector_CHS(mbr, partition_counter)[0:2], "0x" + endingSector_CHS(mbr, partition_counter)[2:4], "0x" + endingSector_CHS(mbr, partition_counter)[4:6], startingSector_LBA(mbr, partition_counter), totalSectors(mbr, partition_counter), round(totalSectors(mbr, partition_counter)*512/1024)])
+              print(Style.BRIGHT + "[" + Fore.GREEN + "+" + Fore.WHITE + "] " + "Partition Table Entry " + Fore.GREEN + "#4" + Style.NORMAL + Fore.WHITE)
+              print(table4)
+              print("\n")
+
+           start += 16
+           if (bootable(mbr, partition_counter) == "Bootable") :
+              check += 1
+
+           Partitions_StartingSector.append(startingSector_LBA(mbr, partition_counter))
+           partition_counter += 1
+           if (partition_counter == 4) :
+              print_message("Boot signature: {}".format(Fore.GREEN + Style.BRIGHT + "0x" + str(MBRSignature(mbr)))+ Style.NORMAL + Fore.WHITE, 'INFO')
+              print("")
+              
+              # Checking the boot signature value:
+              for warning in validateMBR(mbr):
+                 if warning.field == "signature":
+                    print("\t", end='')
+                    print(warning.message)
+              if (check != 0) :
+                 if (check == 1) :
+                    print_message("{} partition is ".format(check) + Fore.CYAN + "Bootable" + Fore.WHITE,'SUCCESS')
+                    print_message("{} partitions are ".format(partition_counter-check) + Fore.RED + "NOT Bootable" + Fore.WHITE + "\n", 'SUCCESS')
+                 else:
+                    print_message("{} partitions are ".format(check) + Fore.CYAN + "Bootable" + Fore.WHITE, 'SUCCESS')
+                    print_message("{} partitions are ".format(partition_counter-check) + Fore.RED + "NOT Bootable" + Fore.WHITE + "\n", 'SUCCESS')
+              else :
+                print_message(Style.BRIGHT + Fore.YELLOW + "None of the partitions is bootable." + Fore.WHITE, 'WARNING')
+              print(table)
+              break 
+
+        # Logical partitions (EBR chain) and GPT partitions: they replace the primary slots in the rest of the report
+        partition_table = discoverPartitions(image, mbr)
+        if partition_table.scheme == 'GPT' or any(partition.scheme == 'EBR' for partition in partition_table.partitions):
+           print("")
+           if partition_table.scheme == 'GPT':
+              print_message("GUID Partition Table (disk GUID {}, {} entries of {} bytes at sector {})".format(Fore.GREEN + Style.BRIGHT + partition_table.gpt_header.guid + Style.NORMAL + Fore.WHITE,
+                            partition_table.gpt_header.num_entries, partition_table.gpt_header.entry_size, partition_table.gpt_header.entries_lba), 'SUCCESS')
+           else:
+              print_message("Logical partitions of the extended partition (EBR chain)", 'SUCCESS')
+           for warning in partition_table.warnings:
+              print("\t", end='')
+              print_message(warning.message, warning.level)
+           partitions_table = PrettyTable(["", "Scheme", "Bootable", "File System", "Name", "Start Sector (LBA)", "Number of Sectors", "Size (KB)"])
+           for partition in partition_table.partitions:
+              partitions_table.add_row(["Partition {}".format(partition.number), partition.scheme, partition.bootable, partition.file_system, partition.name,
+                                        partition.start_lba, partition.total_sectors, round(partition.total_sectors*512/1024)])
+           print(partitions_table)
+           # Only the FAT32 partitions are parsed (an extended partition starts with an EBR, not a boot sector)
+           fat32_partitions = [partition for partition in partition_table.partitions if 'FAT32' in partition.file_system]
+           last = max((partition.number for partition in fat32_partitions), default=0)
+           Partitions_StartingSector = [0] * last
+           FoundFileSystems = [""] * last
+           for partition in fat32_partitions:
+              Partitions_StartingSector[partition.number-1] = partition.start_lba
+              FoundFileSystems[partition.number-1] = partition.file_system
+           Allowed_Values = [str(partition.number) for partition in fat32_partitions]
+        elif partition_table.warnings:
+           for warning in partition_table.warnings:
+              print("\t", end='')
+              print_message(warning.message, warning.level)
+        # A partition starting beyond the end of a truncated image has no boot sector to parse (see the warnings above)
+        for partition in partition_table.partitions:
+           if not partitionInImage(image, partition) and partition.number <= len(Partitions_StartingSector):
+              Partitions_StartingSector[partition.number-1] = 0
+              FoundFileSystems[partition.number-1] = ""
+
+        cnt = 0
+        for element in FoundFileSystems:
+           if 'FAT32' in element:
+              cnt += 1
+      
+         # Stop the program if --mbr option is enabled or if the filesystem is not FAT32
+        if (args.mbr or cnt == 0) :
+           sys.exit()
+
+        print("\n")
+
+        # Analyzing the selected partitions up front (in parallel with --jobs, or with concurrent asynchronous reads with --async-io), results are printed in partition order:
+        selected_partitions = [(i+1, lba) for i, lba in enumerate(Partitions_StartingSector) if lba != 0 and (not args.partition or args.partition == str(i+1))]
+        scanned_partitions = {i+1 for i in range(len(FoundFileSystems)) if args.fat and 'FAT32' in FoundFileSystems[i]}
+        if args.async_io:
+           from .aio import pipelinedAnalyzePartitions
+           Analyses = pipelinedAnalyzePartitions(args.image, selected_partitions, scan=scanned_partitions, max_in_flight=args.in_flight,
+                                                 latency=args.latency/1000, profiler=profiler)
+        else:
+           Analyses = analyzePartitions(args.image, selected_partitions, scan=scanned_partitions, jobs=args.jobs, profiler=profiler)
+
+# Parsing Boot Sector of each FAT32 partition:
+
+        for i in range(len(Partitions_StartingSector)) :
+           
+           if (args.partition == str(i+1) and Partitions_StartingSector[i] == 0):
+              print_message("The selected partition does not have a starting sector.", 'WARNING')
+              sys.exit()
+           if args.partition :
+              if (args.partition not in Allowed_Values) :
+               print_message("The partition number you selected does not exist !! Choose one of {} next time.".format(", ".join(Allowed_Values)), 'ALERT')
+               sys.exit()
+              
+           if Partitions_StartingSector[i] == 0:
+              continue
+           elif ((args.partition == str(i+1) and Partitions_StartingSector[i] != 0) or not args.partition):
+            boot_sector = Analyses[i+1].boot_sector
+            
+            print_message("Parsing" + Fore.MAGENTA + " Boot Sector" + Fore.WHITE + " of Partition {} :".format(Style.BRIGHT + Fore.CYAN + str(i+1) + Style.NORMAL + Fore.WHITE), 'SUCCESS')
+            print("---------------------------------------\n")
+            pause()
+            cluster_size = clusterSize(boot_sector)
+            Warnings = Analyses[i+1].warnings
+            print_message("Jump Code Instructions: {}".format(Fore.GREEN + Style.BRIGHT + "0x" + str(jumpCode(boot_sector)))+ Style.NORMAL + Fore.WHITE, 'INFO')                               # 0x9058EB  JMP xxxx NOP
+            if args.verbose:
+               print_docs(f"Assembly instruction to jump to boot code: JMP + NOP.", "0-2", 3, "no")
+            print_message("OEM Name: {}".format(Fore.GREEN + Style.BRIGHT + oem(boot_sector))+ Style.NORMAL + Fore.WHITE, 'INFO')                                                              # MSDOS5.0
+            if args.verbose:
+               print_docs("OEM Name+version in Ascii.", "3-10", 8, "no")
+            print_message("The size of each sector in bytes: {}".format(Fore.GREEN + Style.BRIGHT + str(bytesPerSector(boot_sector)))+ Style.NORMAL + Fore.WHITE, 'INFO')                            # 512 (Must be one of 512, 1024, 2048, 4096)
+            
+            # Checking the size value of each sector: 
+            print_warning(Warnings, "boot_sector", "bytes_per_sector")
+            if args.verbose:
+               print_docs("Allowed values include 512, 1024, 2048, 4096.", "11-12", 2, "yes")
+            print_message("Number of Sectors Per cluster: {}".format(Fore.GREEN + Style.BRIGHT + str(sectorsPerCluster(boot_sector)))+ Style.NORMAL + Fore.WHITE, 'INFO')                      # 8 (Must be one of 1, 2, 4, 8, 16, 32, 64, 128.) 
+            
+            # Checking the number of sectors per cluster:
+            print_warning(Warnings, "boot_sector", "sectors_per_cluster")
+            if args.verbose:
+               print_docs("Allowed values are powers of 2, but the cluster size must be 32KB or smaller.", "13-13", 1, "yes")
+            print_message("The size of each Cluster in Bytes: {}".format(Fore.GREEN + Style.BRIGHT + str(cluster_size))+ Style.NORMAL + Fore.WHITE, 'INFO')  # 4096  (A cluster should have at most 32768 bytes. In rare cases 65536 is OK.)
+            
+            # Checking the cluster size value:
+            print_warning(Warnings, "boot_sector", "cluster_size")
+            print_message("Number of Reserved Sectors: {}".format(Fore.GREEN + Style.BRIGHT + str(reservedArea(boot_sector)))+ Style.NORMAL + Fore.WHITE, 'INFO')                              # 36 (FAT12 and FAT16 use 1. FAT32 uses 32 reserved sector and leaves 4 aside)
+            
+            # Checking the number of reserved sectors:
+            print_warning(Warnings, "boot_sector", "reserved_sectors")
+            if args.verbose:
+               print_docs("Size in sectors of the reserved area. FAT32 uses 32 reserved sector.", "14-15", 2, "yes")
+            print_message("Number of FAT copies: {}".format(Fore.GREEN + Style.BRIGHT + str(numOfFAT(boot_sector)))+ Style.NORMAL + Fore.WHITE, 'INFO')                                        # 2  (Typically two for redundancy, but according to Microsoft it can be one for some small storage devices.)
+            if args.verbose:
+               print_docs("Typically two for redundancy, but according to Microsoft it can be one for some small storage devices.", "16-16", 1, "yes")
+            print_message("Number of Root directory entries: {}".format(Fore.GREEN + Style.BRIGHT + str(numOfRootDirEntries(boot_sector)))+ Style.NORMAL + Fore.WHITE, 'INFO')                 # 0  (Always 0 for FAT32)
+            
+            # Checking the number of root directory enties:
+            print_warning(Warnings, "boot_sector", "root_dir_entries")
+            if args.verbose:
+               print_docs("This is, by default, 0 for FAT32 and typically 512 for FAT16.", "17-18", 2, "yes")
+            print_message("Total number of sectors in the filesystem: {}".format(Fore.GREEN + Style.BRIGHT + str(numOfSectors(boot_sector)))+ Style.NORMAL + Fore.WHITE, 'INFO')               # 0  (Always 0 for FAT32)
+            
+            # Checking the total number of sectors
+            print_warning(Warnings, "boot_sector", "total_sectors_16")
+            if args.verbose:
+               print_docs("If the number of sectors is larger than can be represented in this 2-byte value, a 4-byte value exists later in the data structure and this should be 0.", "19-20", 2, "yes")
+            print_message("Media Descriptor Type: {}".format(Fore.GREEN + Style.BRIGHT + "0x" + str(mediaType(boot_sector)))+ Style.NORMAL + Fore.WHITE, 'INFO')                               # 0xF8 (Only 2 values are supported (0xF8 and 0xF0)) REFER HERE: https://www.win.tue.nl/~aeb/linux/fs/fat/fat-1.html 
+            # Checking the Media type:
+            print_warning(Warnings, "boot_sector", "media_type")
+            if args.verbose:
+               print_docs("According to the Microsoft documentation, 0xf8 should be used for fixed disks and 0xf0 for removable", "21-21", 1, "no")
+            print_message("Number of sectors Per FAT: {}".format(Fore.GREEN + Style.BRIGHT + str(FATSize(boot_sector)))+ Style.NORMAL + Fore.WHITE, 'INFO')                                    # 0   (Alyways 0 for FAT32)
+            
+            # Checking the number of sectors per FAT
+            print_warning(Warnings, "boot_sector", "fat_size_16")
+            if args.verbose:
+               print_docs("16-bit size in sectors of each FAT for FAT12 and FAT16. For FAT32, this field is 0 by default", "22-23", 2, "yes")
+            print_message("Number of sectors Per Track: {}".format(Fore.GREEN + Style.BRIGHT + str(numOfSectorsPerTrack(boot_sector)))+ Style.NORMAL + Fore.WHITE, 'INFO')                     # 63
+            if args.verbose:
+               print_docs("Sectors per track of storage device.", "24-25", 2, "no")
+            print_message("Number of Heads: {}".format(Fore.GREEN + Style.BRIGHT + str(numOfHeads(boot_sector)))+ Style.NORMAL + Fore.WHITE, 'INFO')                                           # 255
+            if args.verbose:
+               print_docs("Number of heads in storage device.", "26-27", 2, "no")
+            print_message("Number of Hidden Sectors: {}".format(Fore.GREEN + Style.BRIGHT + str(numOfHiddenSectors(boot_sector)))+ Style.NORMAL + Fore.WHITE, 'INFO')                          # 8064 (Number of sectors before the start of partition)
+            if args.verbose:
+               print_docs("Hidden sectors are sectors preceding the start of partition.", "28-31", 4, "no")
+            print_message("Total number of sectors in the filesystem (Second value): {}".format(Fore.GREEN + Style.BRIGHT + str(totalNumberOfSectors(boot_sector)))+ Style.NORMAL + Fore.WHITE, 'INFO') # 15125184 (Either this value or the 16-bit value above must be 0.)
+            if args.verbose:
+               print_docs("32-bit value of number of sectors in file system. Either this value or the 16-bit value above must be 0.", "32-35", 4, "yes")
+            print_message("Number of Sectors Per FAT (Second Value): {}".format(Fore.GREEN + Style.BRIGHT + str(numOfHiddenSectors(boot_sector)))+ Style.NORMAL + Fore.WHITE, 'INFO')          # 14742
+            if args.verbose:
+               print_docs("32-bit size in sectors of one File Allocation Table 'FAT'", "36-39", 2, "yes")
+            print_message("Mirror Flags: " + Fore.GREEN + Style.BRIGHT + str(Flags(boot_sector)[:7]) + Fore.RED + str(Flags(boot_sector)[7]) + Fore.GREEN + str(Flags(boot_sector)[8:]) + Style.NORMAL + Fore.WHITE, 'INFO')                                                   # 0000000000000000 
+            if args.verbose:
+               print_docs("If " + Fore.RED + "bit 7 " + Fore.YELLOW + "is 1, only one of the FAT structures is active and its index is described in bits 0–3. Otherwise, all FAT structures are mirrors of each other.", "40-41", 4, "yes")
+            print_message("Filesystem Version: {}".format(Fore.GREEN + Style.BRIGHT + str(FAT32_version(boot_sector)))+ Style.NORMAL + Fore.WHITE, 'INFO')                                     # 0 (HighByte = Major Version, Low Byte = Minor Version)
+            if args.verbose:
+               print_docs("The major and minor version number => High Byte = Major Version, Low Byte = Minor Version", "42-43", 2, "yes")
+            print_message("First cluster of root directory: {}".format(Fore.GREEN + Style.BRIGHT + str(RootDirClusterNumber(boot_sector)))+ Style.NORMAL + Fore.WHITE, 'INFO')                 # 2 (Usually 2)
+            if args.verbose:
+               print_docs("Cluster where root directory can be found. Usually 2.", "44-47", 4, "yes")
+            print_message("Sector Number of Filesystem Information (FSINFO): {}".format(Fore.GREEN + Style.BRIGHT + str(FSINFOSectorNumber(boot_sector)))+ Style.NORMAL + Fore.WHITE, 'INFO')  # 1 (Ususally 1)
+            if args.verbose:
+               print_docs("Sector where FSINFO structure can be found. Usually 1.", "48-49", 2, "no")
+            print_message("Sector Number of Boot Sector Backup Copy: {}".format(Fore.GREEN + Style.BRIGHT + str(BackupBootSector(boot_sector)))+ Style.NORMAL + Fore.WHITE, 'INFO')            # 6 (Ususally 6)
+            if args.verbose:
+               print_docs("Sector where backup copy of boot sector is located. (Default is 6)", "50-51", 2, "no")
+            # .... SKIPPING 12 BYTES OF RESERVED AREA ....
+            if args.verbose:
+               print_docs("RESERVED", "52-63", "no", 12)
+            print_message("BIOS INT13h drive number: {}".format(Fore.GREEN + Style.BRIGHT + str(BIOSDriveNumber(boot_sector)))+ Style.NORMAL + Fore.WHITE, 'INFO')                             # 0 (Usually 0 or 0x80)
+            if args.verbose:
+               print_docs("Logical Drive Number ofPartition. Usually 0 or 0x80", "64-64", 1, "no")
+            # .... SKIPPING 1 UNUSED BYTE (used to be Current Head (used by Windows NT) => This line will be printed if in verbose mode
+            if args.verbose:
+               print_docs("NOT USED. Used to be Current Head (used by Windows NT)", "65-65", 1, "no")
+            print_message("Extended Boot Signature: {}".format(Fore.GREEN + Style.BRIGHT + "0x" + str(extendedBootSignature(boot_sector))) + Style.NORMAL + Fore.WHITE, 'INFO')                # 0x29  (Default: 0x29 =>  Indicates that the three following fields are present.)
+            
+            # Checking the extended boot signature value:
+            print_warning(Warnings, "boot_sector", "ext_boot_signature")
+            if args.verbose:
+               print_docs("Extended boot signature to identify if the next three values are valid. Default is 0x29", "66-66", 1, "no")
+            print_message("Serial Number of the Partition: {}".format(Fore.GREEN + Style.BRIGHT + str(partitionSerialNumber(boot_sector))) + Style.NORMAL + Fore.WHITE, 'INFO')                # 2955781185 (Some versions of Windows will calculate this based on the creation date and time.)
+            if args.verbose:
+               print_docs("Volume serial number, which some versions of Windows will calculate based on the creation date and time.", "67-70", 4, "no")
+            print_message("Volume name of the Partition: {}".format(Fore.GREEN + Style.BRIGHT + volumeName(boot_sector)) + Style.NORMAL + Fore.WHITE, 'INFO')                                  # "NO NAME"
+            if args.verbose:
+               print_docs("Volume label in ASCII. The user chooses this value when creating the file system.", "71-81", 11, "no")
+            print_message("Filesystem Type Label: {}".format(Fore.GREEN + Style.BRIGHT + FileSystemType(boot_sector)) + Style.NORMAL + Fore.WHITE, 'INFO')                                     # "FAT32"
+            
+            # Checking the filesystem type label:
+            print_warning(Warnings, "boot_sector", "fs_type")
+            if args.verbose:
+               print_docs("File system type label in ASCII. Standard values include 'FAT32', but nothing is required.", "72-89", 8, "no")
+            # .... SKIPPING 420 Bytes of Executable Code ....
+            if args.verbose:
+               print_docs("NOT USED.", "90–509", 420, "no")
+            print_message("Boot Sector Signature: {}".format(Fore.GREEN + Style.BRIGHT + "0x" + str(BootRecordSignature_1(boot_sector)).upper()) + Style.NORMAL + Fore.WHITE, 'INFO')          # 0xAA55 (Default 0xAA55)
+            
+            # Checking the boot sector signature:
+            print_warning(Warnings, "boot_sector", "signature")
+            if args.verbose:
+               print_docs("Signature value. Default is 0xAA55", "510-511", 2, "no")
+            FSINFO_StartingSector[i+1] = FSINFOSectorNumber(boot_sector)
+
+            if (args.partition == str(i+1)) :
+               sys.exit()
+
+        if args.partition :
+           sys.exit()
+
+        print("\n")
+
+# Parsing FSINFO of each partition:
+        
+        for key in FSINFO_StartingSector:
+           fsinfo = Analyses[key].fsinfo
+           Warnings = Analyses[key].warnings
+           print_message("Parsing" + Fore.MAGENTA + " FSINFO"  + Fore.WHITE + " of Partition {} :".format(Style.BRIGHT + Fore.CYAN + str(key) + Style.NORMAL + Fore.WHITE), 'SUCCESS')  
+           print("---------------------------------------\n")
+           pause()
+           print_message("First FSINFO Signature: {}".format(Fore.GREEN + Style.BRIGHT + "0x" + str(FSINFOSignature_1(fsinfo))) + Style.NORMAL + Fore.WHITE, 'INFO')     # 0x41615252 
+           
+           # Checking the first fsinfo signature value:
+           print_warning(Warnings, "fsinfo", "signature_1")
+           if args.verbose:
+              print_docs("FSINFO first signature. Default is 0x41615252.", "0-3", 4, "no")
+           # .... SKIPPING 480 Bytes UNUSED .... #
+           if args.verbose:
+              print_docs("NOT USED.", "5-483", 480, "no")
+           print_message("Second FSINFO Signature: {}".format(Fore.GREEN + Style.BRIGHT + "0x" + str(FSINFOSignature_2(fsinfo))) + Style.NORMAL + Fore.WHITE, 'INFO')    # 0x61417272 
+           
+           # Checking the second fsinfo signature value:
+           print_warning(Warnings, "fsinfo", "signature_2")
+           if args.verbose:
+              print_docs("FSINFO second signature. Default is 0x61417272.", "484-487", 4, "no")
+           print_message("Number of free clusters: {}".format(Fore.GREEN + Style.BRIGHT + str(NumOfFreeClusters(fsinfo))) + Style.NORMAL + Fore.WHITE, 'INFO')           # 1084620
+           if args.verbose:
+              print_docs("This one is set to 1 if unkown.", "488-491", 4, "no")  
+           print_message("Sector number of the next free cluster: {}".format(Fore.GREEN + Style.BRIGHT + str(NextFreeClusterSectorNumber(fsinfo))) + Style.NORMAL + Fore.WHITE, 'INFO')  # 3
+           if args.verbose:
+              print_docs("Cluster Number of Cluster that was Most Recently Allocated.", "492-495", 4, "no")  
+           # .... SKIPPING 12 Bytes RESERVED .... #
+           if args.verbose:
+              print_docs("NOT USED", "496-507", 12, "no")
+           print_message("FSINFO Sector Signature: {}".format(Fore.GREEN + Style.BRIGHT + "0x" + str(FsinfoSectorSignature(fsinfo)).upper()) + Style.NORMAL + Fore.WHITE, 'INFO')      # 0xAA550000
+           
+           # Checking the fsinfo sector signature value:
+           print_warning(Warnings, "fsinfo", "sector_signature")
+           if args.verbose:
+              print_docs("Signature. Default is 0xAA550000", "508-511", 4, "no")
+
+        if not args.fat :
+           sys.exit()
+
+        print("\n")
+
+# Parsing the FAT of each partition:
+
+        for key in Analyses:
+           analysis = Analyses[key]
+           if analysis.fat_stats is None:
+              continue
+           boot_sector = analysis.boot_sector
+           print_message("Parsing" + Fore.MAGENTA + " FAT"  + Fore.WHITE + " of Partition {} :".format(Style.BRIGHT + Fore.CYAN + str(key) + Style.NORMAL + Fore.WHITE), 'SUCCESS')
+           print("---------------------------------------\n")
+           print_message("Active FAT copy: {}".format(Fore.GREEN + Style.BRIGHT + str(analysis.active_fat)) + Style.NORMAL + Fore.WHITE, 'INFO')
+           print_message("First data sector: {}".format(Fore.GREEN + Style.BRIGHT + str(firstDataSector(boot_sector))) + Style.NORMAL + Fore.WHITE, 'INFO')
+           if analysis.fat_entries < clusterCount(boot_sector) + 2:
+              print("\t", end='')
+              print_message(f'The FAT is truncated in this image !! Only {analysis.fat_entries} of {clusterCount(boot_sector) + 2} entries could be read', 'WARNING')
+           for name, count in analysis.fat_stats.items():
+              print_message("{} clusters: {}".format(name, Fore.GREEN + Style.BRIGHT + str(count)) + Style.NORMAL + Fore.WHITE, 'INFO')
+           for name, count in analysis.tree_stats.items():
+              print_message("{}: {}".format(name, Fore.GREEN + Style.BRIGHT + str(count)) + Style.NORMAL + Fore.WHITE, 'INFO')
+           print("")
+
+    # Errors go to the standard error and end with a non-zero exit status, so that scripts and pipelines can detect them
+    except KeyboardInterrupt:
+        print("\n", file=sys.stderr)
+        print(Fore.RED + "[-] ^C The program has been INTERRUPTED !", file=sys.stderr)
+        sys.exit(130)
+
+    except BrokenPipeError:
+        # The reader of the output went away (| head): silence the flush of the remaining output at exit
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        sys.exit(1)
+
+    except FileNotFoundError as e:
+       print_message(f"No such file or directory '{e.filename}'", 'ALERT', file=sys.stderr)
+       sys.exit(1)
+
+    except Exception as e:
+        print(Fore.RED + "[-] " + str(e), file=sys.stderr)
+        sys.exit(1)
+
+    finally:
+        if image is not None:
+            image.close()
+        profiler.stop()
+        if profiler.enabled:
+            print_profile(profiler, args.profile_output, args.profile_format)
+
+if __name__ == "__main__":
+    main()
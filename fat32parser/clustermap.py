@@ -0,0 +1,153 @@
+from collections import namedtuple
+
+import numpy as np
+
+from .constants import SECTOR_SIZE
+from .directory import Volume
+from .fat import FAT_BAD, FAT_FREE
+from .partitions import discoverPartitions
+from .structures import firstDataSector, numOfFAT, numOfSectorsPerFAT, reservedArea, sectorsPerCluster
+
+# ------------------------------------------------------ #
+# Reverse map: cluster -> (file, offset within the file)  #
+# ------------------------------------------------------ #
+
+NO_OWNER = -1
+
+# area: 'mbr', 'unpartitioned', 'outside the image', 'not FAT32' (in a partition of another file system), 'not selected',
+# 'invalid boot sector', 'reserved sectors', 'FAT <n>', 'beyond the last cluster', or the area of the data cluster: 'file', 'slack' (after the end of the file in its
+# last cluster), 'directory', 'lost' (allocated but not reachable from any directory entry), 'bad' or 'unallocated'.
+Whois = namedtuple('Whois', ['offset', 'partition', 'area', 'cluster', 'path', 'file_offset'])
+
+class ClusterMap:
+    # owner[cluster] is the index of the file (or directory, 0 is the root directory) whose chain holds the cluster,
+    # NO_OWNER if none, and position[cluster] is the index of the cluster in that chain: the byte at offset `o` of the
+    # cluster is at position*cluster_size + o in the file. Both arrays have an entry per cluster of the FAT and are
+    # built in one pass over all the chains at once: pointer doubling gives the head of the chain of every cluster
+    # together with its distance to the head (list ranking), log2(clusters) vectorized steps. A cluster shared by
+    # cross-linked chains is attributed to only one of them.
+
+    def __init__(self, volume):
+        self.volume = volume
+        fat = volume.fat
+        entries = fat.entries
+        n = len(entries)
+        self.paths = ['/']
+        self.sizes = [0]
+        self.directories = [True]
+        first_clusters = [volume.boot_sector.root_cluster]
+        for entry in volume.walk():
+            if fat.is_valid_cluster(entry.first_cluster):
+                self.paths.append(entry.path)
+                self.sizes.append(entry.size)
+                self.directories.append(entry.is_directory)
+                first_clusters.append(entry.first_cluster)
+        self.sizes = np.array(self.sizes, dtype=np.int64)
+        self.directories = np.array(self.directories, dtype=bool)
+
+        clusters = np.arange(n, dtype=np.uint32)
+        linked = (entries >= 2) & (entries < n)
+        linked[:2] = False
+        predecessor = clusters.copy()
+        predecessor[entries[linked]] = clusters[linked]
+        position = (predecessor != clusters).astype(np.uint32)
+        for _ in range(max(1, int(np.ceil(np.log2(n + 1))))):
+            position += position[predecessor]
+            predecessor = predecessor[predecessor]
+        # A first cluster shared by several entries belongs to the first one found by the walk
+        heads, indices = np.unique(np.array(first_clusters, dtype=np.uint32), return_index=True)
+        valid = heads < n
+        head_owner = np.full(n, NO_OWNER, dtype=np.int32)
+        head_owner[heads[valid]] = indices[valid]
+        self.owner = head_owner[predecessor]
+        self.owner[entries == FAT_FREE] = NO_OWNER
+        self.owner[:2] = NO_OWNER
+        self.position = position
+
+    def __len__(self):
+        return len(self.owner)
+
+    def cluster_of(self, offsets):
+        # Cluster numbers of absolute byte offsets of the data area
+        return (np.asarray(offsets, dtype=np.int64) - self.volume.cluster_offset(2)) // self.volume.cluster_size + 2
+
+    def attribute(self, offsets):
+        # (cluster, area, path, offset in the file) of each absolute byte offset of the data area, vectorized lookups
+        volume = self.volume
+        offsets = np.asarray(offsets, dtype=np.int64)
+        clusters = self.cluster_of(offsets)
+        inside = (clusters >= 2) & (clusters < len(self))
+        safe = np.where(inside, clusters, 0)
+        owners = np.where(inside, self.owner[safe], NO_OWNER)
+        file_offsets = self.position[safe].astype(np.int64)*volume.cluster_size + (offsets - volume.cluster_offset(2)) % volume.cluster_size
+        values = volume.fat.entries[safe]
+        results = []
+        for cluster, owner, file_offset, value, ok in zip(clusters.tolist(), owners.tolist(), file_offsets.tolist(), values.tolist(), inside.tolist()):
+            if not ok:
+                results.append((cluster, "beyond the last cluster", None, None))
+            elif value == FAT_FREE:
+                results.append((cluster, "unallocated", None, None))
+            elif value == FAT_BAD:
+                results.append((cluster, "bad", None, None))
+            elif owner == NO_OWNER:
+                results.append((cluster, "lost", None, None))
+            elif self.directories[owner]:
+                results.append((cluster, "directory", self.paths[owner], file_offset))
+            else:
+                results.append((cluster, "file" if file_offset < self.sizes[owner] else "slack", self.paths[owner], file_offset))
+        return results
+
+def parseOffset(text):
+    # Byte offset, or sector number (of SECTOR_SIZE bytes) with an 's' suffix: 1048576, 0x100000, 2048s
+    text = text.strip().lower()
+    if text.endswith('s'):
+        return int(text[:-1], 0) * SECTOR_SIZE
+    return int(text, 0)
+
+def volumeArea(volume, offset):
+    # Area of the partition holding a byte offset, from the first data sector: ReservedSectors + NumberOfFATs * SectorsPerFAT
+    boot_sector = volume.boot_sector
+    sector = (offset - volume.partition_lba*SECTOR_SIZE) // boot_sector.bytes_per_sector
+    if sector < reservedArea(boot_sector):
+        return "reserved sectors"
+    if sector < firstDataSector(boot_sector):
+        return "FAT {}".format((sector - reservedArea(boot_sector)) // numOfSectorsPerFAT(boot_sector) + 1) if numOfFAT(boot_sector) else "FAT"
+    return None
+
+def whois(image, mbr, offsets, selected=None):
+    # Owner of each absolute byte offset of the image, in the order of `offsets`. The cluster map of a partition is only
+    # built if one of the offsets falls in its data area.
+    results = [None]*len(offsets)
+    pending = {}
+    partitions = [partition for partition in discoverPartitions(image, mbr).partitions if partition.start_lba and partition.total_sectors]
+    for index, offset in enumerate(offsets):
+        if offset < 0 or offset >= image.size:
+            results[index] = Whois(offset, None, "outside the image", None, None, None)
+            continue
+        # The smallest partition holding the offset: an extended partition holds its logical partitions
+        containing = [partition for partition in partitions if partition.start_lba*SECTOR_SIZE <= offset < (partition.start_lba + partition.total_sectors)*SECTOR_SIZE]
+        partition = min(containing, key=lambda partition: partition.total_sectors) if containing else None
+        if partition is None:
+            results[index] = Whois(offset, None, "mbr" if offset < SECTOR_SIZE else "unpartitioned", None, None, None)
+        elif 'FAT32' not in partition.file_system or (selected and selected != str(partition.number)):
+            results[index] = Whois(offset, partition.number, "not FAT32" if 'FAT32' not in partition.file_system else "not selected", None, None, None)
+        else:
+            pending.setdefault(partition, []).append(index)
+    for partition, indices in pending.items():
+        volume = Volume(image, partition.start_lba, number=partition.number)
+        if not volume.boot_sector.bytes_per_sector or not sectorsPerCluster(volume.boot_sector):
+            for index in indices:
+                results[index] = Whois(offsets[index], partition.number, "invalid boot sector", None, None, None)
+            continue
+        data = []
+        for index in indices:
+            area = volumeArea(volume, offsets[index])
+            if area is None:
+                data.append(index)
+            else:
+                results[index] = Whois(offsets[index], partition.number, area, None, None, None)
+        if data:
+            cluster_map = ClusterMap(volume)
+            for index, (cluster, area, path, file_offset) in zip(data, cluster_map.attribute([offsets[index] for index in data])):
+                results[index] = Whois(offsets[index], partition.number, area, cluster if area != "beyond the last cluster" else None, path, file_offset)
+    return results
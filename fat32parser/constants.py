@@ -0,0 +1,77 @@
+SECTOR_SIZE = 512
+MASTER_BOOT_CODE_LENGTH = 446
+PARTITION_TABLES_LENGTH = 16
+BOOT_SIGNATURE_LENGTH = 2
+BOOT_SECTOR_START = 0
+FSINFO_SECTOR_START = 0
+BOOT_SECTOR_SIZE = 512
+
+# Filesystems:
+FILE_SYSTEMS = {
+    "01": "FAT12",
+    "04": "FAT16",
+    "05": "MS Extended partition using CHS",
+    "06": "FAT16B",
+    "07": "NTFS, HPFS, exFAT",
+    "0B": "FAT32 CHS",
+    "0C": "FAT32 LBA",
+    "0E": "FAT16 LBA",
+    "0F": "MS Extended partition LBA",
+    "42": "Windows Dynamic Volume",
+    "82": "Linux Swap",
+    "83": "Linux Native File System (ext2/3/4, JFS, Reiser, xiafs, and others)",
+    "84": "Windows Hibernation Partition",
+    "85": "Linux Extended",
+    "8E": "Linux LVM",
+    "A5": "FreeBSD Slice",
+    "A6": "OpenBSD Slice",
+    "AB": "Mac OS X boot",
+    "AF": "HFS, HFS+",
+    "EE": "MS GPT",
+    "EF": "Intel EFI",
+    "FB": "VMware VMFS",
+    "FC": "VMware Swap",
+    }
+          # Others: https://thestarman.pcministry.com/asm/mbr/PartTypes.htm
+
+PREDEFINED_VALUES = {
+   "Boot_Flag": ["Bootable", "NOT Bootable"],
+   "BytesPerSector": [0, 512, 1024, 2048, 4096],
+   "SectorsPerCluster": [1, 2, 4, 8, 16, 32, 64, 128],
+   "ClusterSize": 32768,                                    # Must be 32 KB or smaller
+   "ReservedSectors": 32,                                   # FAT32 uses 32 (check if the number of reserved sectors is smaller greater than 32)
+   "NrRootDirEntries": 0,                                   # Must be 0
+   "SectorsPerFilesystem": 0,                               # Must be 0
+   "MediaType": ['f8', 'f0'],
+   "SectorsPerFat": 0,                                      # Must be 0
+   "ExtendedBootSignature": "29",
+   "FileSystemLabel": "FAT32   ",
+   "BootSectorSignature": "aa55",
+   "FSINFO_Signature1": "41615252",
+   "FSINFO_Signature2": "61417272",
+   "FSINFOSector_Signature": "aa550000",
+}
+
+# Partition types of the MBR that hold a chain of Extended Boot Records (logical partitions):
+EXTENDED_PARTITION_TYPES = (0x05, 0x0F, 0x85)
+GPT_PROTECTIVE_TYPE = 0xEE
+
+# GPT partition type GUIDs:
+GPT_PARTITION_TYPES = {
+    "C12A7328-F81F-11D2-BA4B-00A0C93EC93B": "EFI System",
+    "EBD0A0A2-B9E5-4433-87C0-68B6B72699C7": "Microsoft Basic Data",
+    "E3C9E316-0B5C-4DB8-817D-F92DF00215AE": "Microsoft Reserved",
+    "DE94BBA4-06D1-4D40-A16A-BFD50179D6AC": "Windows Recovery Environment",
+    "5808C8AA-7E8F-42E0-85D2-E1E90434CFB3": "Windows LDM Metadata",
+    "AF9B60A0-1431-4F62-BC68-3311714A69AD": "Windows LDM Data",
+    "21686148-6449-6E6F-744E-656564454649": "BIOS Boot",
+    "0FC63DAF-8483-4772-8E79-3D69D8477DE4": "Linux Filesystem",
+    "0657FD6D-A4AB-43C4-84E5-0933C84B4F4F": "Linux Swap",
+    "E6D6D379-F507-44C2-A23C-238F2A3DF928": "Linux LVM",
+    "A19D880F-05FC-4D3B-A006-743F0F84911E": "Linux RAID",
+    "48465300-0000-11AA-AA11-00306543ECAC": "HFS+",
+    "7C3457EF-0000-11AA-AA11-00306543ECAC": "APFS",
+    "516E7CB4-6ECF-11D6-8FF8-00022D09712B": "FreeBSD Data",
+}
+# GPT types that may hold a FAT32 file system (the boot sector tells whether it does):
+GPT_FAT_TYPES = ("C12A7328-F81F-11D2-BA4B-00A0C93EC93B", "EBD0A0A2-B9E5-4433-87C0-68B6B72699C7")
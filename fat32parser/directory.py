@@ -0,0 +1,229 @@
+import errno
+import os
+import struct
+from datetime import datetime
+
+from .structures import clusterSize, decode_boot_sector
+
+# --------------------------------------------- #
+# Analysis of the Directory Tree of a Partition #
+# --------------------------------------------- #
+
+DIR_ENTRY_SIZE = 32
+# Name, Attributes, NTReserved, CreateTimeTenth, CreateTime, CreateDate, AccessDate, ClusterHigh, WriteTime, WriteDate, ClusterLow, FileSize
+DIR_ENTRY_STRUCT = struct.Struct('<11sBBBHHHHHHHI')
+# Sequence, Name1 (5 chars), Attributes, Type, Checksum, Name2 (6 chars), ClusterLow (always 0), Name3 (2 chars)
+LFN_ENTRY_STRUCT = struct.Struct('<B10sBBB12sH4s')
+
+ATTR_READ_ONLY = 0x01
+ATTR_HIDDEN = 0x02
+ATTR_SYSTEM = 0x04
+ATTR_VOLUME_ID = 0x08
+ATTR_DIRECTORY = 0x10
+ATTR_ARCHIVE = 0x20
+ATTR_LONG_NAME = 0x0F
+
+END_OF_DIRECTORY = 0x00
+DELETED_ENTRY = 0xE5
+
+def dos_datetime(date, time=0, tenth=0):
+    # FAT date: bits 15-9 year since 1980, 8-5 month, 4-0 day. FAT time: bits 15-11 hours, 10-5 minutes, 4-0 seconds/2
+    if date == 0:
+        return None
+    try:
+        return datetime(1980 + (date >> 9), (date >> 5) & 0x0F, date & 0x1F,
+                        time >> 11, (time >> 5) & 0x3F, (time & 0x1F)*2 + tenth // 100, (tenth % 100)*10000)
+    except ValueError:
+        return None
+
+def lfn_checksum(short_name):
+    checksum = 0
+    for byte in short_name:
+        checksum = (((checksum & 1) << 7) + (checksum >> 1) + byte) & 0xFF
+    return checksum
+
+def short_name_to_str(short_name, nt_reserved=0):
+    if short_name[0] == 0x05:   # 0x05 stands for a leading 0xE5 character
+        short_name = b'\xe5' + short_name[1:]
+    base = short_name[:8].decode('latin-1').rstrip()
+    extension = short_name[8:].decode('latin-1').rstrip()
+    if nt_reserved & 0x08:
+        base = base.lower()
+    if nt_reserved & 0x10:
+        extension = extension.lower()
+    return base + '.' + extension if extension else base
+
+class DirEntry:
+    __slots__ = ('path', 'name', 'short_name', 'attributes', 'first_cluster', 'size', 'deleted',
+                 'create_date', 'create_time', 'create_tenth', 'access_date', 'write_date', 'write_time',
+                 'parent_cluster', 'offset')
+
+    def __init__(self, fields, long_name, parent_path, parent_cluster, offset, deleted=False):
+        (self.short_name, self.attributes, nt_reserved, self.create_tenth, self.create_time, self.create_date,
+         self.access_date, cluster_high, self.write_time, self.write_date, cluster_low, self.size) = fields
+        self.first_cluster = (cluster_high << 16) | cluster_low
+        self.name = long_name or short_name_to_str(self.short_name, nt_reserved)
+        self.path = parent_path.rstrip('/') + '/' + self.name
+        self.parent_cluster = parent_cluster
+        self.offset = offset        # Absolute byte offset of the short entry in the image
+        self.deleted = deleted
+
+    def __repr__(self):
+        return "<DirEntry {} cluster={} size={}>".format(self.path, self.first_cluster, self.size)
+
+    @property
+    def is_directory(self):
+        return bool(self.attributes & ATTR_DIRECTORY)
+
+    @property
+    def created(self):
+        return dos_datetime(self.create_date, self.create_time, self.create_tenth)
+
+    @property
+    def modified(self):
+        return dos_datetime(self.write_date, self.write_time)
+
+    @property
+    def accessed(self):
+        return dos_datetime(self.access_date)
+
+    def attribute_string(self):
+        return ''.join(flag if self.attributes & bit else '-' for bit, flag in
+                       ((ATTR_DIRECTORY, 'd'), (ATTR_ARCHIVE, 'a'), (ATTR_READ_ONLY, 'r'), (ATTR_HIDDEN, 'h'), (ATTR_SYSTEM, 's')))
+
+class Volume:
+
+    def __init__(self, image, partition_lba, boot_sector=None, number=None):
+        self.image = image
+        self.partition_lba = partition_lba
+        self.number = number
+        self.boot_sector = boot_sector or decode_boot_sector(image.boot_sector(partition_lba))
+        self.cluster_size = clusterSize(self.boot_sector)
+        self._fat = None
+
+    @property
+    def fat(self):
+        if self._fat is None:
+            from .fat import FAT     # NumPy is only imported once a FAT is needed
+            self._fat = FAT(self.image, self.partition_lba, self.boot_sector)
+        return self._fat
+
+    def cluster_offset(self, cluster_number):
+        return self.image.cluster_offset(self.partition_lba, self.boot_sector, cluster_number)
+
+    def read_run(self, first_cluster, count):
+        return self.image.read(self.cluster_offset(first_cluster), count*self.cluster_size)
+
+    def extents(self, first_cluster, size, contiguous=False):
+        # Byte extents (absolute offset, length) holding the first `size` bytes of a chain.
+        # Contiguous clusters are coalesced, so an unfragmented file is a single extent.
+        # With `contiguous`, the FAT is not followed (deleted files have lost their chain).
+        remaining = size
+        runs = [(first_cluster, (size + self.cluster_size - 1) // self.cluster_size)] if contiguous else self.fat.runs(first_cluster)
+        for first, count in runs:
+            if remaining <= 0:
+                break
+            length = min(count*self.cluster_size, remaining)
+            yield self.cluster_offset(first), length
+            remaining -= length
+
+    def extract(self, first_cluster, size, destination, contiguous=False):
+        # Copies a file to `destination` with one copy_file_range (or one write) per extent.
+        # Returns the number of bytes written, which is short if the image is truncated.
+        written = 0
+        with open(destination, 'wb', buffering=0) as output:
+            for offset, length in self.extents(first_cluster, size, contiguous):
+                length = max(0, min(length, self.image.size - offset))
+                copied = 0
+                if hasattr(os, 'copy_file_range'):
+                    try:
+                        while copied < length:
+                            count = os.copy_file_range(self.image.fileno(), output.fileno(), length - copied, offset + copied)
+                            if count == 0:
+                                break
+                            copied += count
+                    except OSError:
+                        pass    # Not supported between these file systems, fall back to a plain write
+                if copied < length:
+                    data = self.image.read(offset + copied, length - copied)
+                    output.write(data)
+                    data.release()
+                    copied = length
+                written += copied
+        return written
+
+    def extract_tree(self, entry, destination):
+        # Extracts a file or a whole directory below `destination`, keeping the modification times.
+        # Yields (entry, output path, bytes written) for every extracted file.
+        entries = [entry] if entry is not None and not entry.is_directory else \
+                  self.walk(entry.first_cluster if entry else None, entry.path if entry else '/')
+        base = entry.path.rsplit('/', 1)[0] if entry is not None else ''
+        for item in entries:
+            relative = item.path[len(base):].lstrip('/')
+            output = os.path.normpath(os.path.join(destination, relative))
+            if not output.startswith(os.path.normpath(destination) + os.sep):
+                continue    # Refuse names escaping the destination directory
+            if item.is_directory:
+                os.makedirs(output, exist_ok=True)
+                continue
+            os.makedirs(os.path.dirname(output), exist_ok=True)
+            written = self.extract(item.first_cluster, item.size, output)
+            if item.modified:
+                timestamp = item.modified.timestamp()
+                os.utime(output, (timestamp, timestamp))
+            yield item, output, written
+
+    def iter_directory(self, cluster_number, parent_path='/'):
+        # Yields the entries of one directory (no recursion), assembling long file names on the way.
+        long_name_parts = []
+        checksum = None
+        for first, count in self.fat.runs(cluster_number):
+            base = self.cluster_offset(first)
+            data = self.read_run(first, count)
+            for index, fields in enumerate(DIR_ENTRY_STRUCT.iter_unpack(data[:len(data) - len(data) % DIR_ENTRY_SIZE])):
+                short_name, attributes = fields[0], fields[1]
+                if short_name[0] == END_OF_DIRECTORY:
+                    return
+                if short_name[0] == DELETED_ENTRY:
+                    long_name_parts = []
+                    continue
+                if attributes & ATTR_LONG_NAME == ATTR_LONG_NAME:
+                    sequence, name1, _, _, lfn_sum, name2, _, name3 = LFN_ENTRY_STRUCT.unpack_from(data, index*DIR_ENTRY_SIZE)
+                    if sequence & 0x40:
+                        long_name_parts = []
+                        checksum = lfn_sum
+                    long_name_parts.append(name1 + name2 + name3)
+                    continue
+                long_name = None
+                if long_name_parts and checksum == lfn_checksum(short_name):
+                    long_name = b''.join(reversed(long_name_parts)).decode('utf-16-le', 'replace').split('\x00')[0]
+                long_name_parts = []
+                if attributes & ATTR_VOLUME_ID or short_name in (b'.          ', b'..         '):
+                    continue
+                yield DirEntry(fields, long_name, parent_path, cluster_number, base + index*DIR_ENTRY_SIZE)
+
+    def walk(self, cluster_number=None, parent_path='/', _visited=None):
+        # Depth-first walk of the tree. Subdirectories are only read when the walk reaches them,
+        # so memory is bounded by the depth of the tree rather than by the number of entries.
+        if cluster_number is None:
+            cluster_number = self.boot_sector.root_cluster
+        visited = set() if _visited is None else _visited
+        visited.add(cluster_number)
+        for entry in self.iter_directory(cluster_number, parent_path):
+            yield entry
+            if entry.is_directory and entry.first_cluster not in visited:
+                yield from self.walk(entry.first_cluster, entry.path, visited)
+
+    def lookup(self, path):
+        # Resolves a path component by component, returns None for the root directory.
+        entry = None
+        cluster_number = self.boot_sector.root_cluster
+        for component in [part for part in path.split('/') if part]:
+            for candidate in self.iter_directory(cluster_number, entry.path if entry else '/'):
+                if candidate.name.lower() == component.lower() or short_name_to_str(candidate.short_name).lower() == component.lower():
+                    entry = candidate
+                    break
+            else:
+                raise FileNotFoundError(errno.ENOENT, "No such file or directory", path)
+            cluster_number = entry.first_cluster
+        return entry
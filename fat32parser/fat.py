@@ -0,0 +1,81 @@
+import numpy as np
+
+from .structures import activeFAT, clusterCount
+
+# ------------------------------------------- #
+# Analysis of the File Allocation Table (FAT) #
+# ------------------------------------------- #
+
+FAT_ENTRY_MASK = 0x0FFFFFFF     # Only the low 28 bits of a FAT32 entry are meaningful
+FAT_FREE = 0x00000000
+FAT_RESERVED = 0x0FFFFFF0       # 0x0FFFFFF0 - 0x0FFFFFF6 are reserved values
+FAT_BAD = 0x0FFFFFF7
+FAT_EOC = 0x0FFFFFF8            # 0x0FFFFFF8 - 0x0FFFFFFF mark the end of a chain
+
+class FAT:
+
+    def __init__(self, image, partition_lba, boot_sector, index=None):
+        self.boot_sector = boot_sector
+        self.index = activeFAT(boot_sector) if index is None else index
+        region = image.fat_region(partition_lba, boot_sector, self.index)
+        length = min(len(region) // 4, clusterCount(boot_sector) + 2)
+        self.entries = np.frombuffer(region, dtype='<u4', count=length) & FAT_ENTRY_MASK
+        region.release()
+        self._breaks = None
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __getitem__(self, cluster_number):
+        return int(self.entries[cluster_number])
+
+    def is_valid_cluster(self, cluster_number):
+        return 2 <= cluster_number < len(self.entries)
+
+    def runs(self, start_cluster):
+        # Resolves a chain into (first cluster, number of clusters) runs of contiguous clusters.
+        # Each contiguous run is skipped in a single lookup instead of one FAT read per cluster.
+        if self._breaks is None:
+            clusters = np.arange(len(self.entries), dtype=np.uint32)
+            self._breaks = np.append(np.flatnonzero(self.entries[:-1] != clusters[:-1] + 1), len(self.entries) - 1)
+        runs = []
+        seen = set()
+        total = 0
+        cluster = start_cluster
+        while self.is_valid_cluster(cluster) and cluster not in seen:
+            seen.add(cluster)
+            last = int(self._breaks[np.searchsorted(self._breaks, cluster)])
+            runs.append((cluster, last - cluster + 1))
+            total += last - cluster + 1
+            if total > len(self.entries):
+               break    # Corrupted FAT: the chain is longer than the volume
+            cluster = int(self.entries[last])
+        return runs
+
+    def chain(self, start_cluster):
+        runs = self.runs(start_cluster)
+        if not runs:
+            return np.empty(0, dtype=np.uint32)
+        return np.concatenate([np.arange(first, first+count, dtype=np.uint32) for first, count in runs])
+
+    def free_runs(self):
+        # (first cluster, number of clusters) of every run of free clusters, found with a vectorized diff
+        free = np.concatenate(([False], self.entries[2:] == FAT_FREE, [False]))
+        edges = np.flatnonzero(np.diff(free.astype(np.int8)))
+        starts, ends = edges[::2] + 2, edges[1::2] + 2
+        return np.column_stack((starts, ends - starts))
+
+    def stats(self):
+        data = self.entries[2:]
+        free = int(np.count_nonzero(data == FAT_FREE))
+        bad = int(np.count_nonzero(data == FAT_BAD))
+        eoc = int(np.count_nonzero(data >= FAT_EOC))
+        reserved = int(np.count_nonzero((data >= FAT_RESERVED) & (data < FAT_BAD)))
+        return {
+            "Total": len(data),
+            "Free": free,
+            "Used": len(data) - free - bad - reserved,
+            "Bad": bad,
+            "Reserved": reserved,
+            "EOC": eoc,
+        }
@@ -0,0 +1,73 @@
+from collections import namedtuple
+
+import numpy as np
+
+from .fat import FAT_BAD, FAT_FREE, FAT_RESERVED
+from .fsck import pointerJump
+
+# ------------------------------------------ #
+# Fragmentation and allocation map of the FAT #
+# ------------------------------------------ #
+
+CLUSTER_FREE, CLUSTER_USED, CLUSTER_BAD, CLUSTER_RESERVED = range(4)
+HEATMAP_REGIONS = 256
+HEATMAP_SHADES = " .:-=+*#%@"
+
+FragmentationReport = namedtuple('FragmentationReport', [
+    'files', 'fragments', 'free_extents', 'largest_free_extent', 'heatmap', 'region_size',
+])
+
+def allocationRuns(fat):
+    # Run-length encoding of the state (free/used/bad/reserved) of every data cluster, found with a vectorized diff:
+    # (first cluster, number of clusters, state) of each run
+    data = fat.entries[2:]
+    states = np.full(len(data), CLUSTER_USED, dtype=np.uint8)
+    states[data == FAT_FREE] = CLUSTER_FREE
+    states[(data >= FAT_RESERVED) & (data < FAT_BAD)] = CLUSTER_RESERVED
+    states[data == FAT_BAD] = CLUSTER_BAD
+    starts = np.concatenate(([0] if len(states) else [], np.flatnonzero(np.diff(states)) + 1)).astype(np.int64)
+    lengths = np.diff(np.append(starts, len(states)))
+    return starts + 2, lengths, states[starts]
+
+def allocationHeatmap(starts, lengths, states, total_clusters, regions=HEATMAP_REGIONS):
+    # Number of free/used/bad/reserved clusters of each region of the volume: the runs are cut at the region
+    # boundaries and their lengths summed per (region, state), no per-cluster work
+    region_size = max(1, -(-total_clusters // regions))
+    regions = -(-total_clusters // region_size)
+    offsets = starts - 2
+    boundaries = np.arange(0, total_clusters, region_size)
+    position = np.searchsorted(offsets, boundaries, side='right')
+    cuts = np.insert(offsets, position, boundaries)
+    run = np.insert(np.arange(len(offsets)), position, position - 1)
+    cut_lengths = np.diff(np.append(cuts, total_clusters))
+    heatmap = np.bincount((cuts // region_size) * 4 + states[run], weights=cut_lengths, minlength=regions * 4)
+    return heatmap.reshape(regions, 4).astype(np.int64), region_size
+
+def fileFragments(fat, first_clusters):
+    # Number of fragments of the chain of each first cluster. The head of the chain of every cluster is found with
+    # pointer doubling, then each link to a non-adjacent cluster adds a fragment to the chain of its head.
+    entries = fat.entries
+    n = len(entries)
+    clusters = np.arange(n, dtype=np.uint32)
+    linked = (entries >= 2) & (entries < n)
+    linked[:2] = False
+    predecessor = clusters.copy()
+    predecessor[entries[linked]] = clusters[linked]
+    head = pointerJump(predecessor, max(1, int(np.ceil(np.log2(n + 1)))))
+    jumps = np.bincount(head[linked & (entries != clusters + 1)], minlength=n)
+    first_clusters = np.asarray(first_clusters, dtype=np.int64)
+    fragments = np.zeros(len(first_clusters), dtype=np.int64)
+    valid = (first_clusters >= 2) & (first_clusters < n)
+    fragments[valid] = jumps[first_clusters[valid]] + 1
+    return fragments
+
+def fragmentationReport(volume, regions=HEATMAP_REGIONS):
+    fat = volume.fat
+    files = [entry for entry in volume.walk() if not entry.is_directory]
+    fragments = fileFragments(fat, [entry.first_cluster for entry in files])
+    starts, lengths, states = allocationRuns(fat)
+    free = states == CLUSTER_FREE
+    free_extents = np.column_stack((starts[free], lengths[free]))
+    largest = tuple(int(value) for value in free_extents[np.argmax(free_extents[:, 1])]) if len(free_extents) else (0, 0)
+    heatmap, region_size = allocationHeatmap(starts, lengths, states, max(0, len(fat) - 2), regions)
+    return FragmentationReport(files, fragments, free_extents, largest, heatmap, region_size)
@@ -0,0 +1,84 @@
+from collections import namedtuple
+
+import numpy as np
+
+from .fat import FAT, FAT_EOC, FAT_FREE, FAT_RESERVED
+from .structures import clusterCount
+
+# -------------------------------------------- #
+# FAT consistency check (fsck)                 #
+# -------------------------------------------- #
+
+FsckReport = namedtuple('FsckReport', [
+    'mirror_differences', 'cross_linked', 'shared_first_clusters', 'loop_clusters', 'looping_clusters',
+    'invalid_pointers', 'lost_chains', 'lost_clusters', 'fsinfo_free_clusters', 'actual_free_clusters', 'next_free_cluster_ok',
+])
+
+def pointerJump(pointers, steps):
+    # Follows every pointer `2**steps` times at once (pointer doubling), one vectorized gather per step
+    for _ in range(steps):
+        pointers = pointers[pointers]
+    return pointers
+
+def checkVolume(volume, fsinfo=None):
+    # Near-linear checks over the FAT array: in-degree counting for cross-links and lost chains,
+    # pointer doubling (log2(clusters) vectorized steps) for loops and for the head of every chain.
+    fat = volume.fat
+    entries = fat.entries
+    n = len(entries)
+    sentinel = n
+    steps = max(1, int(np.ceil(np.log2(n + 1))))
+
+    # FAT copies compared to the active one
+    mirror_differences = {}
+    for index in range(volume.boot_sector.num_fats):
+        if index != fat.index:
+            copy = FAT(volume.image, volume.partition_lba, volume.boot_sector, index)
+            length = min(len(copy), n)
+            mirror_differences[index] = int(np.count_nonzero(copy.entries[:length] != entries[:length])) + abs(len(copy) - n)
+
+    clusters = np.arange(n + 1, dtype=np.uint32)
+    allocated = np.zeros(n + 1, dtype=bool)
+    allocated[2:n] = (entries[2:] != FAT_FREE) & (entries[2:] < FAT_RESERVED)
+    allocated[2:n] |= entries[2:] >= FAT_EOC
+    is_pointer = allocated[:n] & (entries < FAT_RESERVED)
+    in_range = is_pointer & (entries >= 2) & (entries < n)
+    valid = np.zeros(n, dtype=bool)
+    valid[in_range] = allocated[entries[in_range]]
+    invalid_pointers = int(np.count_nonzero(is_pointer & ~valid))
+
+    successor = np.full(n + 1, sentinel, dtype=np.uint32)
+    successor[:n][valid] = entries[valid]
+    in_degree = np.bincount(successor[:n][valid], minlength=n + 1)
+    cross_linked = np.flatnonzero(in_degree[:n] > 1)
+
+    # Chains that never reach an end of chain marker: after n jumps every walker of such a chain sits on its cycle
+    end = pointerJump(successor, steps)
+    looping = allocated & (end != sentinel)
+    loop_clusters = np.unique(end[looping])
+
+    # Head of the chain of every cluster, then chains not referenced by any directory entry
+    predecessor = clusters.copy()
+    predecessor[successor[:n][valid]] = clusters[:n][valid]
+    head = pointerJump(predecessor, steps)
+    first_clusters = [cluster for cluster in [volume.boot_sector.root_cluster] + [entry.first_cluster for entry in volume.walk()] if fat.is_valid_cluster(cluster)]
+    referenced = np.zeros(n + 1, dtype=bool)
+    referenced[first_clusters] = True
+    unique_first_clusters, counts = np.unique(np.array(first_clusters, dtype=np.uint32), return_counts=True)
+    # A first cluster used twice, or in the middle of another chain, is shared by two files
+    shared_first_clusters = np.union1d(unique_first_clusters[counts > 1], unique_first_clusters[in_degree[unique_first_clusters] > 0])
+    heads = allocated & (in_degree == 0)
+    lost = allocated & ~looping & ~referenced[head]
+    lost_chains = np.flatnonzero(heads & ~referenced)
+
+    actual_free = int(np.count_nonzero(entries[2:] == FAT_FREE))
+    fsinfo_free = next_free_ok = None
+    # The FSINFO counters describe the whole volume: they are not compared with a truncated FAT (None)
+    if fsinfo is not None and n >= clusterCount(volume.boot_sector) + 2:
+        fsinfo_free = fsinfo.free_clusters
+        next_free = fsinfo.next_free_cluster
+        # The hint is where the driver starts looking for a free cluster, the search wraps around the end of the FAT:
+        # any cluster number is a valid hint, even with no free cluster after it
+        next_free_ok = next_free == 0xFFFFFFFF or fat.is_valid_cluster(next_free)
+    return FsckReport(mirror_differences, cross_linked, shared_first_clusters, loop_clusters, int(np.count_nonzero(looping)),
+                      invalid_pointers, lost_chains, int(np.count_nonzero(lost)), fsinfo_free, actual_free, next_free_ok)
@@ -0,0 +1,72 @@
+import hashlib
+from collections import deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from .constants import SECTOR_SIZE
+from .partitions import discoverPartitions
+
+# -------------------------------------------- #
+# Hashing of the files of a partition          #
+# -------------------------------------------- #
+
+HASH_BLOCK_SIZE = 8*1024*1024   # Every digest is updated with a block before the next block is read
+
+# hashed: bytes actually hashed, truncated: fewer bytes than the size of the entry could be read (the image is truncated
+# or the chain is shorter than the file), the digests are then those of the first `hashed` bytes only
+FileHash = namedtuple('FileHash', ['digests', 'hashed', 'truncated'])
+
+def hashFile(volume, entry, algorithms):
+    # All the requested digests of a file in a single pass over its extents (hashlib releases the GIL)
+    digests = [hashlib.new(algorithm) for algorithm in algorithms]
+    hashed = 0
+    for offset, length in volume.extents(entry.first_cluster, entry.size):
+        data = volume.image.read(offset, length)    # Short if the extent runs past the end of the image
+        for position in range(0, len(data), HASH_BLOCK_SIZE):
+            block = data[position:position+HASH_BLOCK_SIZE]
+            for digest in digests:
+                digest.update(block)
+            block.release()
+        hashed += len(data)
+        data.release()
+    return FileHash([digest.hexdigest() for digest in digests], hashed, hashed < entry.size)
+
+def hashVolume(volume, algorithms, jobs=1):
+    # Yields (entry, FileHash) in walk order. Files are hashed by a thread pool, with a bounded number
+    # of files in flight so that memory stays constant on volumes with millions of files.
+    volume.fat.runs(volume.boot_sector.root_cluster)    # Builds the shared run index before the threads start
+    files = (entry for entry in volume.walk() if not entry.is_directory)
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        pending = deque()
+        for entry in files:
+            pending.append((entry, pool.submit(hashFile, volume, entry, algorithms)))
+            if len(pending) >= 4*max(1, jobs):
+                entry, future = pending.popleft()
+                yield entry, future.result()
+        while pending:
+            entry, future = pending.popleft()
+            yield entry, future.result()
+
+IMAGE_HASH_BLOCK_SIZE = 16*1024*1024     # Multiple of the sector size: partition boundaries fall on sector boundaries
+
+def hashImage(image, mbr, algorithms):
+    # Whole image and per-partition digests computed in a single sequential read of the image.
+    # Returns ({algorithm: digest}, {partition number: (byte range, {algorithm: digest}, truncated)}).
+    ranges = {}
+    for partition in discoverPartitions(image, mbr).partitions:
+        if partition.total_sectors:
+            ranges[partition.number] = (partition.start_lba*SECTOR_SIZE, (partition.start_lba + partition.total_sectors)*SECTOR_SIZE)
+    image_digests = [hashlib.new(algorithm) for algorithm in algorithms]
+    partition_digests = {number: [hashlib.new(algorithm) for algorithm in algorithms] for number in ranges}
+    for offset, block in image.stream(IMAGE_HASH_BLOCK_SIZE):
+        for digest in image_digests:
+            digest.update(block)
+        for number, (start, end) in ranges.items():
+            low, high = max(start, offset), min(end, offset + len(block))
+            if low < high:
+                part = block[low-offset:high-offset]
+                for digest in partition_digests[number]:
+                    digest.update(part)
+                part.release()
+    return ({algorithm: digest.hexdigest() for algorithm, digest in zip(algorithms, image_digests)},
+            {number: (ranges[number], {algorithm: digest.hexdigest() for algorithm, digest in zip(algorithms, digests)}, ranges[number][1] > image.size)
+             for number, digests in partition_digests.items()})
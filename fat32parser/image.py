@@ -0,0 +1,129 @@
+import mmap
+import os
+
+from .constants import BOOT_SECTOR_SIZE, SECTOR_SIZE
+
+# Process-wide counters of the reads of every image reader, the profiler (profiling.Profiler) reports their
+# difference over each stage. bytes_read counts the bytes returned by read() for the memory-mapped reader (its
+# actual disk reads are page faults) and the bytes read from the storage for the others.
+class IOCounters:
+    __slots__ = ('reads', 'bytes_read', 'read_syscalls', 'cache_hits', 'cache_misses')
+
+    def __init__(self):
+        for name in self.__slots__:
+            setattr(self, name, 0)
+
+    def snapshot(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+io_counters = IOCounters()
+
+# Location of the on-disk structures of an image, in terms of read(offset, size) only:
+# shared by the memory-mapped reader and the asynchronous one (aio.AsyncImageReader).
+class ImageLayout:
+
+    def sector(self, lba, count=1):
+        return self.read(lba*SECTOR_SIZE, count*SECTOR_SIZE)
+
+    def mbr(self):
+        return self.sector(0)
+
+    def boot_sector(self, partition_lba):
+        return self.read(partition_lba*SECTOR_SIZE, BOOT_SECTOR_SIZE)
+
+    def backup_boot_sector(self, partition_lba, boot_sector):
+        return self.read(partition_lba*SECTOR_SIZE + boot_sector.backup_boot_sector*boot_sector.bytes_per_sector, BOOT_SECTOR_SIZE)
+
+    def fsinfo(self, partition_lba, fsinfo_sector):
+        return self.read(partition_lba*SECTOR_SIZE + BOOT_SECTOR_SIZE + (fsinfo_sector - 1)*SECTOR_SIZE, SECTOR_SIZE)
+
+    def fat_offset(self, partition_lba, boot_sector, index=0):
+        return partition_lba*SECTOR_SIZE + boot_sector.fat_offset + index*boot_sector.fat_length
+
+    def fat_region(self, partition_lba, boot_sector, index=0):
+        return self.read(self.fat_offset(partition_lba, boot_sector, index), boot_sector.fat_length)
+
+    def data_offset(self, partition_lba, boot_sector):
+        return partition_lba*SECTOR_SIZE + boot_sector.data_offset
+
+    def cluster_offset(self, partition_lba, boot_sector, cluster_number):
+        return partition_lba*SECTOR_SIZE + boot_sector.data_offset + (cluster_number - 2)*boot_sector.cluster_size
+
+    def cluster(self, partition_lba, boot_sector, cluster_number, count=1):
+        return self.read(self.cluster_offset(partition_lba, boot_sector, cluster_number), count*boot_sector.cluster_size)
+
+# Memory-mapped image reader: the image is opened and mapped once, and every
+# parser stage receives zero-copy memoryview slices of it.
+class ImageReader(ImageLayout):
+
+    def __init__(self, image_path):
+        self.path = image_path
+        self._file = open(image_path, 'rb')
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"The image '{image_path}' is empty")
+        self._view = memoryview(self._mmap)
+        self.size = len(self._mmap)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._view is None:
+            return
+        self._view.release()
+        self._view = None
+        try:
+            self._mmap.close()
+        except BufferError:
+            pass    # Slices are still referenced, the mapping is released once they are collected
+        self._file.close()
+
+    def fileno(self):
+        return self._file.fileno()
+
+    @property
+    def mmap(self):
+        # The mapping itself, for bytes-like searches (re, find) that do not accept a memoryview slice
+        return self._mmap
+
+    def stream(self, block_size):
+        # Sequential read of the whole image into one reusable buffer (memory use does not grow with
+        # the image size, unlike reading through the mapping). Yields (offset, memoryview).
+        buffer = bytearray(block_size)
+        view = memoryview(buffer)
+        offset = 0
+        with open(self.path, 'rb', buffering=0) as f:
+            if hasattr(os, 'posix_fadvise'):
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)     # The advice applies to this open file only
+            while True:
+                count = f.readinto(buffer)
+                io_counters.read_syscalls += 1
+                io_counters.bytes_read += count
+                if not count:
+                    break
+                block = view[:count]
+                yield offset, block
+                block.release()
+                offset += count
+        view.release()
+
+    def read(self, offset, size=None):
+        view = self._view[offset:] if size is None else self._view[offset:offset+size]
+        io_counters.reads += 1
+        io_counters.bytes_read += len(view)
+        return view
+
+# Raw to Hex image converter:
+def raw2hex(image_path, data=None, start=None):
+    with ImageReader(image_path) as image:
+        raw_data = image.read(start or 0, data)
+        value = raw_data.hex()
+        raw_data.release()
+
+    return value
@@ -0,0 +1,103 @@
+import hashlib
+import os
+import sqlite3
+import zlib
+from collections import namedtuple
+
+from .directory import ATTR_DIRECTORY
+from .structures import activeFAT
+
+# ------------------------------------------------- #
+# Persistent path index of a partition (SQLite)     #
+# ------------------------------------------------- #
+
+INDEX_SUFFIX = '.fat32idx'
+INDEX_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS volumes (
+    id INTEGER PRIMARY KEY,
+    serial INTEGER NOT NULL,
+    fat_checksum INTEGER NOT NULL,
+    partition_lba INTEGER NOT NULL,
+    UNIQUE (serial, fat_checksum, partition_lba)
+);
+CREATE TABLE IF NOT EXISTS entries (
+    volume INTEGER NOT NULL,
+    path_key TEXT NOT NULL,
+    path TEXT NOT NULL,
+    first_cluster INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    attributes INTEGER NOT NULL,
+    parent TEXT NOT NULL,
+    PRIMARY KEY (volume, path_key)
+) WITHOUT ROWID;
+'''
+
+def defaultCachePath(image_path):
+    # The evidence directory is never written to unless asked: the default cache lives in the user cache directory,
+    # named after the image and a digest of its absolute path so that images with the same name do not collide
+    directory = os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'), 'fat32parser')
+    os.makedirs(directory, exist_ok=True)
+    digest = hashlib.sha1(os.path.abspath(image_path).encode()).hexdigest()[:12]
+    return os.path.join(directory, os.path.basename(image_path) + '-' + digest + INDEX_SUFFIX)
+
+IndexEntry = namedtuple('IndexEntry', ['path', 'first_cluster', 'size', 'attributes', 'parent'])
+
+def fatChecksum(volume):
+    # CRC32 of the active FAT: any allocation change in the volume changes it. The active FAT is read from the
+    # extended flags of the boot sector, like the FAT loader does, without loading the FAT itself.
+    region = volume.image.fat_region(volume.partition_lba, volume.boot_sector, activeFAT(volume.boot_sector))
+    checksum = zlib.crc32(region)
+    region.release()
+    return checksum
+
+class PathIndex:
+    # Path -> (first cluster, size, attributes, parent) index, built once per volume and cached
+    # in a SQLite file (in the user cache directory by default) keyed by the partition serial number and the FAT checksum.
+
+    def __init__(self, volume, cache_path=None):
+        self.volume = volume
+        try:
+            self.cache_path = cache_path or defaultCachePath(volume.image.path)
+            self.connection = sqlite3.connect(self.cache_path)
+            self.connection.executescript(INDEX_SCHEMA)
+        except (sqlite3.Error, OSError):
+            self.cache_path = ':memory:'    # Cache location not writable: keep the index for this run only
+            self.connection = sqlite3.connect(self.cache_path)
+            self.connection.executescript(INDEX_SCHEMA)
+        self.key = (volume.boot_sector.serial_number, fatChecksum(volume), volume.partition_lba)
+        row = self.connection.execute("SELECT id FROM volumes WHERE serial = ? AND fat_checksum = ? AND partition_lba = ?", self.key).fetchone()
+        self.cached = row is not None
+        self.volume_id = row[0] if row else self.build()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.connection.close()
+
+    def build(self):
+        serial, _, partition_lba = self.key
+        with self.connection:
+            # Drop the stale index left by a previous state of this volume
+            self.connection.execute("DELETE FROM entries WHERE volume IN (SELECT id FROM volumes WHERE serial = ? AND partition_lba = ?)", (serial, partition_lba))
+            self.connection.execute("DELETE FROM volumes WHERE serial = ? AND partition_lba = ?", (serial, partition_lba))
+            volume_id = self.connection.execute("INSERT INTO volumes (serial, fat_checksum, partition_lba) VALUES (?, ?, ?)", self.key).lastrowid
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?)",
+                ((volume_id, entry.path.lower(), entry.path, entry.first_cluster, entry.size, entry.attributes, entry.path.rsplit('/', 1)[0] or '/')
+                 for entry in self.volume.walk()))
+        return volume_id
+
+    def __len__(self):
+        return self.connection.execute("SELECT COUNT(*) FROM entries WHERE volume = ?", (self.volume_id,)).fetchone()[0]
+
+    def lookup(self, path):
+        path = '/' + path.strip('/')
+        if path == '/':
+            return IndexEntry('/', self.volume.boot_sector.root_cluster, 0, ATTR_DIRECTORY, None)
+        row = self.connection.execute("SELECT path, first_cluster, size, attributes, parent FROM entries WHERE volume = ? AND path_key = ?",
+                                      (self.volume_id, path.lower())).fetchone()
+        return IndexEntry(*row) if row else None
@@ -0,0 +1,137 @@
+import zlib
+from collections import namedtuple
+
+from .constants import (EXTENDED_PARTITION_TYPES, GPT_FAT_TYPES, GPT_PARTITION_TYPES, GPT_PROTECTIVE_TYPE, SECTOR_SIZE)
+from .structures import (GPT_ENTRY_STRUCT, GPT_HEADER_STRUCT, BOOT_SECTOR_STRUCT, ValidationWarning, decode_boot_sector,
+                         decode_gpt_entry, decode_gpt_header, decode_mbr)
+
+# ---------------------------------------------------- #
+# Partition discovery: MBR, EBR chain and GPT          #
+# ---------------------------------------------------- #
+
+GPT_SIGNATURE = b'EFI PART'
+GPT_MAX_ENTRIES = 1024              # The specification requires 128 entries, images with more are considered corrupted
+GPT_MAX_ENTRY_SIZE = 4096
+EBR_MAX_LOGICAL_PARTITIONS = 256    # Bounds the walk of a corrupted (looping) EBR chain
+FIRST_LOGICAL_PARTITION = 5         # Logical partitions are numbered after the four primary slots
+
+# number: 1-4 for the primary MBR slots, 5.. for the logical partitions, the entry index + 1 for GPT partitions
+Partition = namedtuple('Partition', ['number', 'scheme', 'start_lba', 'total_sectors', 'type', 'file_system', 'name', 'bootable'])
+
+PartitionTable = namedtuple('PartitionTable', ['scheme', 'partitions', 'gpt_header', 'warnings'])
+
+def partitionInImage(image, partition):
+    # The partition table of a truncated image may point past its end: such a partition has no boot sector to decode
+    return (partition.start_lba + 1)*SECTOR_SIZE <= image.size
+
+def outsideWarnings(image, partitions):
+    # Extended partitions are left out: the walk of their EBR chain already warns about an EBR outside of the image
+    return [ValidationWarning('partition', 'partitions[{}].start_lba'.format(partition.number),
+                              'Partition {} starts at sector {}, beyond the end of the image !! It is not parsed'.format(partition.number, partition.start_lba), 'WARNING')
+            for partition in partitions if partition.start_lba and partition.type not in EXTENDED_PARTITION_TYPES and not partitionInImage(image, partition)]
+
+def isFAT32(image, partition_lba):
+    # A partition holds a FAT32 file system if its boot sector says so (GPT types do not tell FAT32 from NTFS or exFAT)
+    data = image.boot_sector(partition_lba)
+    if len(data) < BOOT_SECTOR_STRUCT.size:
+        return False
+    boot_sector = decode_boot_sector(data)
+    return boot_sector.fs_type == b'FAT32   ' or (boot_sector.fat_size_16 == 0 and boot_sector.sectors_per_fat != 0 and boot_sector.signature == 0xAA55)
+
+def logicalPartitions(image, extended_lba, first_number=FIRST_LOGICAL_PARTITION):
+    # Walks the EBR chain of an extended partition: the first entry of each EBR is a logical partition (relative
+    # to this EBR), the second one points to the next EBR (relative to the extended partition). One sector per EBR.
+    partitions, warnings = [], []
+    seen = set()
+    ebr_lba = extended_lba
+    while len(partitions) < EBR_MAX_LOGICAL_PARTITIONS:
+        if ebr_lba in seen:
+            warnings.append(ValidationWarning('ebr', 'next_ebr', 'The EBR chain loops back to sector {} !!'.format(ebr_lba), 'ALERT'))
+            break
+        seen.add(ebr_lba)
+        data = image.sector(ebr_lba)
+        if len(data) < SECTOR_SIZE:
+            warnings.append(ValidationWarning('ebr', 'next_ebr', 'The EBR at sector {} is outside of the image !!'.format(ebr_lba), 'WARNING'))
+            break
+        ebr = decode_mbr(data)
+        if ebr.signature != 0xAA55:
+            warnings.append(ValidationWarning('ebr', 'signature', 'The EBR at sector {} has an invalid signature !!'.format(ebr_lba), 'WARNING'))
+            break
+        logical, next_ebr = ebr.partitions[0], ebr.partitions[1]
+        if logical.type != 0 and logical.total_sectors:
+            partitions.append(Partition(first_number + len(partitions), 'EBR', ebr_lba + logical.start_lba, logical.total_sectors,
+                                        logical.type, logical.file_system, '', logical.bootable))
+        if next_ebr.type not in EXTENDED_PARTITION_TYPES or next_ebr.start_lba == 0:
+            break
+        ebr_lba = extended_lba + next_ebr.start_lba
+    return partitions, warnings
+
+def readGPTHeader(image, lba):
+    data = image.sector(lba)
+    if len(data) < GPT_HEADER_STRUCT.size or bytes(data[:8]) != GPT_SIGNATURE:
+        return None, []
+    header = decode_gpt_header(data)
+    warnings = []
+    size = min(max(header.header_size, GPT_HEADER_STRUCT.size), SECTOR_SIZE)
+    raw = bytearray(data[:size])
+    raw[16:20] = b'\x00\x00\x00\x00'       # The header CRC32 is computed with its own field set to 0
+    if zlib.crc32(raw) != header.header_crc32:
+        warnings.append(ValidationWarning('gpt', 'header_crc32', 'The GPT header at sector {} has an invalid CRC32 !!'.format(lba), 'ALERT'))
+    return header, warnings
+
+def gptPartitions(image, header):
+    # The whole entry array is read at once, bounded by GPT_MAX_ENTRIES entries of at most GPT_MAX_ENTRY_SIZE bytes
+    warnings = []
+    if not GPT_ENTRY_STRUCT.size <= header.entry_size <= GPT_MAX_ENTRY_SIZE:
+        return [], [ValidationWarning('gpt', 'entry_size', 'The GPT entry size ({}) is invalid !!'.format(header.entry_size), 'ALERT')]
+    count = header.num_entries
+    if count > GPT_MAX_ENTRIES:
+        warnings.append(ValidationWarning('gpt', 'num_entries', 'The GPT announces {} entries, only the first {} are read'.format(count, GPT_MAX_ENTRIES), 'WARNING'))
+        count = GPT_MAX_ENTRIES
+    data = image.read(header.entries_lba*SECTOR_SIZE, count*header.entry_size)
+    if len(data) < count*header.entry_size:
+        warnings.append(ValidationWarning('gpt', 'entries_lba', 'The GPT entry array is truncated in this image !!', 'WARNING'))
+        count = len(data) // header.entry_size
+    elif count == header.num_entries and zlib.crc32(data) != header.entries_crc32:
+        warnings.append(ValidationWarning('gpt', 'entries_crc32', 'The GPT entry array has an invalid CRC32 !!', 'ALERT'))
+    partitions = []
+    for index in range(count):
+        entry = decode_gpt_entry(data, index*header.entry_size)
+        if entry.type_guid == bytes(16):
+            continue
+        type_name = GPT_PARTITION_TYPES.get(entry.partition_type, "Unknown (" + entry.partition_type + ")")
+        if entry.partition_type in GPT_FAT_TYPES and isFAT32(image, entry.first_lba):
+            type_name = "FAT32 (" + type_name + ")"
+        partitions.append(Partition(index + 1, 'GPT', entry.first_lba, entry.last_lba - entry.first_lba + 1, entry.partition_type, type_name,
+                                    entry.label, "Bootable" if entry.attributes & 0x4 else "NOT Bootable"))
+    data.release()
+    return partitions, warnings
+
+def discoverPartitions(image, mbr):
+    # Partitions of the image: the GPT ones if the MBR is a protective MBR, otherwise the primary MBR partitions
+    # followed by the logical partitions of the EBR chain of each extended partition.
+    if any(entry.type == GPT_PROTECTIVE_TYPE for entry in mbr.partitions):
+        header, warnings = readGPTHeader(image, 1)
+        if header is None or warnings:
+            # Damaged primary header: the backup one is in the last sector of the disk
+            backup, backup_warnings = readGPTHeader(image, image.size // SECTOR_SIZE - 1)
+            if backup is not None and not backup_warnings:
+                warnings.append(ValidationWarning('gpt', 'header', 'The primary GPT header is damaged, the backup header is used', 'WARNING'))
+                header = backup
+        if header is not None:
+            partitions, entry_warnings = gptPartitions(image, header)
+            return PartitionTable('GPT', partitions, header, warnings + entry_warnings + outsideWarnings(image, partitions))
+        warnings.append(ValidationWarning('gpt', 'header', 'The MBR is a protective MBR but no GPT header was found !!', 'ALERT'))
+    else:
+        warnings = []
+    partitions = []
+    for i, entry in enumerate(mbr.partitions):
+        if entry.type == 0 and entry.start_lba == 0:
+            continue
+        partitions.append(Partition(i + 1, 'MBR', entry.start_lba, entry.total_sectors, entry.type, entry.file_system, '', entry.bootable))
+    for entry in mbr.partitions:
+        if entry.type in EXTENDED_PARTITION_TYPES and entry.start_lba:
+            logical, ebr_warnings = logicalPartitions(image, entry.start_lba, FIRST_LOGICAL_PARTITION + sum(partition.scheme == 'EBR' for partition in partitions))
+            partitions += logical
+            warnings += ebr_warnings
+    return PartitionTable('MBR', partitions, None, warnings + outsideWarnings(image, partitions))
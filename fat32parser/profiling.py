@@ -0,0 +1,130 @@
+import json
+import time
+from collections import namedtuple
+from contextlib import contextmanager, nullcontext
+
+from .image import io_counters
+
+# ------------------------------------------------------- #
+# Per-stage profiling: wall time and I/O of each stage    #
+# ------------------------------------------------------- #
+
+# reads: read() calls on the image readers, bytes_read/read_syscalls/cache_hits/cache_misses: see image.IOCounters,
+# major_faults: page faults served from the storage (the disk reads of the memory-mapped reader).
+# depth: nesting level of the stage (stages can be opened inside other stages).
+StageProfile = namedtuple('StageProfile', ['stage', 'depth', 'seconds', 'reads', 'bytes_read', 'read_syscalls', 'cache_hits',
+                                           'cache_misses', 'major_faults'])
+
+METRICS = {
+    'seconds': ('seconds', 'Wall time of the stage'),
+    'reads': ('reads', 'Read requests made to the image readers'),
+    'bytes_read': ('read_bytes', 'Bytes read from the image'),
+    'read_syscalls': ('read_syscalls', 'Read system calls on the image'),
+    'cache_hits': ('cache_hits', 'Reads served from the prefetch cache'),
+    'cache_misses': ('cache_misses', 'Reads that missed the prefetch cache'),
+    'major_faults': ('major_faults', 'Page faults served from the storage'),
+}
+
+def majorFaults():
+    try:
+        import resource
+    except ImportError:
+        return 0
+    return resource.getrusage(resource.RUSAGE_SELF).ru_majflt
+
+class NullProfiler:
+    # Default profiler: stages cost nothing when profiling is disabled
+    enabled = False
+
+    def stage(self, name):
+        return nullcontext()
+
+    def start(self, name):
+        pass
+
+    def stop(self):
+        pass
+
+NULL_PROFILER = NullProfiler()
+
+class Profiler:
+    # Records a StageProfile for every stage and calls the hooks (hook(profile)) as soon as a stage ends:
+    #
+    #   profiler = Profiler()
+    #   profiler.add_hook(lambda profile: print(profile.stage, profile.seconds))
+    #   imageAnalysis(path, scan=True, profiler=profiler)
+    #   print(profiler.to_prometheus())
+    #
+    # The counters are process-wide, a stage running while threads read the image accounts for their reads as well.
+    enabled = True
+
+    def __init__(self):
+        self.stages = []
+        self.hooks = []
+        self._depth = 0
+        self._current = None
+
+    def add_hook(self, hook):
+        self.hooks.append(hook)
+
+    @contextmanager
+    def stage(self, name):
+        index = len(self.stages)
+        self.stages.append(None)       # Outer stages are listed before the stages they contain
+        depth = self._depth
+        self._depth += 1
+        counters, faults = io_counters.snapshot(), majorFaults()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self._depth -= 1
+            io = [after - before for after, before in zip(io_counters.snapshot(), counters)]
+            profile = StageProfile(name, depth, elapsed, *io, majorFaults() - faults)
+            self.stages[index] = profile
+            for hook in self.hooks:
+                hook(profile)
+
+    def start(self, name):
+        # Opens a stage lasting until the next start() or stop(), for code that cannot be wrapped in a `with` block
+        self.stop()
+        self._current = self.stage(name)
+        self._current.__enter__()
+
+    def stop(self):
+        if self._current is not None:
+            current, self._current = self._current, None
+            current.__exit__(None, None, None)
+
+    def total(self):
+        # Sum of the outermost stages
+        outer = [profile for profile in self.stages if profile is not None and profile.depth == 0]
+        return StageProfile('total', 0, *(sum(getattr(profile, field) for profile in outer) for field in StageProfile._fields[2:]))
+
+    def to_dict(self):
+        return {"stages": [profile._asdict() for profile in self.stages if profile is not None], "total": self.total()._asdict()}
+
+    def to_json(self):
+        return json.dumps(self.to_dict(), indent=2)
+
+    def to_prometheus(self, prefix='fat32parser_stage_'):
+        # Prometheus text exposition format, one gauge per field labelled by stage
+        lines = []
+        stages = [profile for profile in self.stages if profile is not None]
+        for field, (name, description) in METRICS.items():
+            lines.append("# HELP {}{} {}".format(prefix, name, description))
+            lines.append("# TYPE {}{} gauge".format(prefix, name))
+            for profile in stages:
+                label = profile.stage.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+                lines.append('{}{}{{stage="{}"}} {}'.format(prefix, name, label, getattr(profile, field)))
+        return "\n".join(lines) + "\n"
+
+    def table(self):
+        from prettytable import PrettyTable
+        table = PrettyTable(["Stage", "Time (ms)", "Reads", "Bytes read", "Read syscalls", "Cache hits", "Cache misses", "Major faults"])
+        table.align["Stage"] = "l"
+        for profile in [profile for profile in self.stages if profile is not None] + [self.total()]:
+            table.add_row(["  "*profile.depth + profile.stage, "{:.3f}".format(profile.seconds*1000), profile.reads, profile.bytes_read,
+                           profile.read_syscalls, profile.cache_hits, profile.cache_misses, profile.major_faults])
+        return table
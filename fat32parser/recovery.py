@@ -0,0 +1,130 @@
+import itertools
+
+import numpy as np
+
+from .directory import (ATTR_LONG_NAME, ATTR_VOLUME_ID, DELETED_ENTRY, DIR_ENTRY_SIZE, DIR_ENTRY_STRUCT, END_OF_DIRECTORY,
+                        LFN_ENTRY_STRUCT, DirEntry, lfn_checksum)
+from .fat import FAT_FREE
+
+# -------------------------------------------- #
+# Recovery of deleted directory entries        #
+# -------------------------------------------- #
+
+# Directory entry layout as a NumPy structured dtype: a directory cluster is viewed as an array of records
+DIR_ENTRY_DTYPE = np.dtype([
+    ('name', 'V11'), ('attributes', 'u1'), ('nt_reserved', 'u1'), ('create_tenth', 'u1'),
+    ('create_time', '<u2'), ('create_date', '<u2'), ('access_date', '<u2'), ('cluster_high', '<u2'),
+    ('write_time', '<u2'), ('write_date', '<u2'), ('cluster_low', '<u2'), ('size', '<u4'),
+])
+
+LFN_MAX_ENTRIES = 20             # 255 characters, 13 per LFN entry
+LFN_CHARACTERS = 13
+
+def lfnWindow(previous, data, index):
+    # The entries preceding entry `index` of a run, as (bytes, index of the entry after them). An LFN set may start
+    # in the previous run of a fragmented directory: `previous` holds the last entries of the runs already read.
+    start = max(0, index - LFN_MAX_ENTRIES)
+    window = bytes(data[start*DIR_ENTRY_SIZE:index*DIR_ENTRY_SIZE])
+    if start == 0:
+        window = previous + window
+    return window, len(window) // DIR_ENTRY_SIZE
+
+def lfnTail(previous, data, limit):
+    # `previous` for the next run of the directory
+    return (previous + bytes(data[max(0, limit - LFN_MAX_ENTRIES)*DIR_ENTRY_SIZE:limit*DIR_ENTRY_SIZE]))[-LFN_MAX_ENTRIES*DIR_ENTRY_SIZE:]
+
+def deletedLongName(data, index, short_name):
+    # The LFN entries of a deleted file are also marked 0xE5, so their sequence numbers are lost: they are matched by
+    # their checksum only, and the set is only accepted if the terminator of the name is in its last part (or the
+    # last part is full). The first character of the short name is lost: every candidate is tried against the checksum.
+    parts = []
+    checksum = None
+    while index > 0:
+        index -= 1
+        _, name1, attributes, _, lfn_sum, name2, _, name3 = LFN_ENTRY_STRUCT.unpack_from(data, index*DIR_ENTRY_SIZE)
+        if attributes & ATTR_LONG_NAME != ATTR_LONG_NAME:
+            break
+        if checksum is None:
+            if not any(lfn_checksum(bytes([first]) + short_name[1:]) == lfn_sum for first in range(0x20, 0x100)):
+                break
+            checksum = lfn_sum
+        elif lfn_sum != checksum:
+            break
+        parts.append(name1 + name2 + name3)
+    if not parts:
+        return None
+    name = b''.join(parts).decode('utf-16-le', 'replace')
+    length = name.find('\x00')
+    if length == -1:
+        return name                 # The name fills its last part, there is no terminator
+    if name[length+1:].strip('\uffff') or length // LFN_CHARACTERS != len(parts) - 1:
+        return None                 # The terminator is not in the last part: the set mixes the parts of several names
+    return name[:length]
+
+# Deleting a file zeroes its FAT chain: its data can only be read back from the clusters following the first one,
+# assuming the file was contiguous. A file whose range of clusters is not all free was fragmented or partly overwritten.
+STATUS_RECOVERABLE = "recoverable if contiguous"
+STATUS_PARTIAL = "partial, not contiguous"
+
+def recoveryStatus(fat, entry, cluster_size):
+    if entry.size == 0 or entry.first_cluster == 0:
+        return "empty"
+    count = (entry.size + cluster_size - 1) // cluster_size
+    if not fat.is_valid_cluster(entry.first_cluster) or entry.first_cluster + count > len(fat):
+        return "invalid"
+    clusters = fat.entries[entry.first_cluster:entry.first_cluster+count]
+    if clusters[0] != FAT_FREE:
+        return "overwritten"
+    if np.count_nonzero(clusters) == 0:
+        return STATUS_RECOVERABLE
+    return STATUS_PARTIAL
+
+def scanDeletedRuns(volume, cluster_number, runs, path, pending, deleted_directory=False):
+    # Deleted short entries of one directory: each run of clusters is filtered as a whole array.
+    # Every entry of a deleted directory is reported, whether or not it was marked 0xE5 itself.
+    previous = b''
+    for first, count in runs:
+        data = volume.read_run(first, count)
+        records = np.frombuffer(data, dtype=DIR_ENTRY_DTYPE, count=len(data) // DIR_ENTRY_SIZE)
+        first_bytes = np.frombuffer(data, dtype=np.uint8, count=len(records)*DIR_ENTRY_SIZE)[::DIR_ENTRY_SIZE]
+        attributes = records['attributes']
+        end = np.flatnonzero(first_bytes == END_OF_DIRECTORY)
+        limit = end[0] if len(end) else len(records)
+        deleted = (first_bytes[:limit] != ord('.')) if deleted_directory else (first_bytes[:limit] == DELETED_ENTRY)
+        mask = deleted & ((attributes[:limit] & ATTR_LONG_NAME) != ATTR_LONG_NAME) & ((attributes[:limit] & ATTR_VOLUME_ID) == 0)
+        for index in np.flatnonzero(mask):
+            fields = DIR_ENTRY_STRUCT.unpack_from(data, index*DIR_ENTRY_SIZE)
+            long_name = deletedLongName(*lfnWindow(previous, data, index), fields[0])
+            entry = DirEntry(fields, long_name, path, cluster_number, volume.cluster_offset(first) + index*DIR_ENTRY_SIZE, deleted=True)
+            if long_name is None and first_bytes[index] == DELETED_ENTRY:
+                entry.name = '_' + entry.name[1:]   # The first character of the short name is lost
+                entry.path = entry.path.rsplit('/', 1)[0] + '/' + entry.name
+            yield entry, recoveryStatus(volume.fat, entry, volume.cluster_size)
+            if entry.is_directory and volume.fat.is_valid_cluster(entry.first_cluster) and volume.fat[entry.first_cluster] == FAT_FREE:
+                pending.append((entry.first_cluster, entry.path))
+        previous = lfnTail(previous, data, limit)
+        del records, first_bytes, attributes
+        data.release()
+        if len(end):
+            return
+
+def scanDeleted(volume):
+    # Yields (DirEntry, status) for every deleted entry of every directory reachable from the root directory.
+    # Deleted subdirectories are scanned too (first cluster only, their chain is lost) if they still hold a '.' entry.
+    pending = []
+    directories = itertools.chain([(volume.boot_sector.root_cluster, '/')], ((entry.first_cluster, entry.path) for entry in volume.walk() if entry.is_directory))
+    visited = set()
+    for cluster_number, path in directories:
+        if cluster_number not in visited:
+            visited.add(cluster_number)
+            yield from scanDeletedRuns(volume, cluster_number, volume.fat.runs(cluster_number), path, pending)
+    while pending:
+        cluster_number, path = pending.pop()
+        if cluster_number in visited:
+            continue
+        visited.add(cluster_number)
+        head = volume.read_run(cluster_number, 1)
+        is_directory = bytes(head[:11]) == b'.          '
+        head.release()
+        if is_directory:
+            yield from scanDeletedRuns(volume, cluster_number, [(cluster_number, 1)], path, pending, deleted_directory=True)
@@ -0,0 +1,83 @@
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .clustermap import ClusterMap
+from .fragmentation import CLUSTER_FREE, allocationRuns
+from .image import ImageReader, io_counters
+
+# ------------------------------------------------------------ #
+# Keyword / regex search over file data, slack and free space  #
+# ------------------------------------------------------------ #
+
+SEARCH_AREAS = ("allocated", "slack", "unallocated")
+SEARCH_CHUNK_SIZE = 64*1024*1024
+SEARCH_OVERLAP = 4096           # Matches crossing a chunk boundary are found if they are shorter than this
+SEARCH_PREVIEW = 48             # Bytes of each match kept in the results
+
+# area: 'file', 'slack', 'directory', 'lost', 'bad' or 'unallocated' (see clustermap.Whois). path and file_offset are
+# None outside files and directories.
+SearchHit = namedtuple('SearchHit', ['offset', 'cluster', 'area', 'path', 'file_offset', 'match'])
+
+def searchRanges(image_path, pattern, ranges):
+    # (offset, first bytes) of the matches starting in each [start, end) range, a range is searched up to its `limit`
+    # (the end of its run of clusters) so that matches crossing into the next chunk are found
+    hits = []
+    with ImageReader(image_path) as image:
+        for start, end, limit in ranges:
+            stop = min(end + SEARCH_OVERLAP, limit, image.size)
+            io_counters.reads += 1     # The range is searched through the mapping, not read()
+            io_counters.bytes_read += max(0, stop - start)
+            for match in pattern.finditer(image.mmap, start, stop):
+                if match.start() >= end:
+                    break
+                hits.append((match.start(), match.group()[:SEARCH_PREVIEW]))
+    return hits
+
+def searchRuns(volume, areas):
+    # Runs of clusters to scan: the allocated ones for file data and slack, the free ones for unallocated space
+    starts, lengths, states = allocationRuns(volume.fat)
+    free = states == CLUSTER_FREE
+    wanted = np.zeros(len(states), dtype=bool)
+    if "allocated" in areas or "slack" in areas:
+        wanted |= ~free
+    if "unallocated" in areas:
+        wanted |= free
+    runs = []
+    for first, count in zip(starts[wanted].tolist(), lengths[wanted].tolist()):
+        if runs and runs[-1][0] + runs[-1][1] == first:
+            runs[-1][1] += count       # Adjacent free and allocated runs are scanned as one
+        else:
+            runs.append([first, count])
+    return runs
+
+def searchVolume(volume, pattern, areas=SEARCH_AREAS, jobs=1):
+    # Scans the data area in large chunks of the mapping (a chunk groups the small runs of clusters), dispatched to a
+    # process pool, then attributes the hits to files through the cluster map
+    tasks = [[]]
+    size = 0
+    data_end = volume.cluster_offset(len(volume.fat))
+    for first, count in searchRuns(volume, areas):
+        run_start = volume.cluster_offset(first)
+        run_end = min(run_start + count*volume.cluster_size, data_end, volume.image.size)
+        for chunk_start in range(run_start, run_end, SEARCH_CHUNK_SIZE):
+            chunk_end = min(chunk_start + SEARCH_CHUNK_SIZE, run_end)
+            if size + chunk_end - chunk_start > SEARCH_CHUNK_SIZE and tasks[-1]:
+                tasks.append([])
+                size = 0
+            tasks[-1].append((chunk_start, chunk_end, run_end))
+            size += chunk_end - chunk_start
+    if jobs > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(searchRanges, [volume.image.path]*len(tasks), [pattern]*len(tasks), tasks))
+    else:
+        results = [searchRanges(volume.image.path, pattern, ranges) for ranges in tasks]
+    hits = [hit for result in results for hit in result]
+    if not hits:
+        return
+    wanted = {"file", "directory", "lost", "bad"} if "allocated" in areas else set()
+    wanted |= {area for area in ("slack", "unallocated") if area in areas}
+    for (offset, match), (cluster, area, path, file_offset) in zip(hits, ClusterMap(volume).attribute([offset for offset, _ in hits])):
+        if area in wanted:
+            yield SearchHit(offset, cluster, area, path, file_offset, match)
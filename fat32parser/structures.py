@@ -0,0 +1,412 @@
+import struct
+import uuid
+from collections import namedtuple
+
+from .constants import FILE_SYSTEMS, MASTER_BOOT_CODE_LENGTH, PREDEFINED_VALUES
+
+# ------------------------------------------------------------------ #
+# Binary decoders: each structure is unpacked in a single struct pass #
+# ------------------------------------------------------------------ #
+
+# Partition entry: BootFlag, StartCHS, Type, EndCHS, StartLBA, TotalSectors (x4) + Signature
+MBR_STRUCT = struct.Struct('<' + str(MASTER_BOOT_CODE_LENGTH) + 'x' + 'B3sB3sII' * 4 + 'H')
+
+# JumpCode .. BackupBootSector, 12 reserved, DriveNumber, 1 unused, ExtSig, Serial, Label, FSType, 420 code, Signature
+BOOT_SECTOR_STRUCT = struct.Struct('<3s8sHBHBHHBHHHIIIHHIHH12xBxBI11s8s420xH')
+
+# Signature1, 480 unused, Signature2, FreeClusters, NextFreeCluster, 12 reserved, SectorSignature
+FSINFO_STRUCT = struct.Struct('<I480xIII12xI')
+
+# Signature, Revision, HeaderSize, HeaderCRC32, 4 reserved, CurrentLBA, BackupLBA, FirstUsableLBA, LastUsableLBA,
+# DiskGUID, EntriesLBA, NumberOfEntries, EntrySize, EntriesCRC32
+GPT_HEADER_STRUCT = struct.Struct('<8sIII4xQQQQ16sQIII')
+
+# TypeGUID, UniqueGUID, FirstLBA, LastLBA, Attributes, Name (36 UTF-16LE characters)
+GPT_ENTRY_STRUCT = struct.Struct('<16s16sQQQ72s')
+
+class cachedField:
+    # functools.cached_property needs an instance __dict__: this one keeps the value in the `_<name>` slot
+    # of the structure, so it is computed on first access only
+    def __init__(self, function):
+        self.function = function
+        self.slot = '_' + function.__name__
+        self.__doc__ = function.__doc__
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        try:
+            return getattr(instance, self.slot)
+        except AttributeError:
+            value = self.function(instance)
+            setattr(instance, self.slot, value)
+            return value
+
+class Structure:
+    # Decoded on-disk structure: the raw fields (FIELDS, in struct order) are unpacked once into slots.
+    # Records behave like the namedtuples they replace: _asdict(), equality, repr and pickling use FIELDS only.
+    __slots__ = ()
+    FIELDS = ()
+
+    def __init__(self, *values):
+        for name, value in zip(self.FIELDS, values):
+            setattr(self, name, value)
+
+    def _asdict(self):
+        return {name: getattr(self, name) for name in self.FIELDS}
+
+    def __iter__(self):
+        return (getattr(self, name) for name in self.FIELDS)
+
+    def __eq__(self, other):
+        return type(self) is type(other) and tuple(self) == tuple(other)
+
+    def __hash__(self):
+        return hash(tuple(self))
+
+    def __reduce__(self):
+        return (type(self), tuple(self))
+
+    def __repr__(self):
+        return '{}({})'.format(type(self).__name__, ', '.join('{}={!r}'.format(name, getattr(self, name)) for name in self.FIELDS))
+
+class PartitionEntry(Structure):
+    FIELDS = ('boot_flag', 'start_chs', 'type', 'end_chs', 'start_lba', 'total_sectors')
+    __slots__ = FIELDS + ('_bootable', '_file_system')
+
+    @cachedField
+    def bootable(self):
+        if self.boot_flag == 0x80:
+            return "Bootable"
+        elif self.boot_flag == 0x00:
+            return "NOT Bootable"
+        return "NOT Defined"
+
+    @cachedField
+    def file_system(self):
+        type_code = '%02X' % self.type
+        return FILE_SYSTEMS.get(type_code, "Unknown (0x" + type_code.lower() + ")")
+
+class MBR(Structure):
+    FIELDS = ('partitions', 'signature')
+    __slots__ = FIELDS
+
+class BootSector(Structure):
+    FIELDS = (
+        'jump_code', 'oem', 'bytes_per_sector', 'sectors_per_cluster', 'reserved_sectors',
+        'num_fats', 'root_dir_entries', 'total_sectors_16', 'media_type', 'fat_size_16',
+        'sectors_per_track', 'num_heads', 'hidden_sectors', 'total_sectors_32',
+        'sectors_per_fat', 'flags', 'version', 'root_cluster', 'fsinfo_sector',
+        'backup_boot_sector', 'drive_number', 'ext_boot_signature', 'serial_number',
+        'volume_label', 'fs_type', 'signature',
+    )
+    # Geometry derived from several fields, computed once when the boot sector is decoded (offsets in bytes from the partition start)
+    DERIVED = ('cluster_size', 'first_data_sector', 'cluster_count', 'fat_offset', 'fat_length', 'data_offset')
+    __slots__ = FIELDS + DERIVED + ('_oem_name', '_label', '_fs_type_name', '_active_fat')
+
+    def __init__(self, *values):
+        super().__init__(*values)
+        self.cluster_size = self.sectors_per_cluster * self.bytes_per_sector
+        self.first_data_sector = self.reserved_sectors + self.num_fats*self.sectors_per_fat
+        self.cluster_count = (self.total_sectors_32 - self.first_data_sector) // self.sectors_per_cluster if self.sectors_per_cluster else 0
+        self.fat_offset = self.reserved_sectors * self.bytes_per_sector
+        self.fat_length = self.sectors_per_fat * self.bytes_per_sector
+        self.data_offset = self.first_data_sector * self.bytes_per_sector
+
+    @cachedField
+    def oem_name(self):
+        return self.oem.decode('ascii')
+
+    @cachedField
+    def label(self):
+        return self.volume_label.decode('ascii')
+
+    @cachedField
+    def fs_type_name(self):
+        return self.fs_type.decode('ascii')
+
+    @cachedField
+    def active_fat(self):
+        # Bit 7 of the flags set means that only the FAT in bits 0-3 is active, otherwise FAT 0 is used
+        return self.flags & 0x0F if self.flags & 0x80 else 0
+
+class FSInfo(Structure):
+    FIELDS = ('signature_1', 'signature_2', 'free_clusters', 'next_free_cluster', 'sector_signature')
+    __slots__ = FIELDS
+
+class GPTHeader(Structure):
+    FIELDS = (
+        'signature', 'revision', 'header_size', 'header_crc32', 'current_lba', 'backup_lba',
+        'first_usable_lba', 'last_usable_lba', 'disk_guid', 'entries_lba', 'num_entries', 'entry_size', 'entries_crc32',
+    )
+    __slots__ = FIELDS + ('_guid',)
+
+    @cachedField
+    def guid(self):
+        return str(uuid.UUID(bytes_le=self.disk_guid)).upper()
+
+class GPTPartitionEntry(Structure):
+    FIELDS = ('type_guid', 'unique_guid', 'first_lba', 'last_lba', 'attributes', 'name')
+    __slots__ = FIELDS + ('_partition_type', '_label')
+
+    @cachedField
+    def partition_type(self):
+        return str(uuid.UUID(bytes_le=self.type_guid)).upper()
+
+    @cachedField
+    def label(self):
+        return self.name.decode('utf-16-le', 'replace').split('\x00', 1)[0]
+
+def decode_mbr(data, offset=0):
+    fields = MBR_STRUCT.unpack_from(data, offset)
+    partitions = tuple(PartitionEntry(*fields[i:i+6]) for i in range(0, 24, 6))
+    return MBR(partitions, fields[24])
+
+def decode_boot_sector(data, offset=0):
+    return BootSector(*BOOT_SECTOR_STRUCT.unpack_from(data, offset))
+
+def decode_fsinfo(data, offset=0):
+    return FSInfo(*FSINFO_STRUCT.unpack_from(data, offset))
+
+def decode_gpt_header(data, offset=0):
+    return GPTHeader(*GPT_HEADER_STRUCT.unpack_from(data, offset))
+
+def decode_gpt_entry(data, offset=0):
+    return GPTPartitionEntry(*GPT_ENTRY_STRUCT.unpack_from(data, offset))
+
+# ----------------------------------------- #
+# Analysis of the Master Boot Record - MBR  #
+# ----------------------------------------- #
+
+# Checking the state of partitions (Bootable/Non-Bootable)
+def bootable(mbr, partition_counter):
+    return mbr.partitions[partition_counter].bootable
+
+def startingSector_CHS(mbr, partition_counter):
+   return mbr.partitions[partition_counter].start_chs.hex()
+
+def fileSys(mbr, partition_counter):
+   return mbr.partitions[partition_counter].file_system
+
+def endingSector_CHS(mbr, partition_counter):
+   return mbr.partitions[partition_counter].end_chs.hex()
+
+def startingSector_LBA(mbr, partition_counter):
+   return mbr.partitions[partition_counter].start_lba
+
+def totalSectors(mbr, partition_counter):
+   return mbr.partitions[partition_counter].total_sectors
+
+def MBRSignature(mbr):
+   return '%04x' % mbr.signature
+
+# ----------------------------- #
+# Analysis of the Boot Sector   #
+# ----------------------------- #
+
+def jumpCode(boot_sector) :
+   # Size: 3 Bytes (offset 0)
+   return boot_sector.jump_code[::-1].hex()      # Hexadecimal value in little endian format.
+
+def oem(boot_sector) :
+   # Size: 8 Bytes (offset 3)
+   return boot_sector.oem_name
+
+def bytesPerSector(boot_sector):
+   # Size: 2 bytes (offset 11)
+   return boot_sector.bytes_per_sector   # Apply some checks on this value
+
+def sectorsPerCluster(boot_sector) :
+   # Size: 1 byte (offset 13)
+   return boot_sector.sectors_per_cluster   # Apply some checks on this value
+
+def clusterSize(boot_sector):
+   # Derived: SectorsPerCluster * BytesPerSector
+   return boot_sector.cluster_size
+
+def firstDataSector(boot_sector):
+   # Derived: ReservedSectors + NumberOfFATs * SectorsPerFAT
+   return boot_sector.first_data_sector
+
+def clusterCount(boot_sector):
+   # Derived: number of data clusters in the volume (cluster numbers 2 .. clusterCount+1)
+   return boot_sector.cluster_count
+
+def activeFAT(boot_sector):
+   # Index of the FAT copy in use (bits 0-3 of the flags when bit 7 is set, otherwise FAT 0)
+   return boot_sector.active_fat
+
+def reservedArea(boot_sector): # Reserved Clusters
+   # size: 2 bytes (offset 14)
+   return boot_sector.reserved_sectors
+
+def numOfFAT(boot_sector):
+   # Size: 1 byte (offset 16)
+   return boot_sector.num_fats
+
+def numOfRootDirEntries(boot_sector):
+   # Size: 2 bytes (offset 17)
+   return boot_sector.root_dir_entries      # Apply some checks on this value (Always == 0 for FAT32)
+
+def numOfSectors(boot_sector):
+   # Size: 2 bytes (offset 19)
+   return boot_sector.total_sectors_16      # Apply some checks on this value (Always == 0 for FAT32)
+
+def mediaType(boot_sector):
+   # Size: 1 byte (offset 21)
+   return '%02x' % boot_sector.media_type      # Apply some checks on this value. Only 2 values are supported (0xF8 and 0xF0)
+
+def FATSize(boot_sector) :
+   # Size: 2 bytes (offset 22)
+   return boot_sector.fat_size_16      # Apply some checks on this value (Always == 0 for FAT32)
+
+def numOfSectorsPerTrack(boot_sector) :
+   # Size: 2 bytes (offset 24)
+   return boot_sector.sectors_per_track
+
+def numOfHeads(boot_sector) :
+   # Size: 2 bytes (offset 26)
+   return boot_sector.num_heads
+
+def numOfHiddenSectors(boot_sector) :
+   # Size: 4 bytes (offset 28)
+   return boot_sector.hidden_sectors      # Apply some checks on this value
+
+def totalNumberOfSectors(boot_sector) :  # Number of Sectors in the entire disk
+   # Size: 4 bytes (offset 32)
+   return boot_sector.total_sectors_32      # Apply some checks on this value
+
+# --------------------------------------------------------------- #
+# Analysis of what's after the first 36 bytes of the boot sector  #
+# --------------------------------------------------------------- #
+def numOfSectorsPerFAT(boot_sector):
+   # Size: 4 bytes (offset 36)
+   return boot_sector.sectors_per_fat      # Apply some checks on this value
+
+def Flags(boot_sector):
+   # Size: 2 bytes (offset 40)
+   bits = format(boot_sector.flags, '016b')  # convert integer to binary string with leading zero
+   pretty_bits = ' '.join(bits[i:i+4] for i in range(0, len(bits), 4))
+   return pretty_bits    # If bit 7 is 1, only one of the FAT structures is active and its index is described in bits 0–3. Otherwise, all FAT structures are mirrors of each other.
+
+'''
+Bits 0-3: number of active FAT (if bit 7 is 1)
+Bits 4-6: reserved
+Bit 7: one: single active FAT; zero: all FATs are updated at runtime
+Bits 8-15: reserved
+'''
+
+def FAT32_version(boot_sector):
+   # Size: 2 bytes (offset 42)
+   return boot_sector.version      # Apply some checks on this value => Low bytes means MINOR VERSION and High bytes means MAJOR VERSION
+
+def RootDirClusterNumber(boot_sector) :  # Cluster Number of the Start of the Root Directory
+   # Size: 4 bytes (offset 44)
+   return boot_sector.root_cluster      # Apply some checks on this value
+
+def FSINFOSectorNumber(boot_sector) :  # Sector where FSINFO (File System Information Sector) structure can be found
+   # Size: 2 bytes (offset 48)
+   return boot_sector.fsinfo_sector      # Apply some checks on this value
+
+def BackupBootSector(boot_sector):    # Sector where backup copy of boot sector is located (Default is 6)
+   # Size: 2 bytes (offset 50)
+   return boot_sector.backup_boot_sector      # Apply some checks on this value
+
+# .... SKIPPING 12 BYTES OF RESERVED AREA ....
+
+def BIOSDriveNumber(boot_sector) :
+   # Size: 1 byte (offset 64)
+   return boot_sector.drive_number
+
+# .... SKIPPING 1 BYTE UNUSED ....
+
+def extendedBootSignature(boot_sector) :
+   # Size: 1 byte (offset 66)
+   return '%02x' % boot_sector.ext_boot_signature   # Apply some check on this value (Default is 0x29)
+
+def partitionSerialNumber(boot_sector) :
+   # Size: 4 bytes (offset 67)
+   return boot_sector.serial_number
+
+def volumeName(boot_sector):
+   # Size: 11 bytes (offset 71)
+   return boot_sector.label
+
+def FileSystemType(boot_sector):
+   # Size: 8 bytes (offset 82)
+   return boot_sector.fs_type_name
+
+# .... SKIPPING 420 Bytes of Executable Code
+
+def BootRecordSignature_1(boot_sector):
+   # Size: 2 bytes (offset 510)
+   return '%04x' % boot_sector.signature  # Apply some checks on this value.(Always == 55 AA)
+
+# --------------------------------------------------- #
+# Analysis of File System Information Sector (FSINFO) #
+# --------------------------------------------------- #
+
+def FSINFOSignature_1(fsinfo):
+   # Size: 4 bytes (offset 0)
+   return '%08x' % fsinfo.signature_1
+
+# .... SKIPPING UNUSED 480 Bytes ....
+
+def FSINFOSignature_2(fsinfo):
+   # Size: 4 bytes (offset 484)
+   return '%08x' % fsinfo.signature_2
+
+def NumOfFreeClusters(fsinfo):
+   # Size: 4 bytes (offset 488)
+   return fsinfo.free_clusters   # Set to 1 if unknown number
+
+def NextFreeClusterSectorNumber(fsinfo):
+   # Size: 4 bytes (offset 492)
+   return fsinfo.next_free_cluster
+
+# .... SKIPPING UNUSED 12 Bytes ....
+
+def FsinfoSectorSignature(fsinfo) :
+   # Size: 4 bytes (offset 508)
+   return '%08x' % fsinfo.sector_signature  # Apply Some checks here !!
+
+
+
+# ------------------------------------------ #
+# Validation of the decoded structures       #
+# ------------------------------------------ #
+
+ValidationWarning = namedtuple('ValidationWarning', ['structure', 'field', 'message', 'level'])
+
+def validateMBR(mbr):
+   warnings = []
+   for i in range(len(mbr.partitions)):
+      if bootable(mbr, i) == "NOT Defined":
+         warnings.append(ValidationWarning('mbr', 'partitions[{}].boot_flag'.format(i), 'The Bootable Flag value is invalid !!', 'ALERT'))
+   if MBRSignature(mbr) != PREDEFINED_VALUES["BootSectorSignature"]:
+      warnings.append(ValidationWarning('mbr', 'signature', 'The boot signature is invalid. It should be 0xAA55', 'WARNING'))
+   return warnings
+
+def validateBootSector(boot_sector):
+   checks = [
+      ('bytes_per_sector', bytesPerSector(boot_sector) not in PREDEFINED_VALUES["BytesPerSector"], 'This sector size value is invalid !!', 'WARNING'),
+      ('sectors_per_cluster', sectorsPerCluster(boot_sector) not in PREDEFINED_VALUES["SectorsPerCluster"], 'The number of sectors per cluster is invalid !!', 'WARNING'),
+      ('cluster_size', clusterSize(boot_sector) > PREDEFINED_VALUES["ClusterSize"], 'This cluster size is invalid !! It should be lesser than or equal to 32KB (KiloBytes)', 'WARNING'),
+      ('reserved_sectors', reservedArea(boot_sector) < PREDEFINED_VALUES["ReservedSectors"], 'The number of reserved sectors is invalid !! It should be greater than or equal to 32', 'WARNING'),
+      ('root_dir_entries', numOfRootDirEntries(boot_sector) != PREDEFINED_VALUES["NrRootDirEntries"], 'The number of root directory entries is invalid !! It should be equal to 0, by default', 'WARNING'),
+      ('total_sectors_16', numOfSectors(boot_sector) != PREDEFINED_VALUES["SectorsPerFilesystem"], 'The total number of sectors is invalid !! It should be equal to 0, by default', 'WARNING'),
+      ('media_type', mediaType(boot_sector) not in PREDEFINED_VALUES["MediaType"], 'The media descriptor type is invalid !!', 'WARNING'),
+      ('fat_size_16', FATSize(boot_sector) != PREDEFINED_VALUES["SectorsPerFat"], 'The number of sectors per FAT is invalid !! It should be 0, by default', 'WARNING'),
+      ('ext_boot_signature', extendedBootSignature(boot_sector) != PREDEFINED_VALUES["ExtendedBootSignature"], 'The extended boot signature is invalid !! It should be 0x29, by default', 'WARNING'),
+      ('fs_type', PREDEFINED_VALUES["FileSystemLabel"] not in FileSystemType(boot_sector), 'The file system label may be invalid !! It should be FAT32 but nothing is required, by default', 'WARNING'),
+      ('signature', BootRecordSignature_1(boot_sector) != PREDEFINED_VALUES["BootSectorSignature"], 'The boot sector signature is invalid !! It should be 0xAA55, by default', 'ALERT'),
+   ]
+   return [ValidationWarning('boot_sector', field, message, level) for field, failed, message, level in checks if failed]
+
+def validateFSInfo(fsinfo):
+   checks = [
+      ('signature_1', FSINFOSignature_1(fsinfo) != PREDEFINED_VALUES["FSINFO_Signature1"], 'The first FSINFO signature may be invalid !! It should be 0x41615252, but nothing is required', 'WARNING'),
+      ('signature_2', FSINFOSignature_2(fsinfo) != PREDEFINED_VALUES["FSINFO_Signature2"], 'The second FSINFO signature may be invalid !! It should be 0x61417272, but nothing is required', 'WARNING'),
+      ('sector_signature', FsinfoSectorSignature(fsinfo) != PREDEFINED_VALUES["FSINFOSector_Signature"], 'The FSINFO sector signature is invalid !! It should be 0xAA550000', 'WARNING'),
+   ]
+   return [ValidationWarning('fsinfo', field, message, level) for field, failed, message, level in checks if failed]
@@ -0,0 +1,229 @@
+from collections import namedtuple
+
+import numpy as np
+
+from .constants import SECTOR_SIZE
+from .directory import (ATTR_ARCHIVE, ATTR_DIRECTORY, DELETED_ENTRY, DIR_ENTRY_SIZE, DIR_ENTRY_STRUCT, LFN_ENTRY_STRUCT,
+                        lfn_checksum)
+from .fat import FAT_EOC, FAT_FREE
+from .structures import BOOT_SECTOR_STRUCT, FSINFO_STRUCT, MBR_STRUCT
+
+# ---------------------------------------------------------- #
+# Synthetic FAT32 images (benchmarks, reproducible fixtures) #
+# ---------------------------------------------------------- #
+
+# size_mb: image size, partitions: 1 to 4 primary FAT32 partitions sharing the image, cluster_size: bytes per cluster,
+# files: files of the whole image, file_size: mean file size (sizes are uniform in [0, 2*file_size]), fragmentation:
+# probability for each cluster of a chain to start a new fragment, depth/fanout: shape of the directory tree (fanout
+# subdirectories per directory down to `depth` levels), deleted: fraction of deleted files (entries kept, chains freed).
+ImageSpec = namedtuple('ImageSpec', ['size_mb', 'partitions', 'cluster_size', 'files', 'file_size', 'fragmentation', 'depth', 'fanout', 'deleted', 'seed'],
+                       defaults=[256, 1, 4096, 2000, 16384, 0.0, 3, 4, 0.0, 1])
+
+SyntheticImage = namedtuple('SyntheticImage', ['path', 'spec', 'partitions', 'files', 'directories', 'deleted', 'data_bytes'])
+
+SYNTHETIC_VERSION = 1           # Bumped whenever the layout of the generated images changes
+PARTITION_ALIGNMENT = 2048      # Partitions start on 1 MiB boundaries
+RESERVED_SECTORS = 32
+NUMBER_OF_FATS = 2
+FSINFO_SECTOR = 1
+BACKUP_BOOT_SECTOR = 6
+MAX_FRAGMENT_GAP = 8            # Free clusters left between two fragments of a chain
+PAYLOAD_SIZE = 1 << 20          # File contents are slices of one random buffer
+LFN_CHARACTERS = 13
+
+def dos_date_time(year, month, day, hours, minutes, seconds):
+    return ((year - 1980) << 9) | (month << 5) | day, (hours << 11) | (minutes << 5) | (seconds // 2)
+
+def lfn_entries(long_name, short_name, deleted=False):
+    # Long file name entries of a name, in on-disk order (last part first)
+    checksum = lfn_checksum(short_name)
+    encoded = long_name.encode('utf-16-le') + b'\x00\x00'
+    encoded += b'\xff' * (-len(encoded) % (2*LFN_CHARACTERS))
+    parts = [encoded[i:i+2*LFN_CHARACTERS] for i in range(0, len(encoded), 2*LFN_CHARACTERS)]
+    entries = []
+    for sequence, part in enumerate(parts, 1):
+        if sequence == len(parts):
+            sequence |= 0x40
+        entries.append(LFN_ENTRY_STRUCT.pack(DELETED_ENTRY if deleted else sequence, part[:10], 0x0F, 0, checksum, part[10:22], 0, part[22:26]))
+    return b''.join(reversed(entries))
+
+def lfn_entry_count(long_name):
+    return (len(long_name) + 1 + LFN_CHARACTERS - 1) // LFN_CHARACTERS
+
+class _Allocator:
+    # Hands out cluster chains from the start of the data region, leaving random gaps between fragments
+
+    def __init__(self, cluster_count, fragmentation, rng):
+        self.fat = np.zeros(cluster_count + 2, dtype='<u4')
+        self.fat[0], self.fat[1] = 0x0FFFFFF8, 0x0FFFFFFF
+        self.fragmentation = fragmentation
+        self.rng = rng
+        self.cursor = 2
+
+    def allocate(self, count):
+        # Returns the runs [(first cluster, count), ...] of a new chain of `count` clusters
+        breaks = []
+        if self.fragmentation and count > 1:
+            breaks = (np.flatnonzero(self.rng.random(count - 1) < self.fragmentation) + 1).tolist()
+        lengths = np.diff([0] + breaks + [count]).tolist()
+        gaps = self.rng.integers(1, MAX_FRAGMENT_GAP + 1, len(lengths)).tolist() if breaks else [0]*len(lengths)
+        runs = []
+        for length, gap in zip(lengths, gaps):
+            if self.cursor + length > len(self.fat):
+                raise ValueError("The synthetic image is too small for its files, increase its size or decrease the number of files")
+            runs.append((self.cursor, length))
+            self.cursor += length + gap
+        for (first, length), following in zip(runs, runs[1:] + [None]):
+            self.fat[first:first+length-1] = np.arange(first + 1, first + length, dtype='<u4')
+            self.fat[first+length-1] = following[0] if following else FAT_EOC | 0x7
+        return runs
+
+    def free(self, runs):
+        for first, length in runs:
+            self.fat[first:first+length] = FAT_FREE
+
+def _directoryTree(depth, fanout):
+    # [(parent index, level, index among its siblings)], the root directory first
+    directories = [(None, 0, 0)]
+    level = [0]
+    for depth_index in range(1, depth + 1):
+        following = []
+        for parent in level:
+            for k in range(fanout):
+                directories.append((parent, depth_index, k))
+                following.append(len(directories) - 1)
+        level = following
+    return directories
+
+def _timestamps(rng, count):
+    # Creation, modification and access date/times between 2010 and 2024, in this order
+    years, months, days = rng.integers(2010, 2025, count), rng.integers(1, 13, count), rng.integers(1, 29, count)
+    hours, minutes, seconds = rng.integers(0, 24, count), rng.integers(0, 60, count), rng.integers(0, 60, count)
+    return [dos_date_time(*map(int, values)) for values in zip(years, months, days, hours, minutes, seconds)]
+
+def _writeVolume(image, partition_lba, total_sectors, spec, file_count, rng, payload):
+    sectors_per_cluster = spec.cluster_size // SECTOR_SIZE
+    estimate = (total_sectors - RESERVED_SECTORS) // sectors_per_cluster
+    fat_sectors = ((estimate + 2)*4 + SECTOR_SIZE - 1) // SECTOR_SIZE
+    cluster_count = (total_sectors - RESERVED_SECTORS - NUMBER_OF_FATS*fat_sectors) // sectors_per_cluster
+    data_offset = (partition_lba + RESERVED_SECTORS + NUMBER_OF_FATS*fat_sectors)*SECTOR_SIZE
+    allocator = _Allocator(cluster_count, spec.fragmentation, rng)
+
+    directories = _directoryTree(spec.depth, spec.fanout)
+    children = {index: [] for index in range(len(directories))}
+    for index, (parent, _, _) in enumerate(directories[1:], 1):
+        children[parent].append(index)
+    owner = np.arange(file_count) % len(directories)
+    files = {index: [] for index in range(len(directories))}
+    for number, directory in enumerate(owner.tolist()):
+        files[directory].append(number)
+    sizes = rng.integers(0, 2*spec.file_size + 1, file_count).tolist()
+    deleted = (rng.random(file_count) < spec.deleted).tolist()
+    stamps = _timestamps(rng, 3*(file_count + len(directories)))
+
+    # First pass: allocation (a directory, then its files, like a tree copied onto an empty volume)
+    directory_runs, file_runs = {}, {}
+    for index in range(len(directories)):
+        entries = sum(lfn_entry_count(dir_name(child)) + 1 for child in children[index])
+        entries += sum(lfn_entry_count(file_name(number)) + 1 for number in files[index])
+        entries += 2 if index else 0
+        directory_runs[index] = allocator.allocate(max(1, (entries*DIR_ENTRY_SIZE + spec.cluster_size - 1) // spec.cluster_size))
+        for number in files[index]:
+            if sizes[number]:
+                file_runs[number] = allocator.allocate((sizes[number] + spec.cluster_size - 1) // spec.cluster_size)
+
+    def write_runs(runs, data):
+        position = 0
+        for first, length in runs:
+            if position >= len(data):
+                break
+            image.seek(data_offset + (first - 2)*spec.cluster_size)
+            image.write(data[position:position+length*spec.cluster_size])
+            position += length*spec.cluster_size
+
+    def entry(short_name, attributes, first_cluster, size, stamp, deleted=False):
+        (created_date, created_time), (write_date, write_time), (access_date, _) = stamps[stamp:stamp+3]
+        if deleted:
+            short_name = bytes([DELETED_ENTRY]) + short_name[1:]
+        return DIR_ENTRY_STRUCT.pack(short_name, attributes, 0, 0, created_time, created_date, access_date, first_cluster >> 16,
+                                     write_time, write_date, first_cluster & 0xFFFF, size)
+
+    # Second pass: contents and directory entries
+    data_bytes = 0
+    view = memoryview(payload)
+    for number, runs in file_runs.items():
+        start = (number*7919) % PAYLOAD_SIZE
+        data = view[start:start+sizes[number]] if sizes[number] <= PAYLOAD_SIZE else (payload * (sizes[number] // PAYLOAD_SIZE + 2))[start:start+sizes[number]]
+        write_runs(runs, data)
+        data_bytes += sizes[number]
+    for index, (parent, _, _) in enumerate(directories):
+        first_cluster = directory_runs[index][0][0]
+        blob = []
+        if index:
+            parent_cluster = directory_runs[parent][0][0] if parent else 0    # '..' of a first level directory points to 0 (root)
+            blob.append(entry(b'.          ', ATTR_DIRECTORY, first_cluster, 0, 3*index))
+            blob.append(entry(b'..         ', ATTR_DIRECTORY, parent_cluster, 0, 3*index))
+        for child in children[index]:
+            short_name = b'D%07X   ' % child
+            blob.append(lfn_entries(dir_name(child), short_name))
+            blob.append(entry(short_name, ATTR_DIRECTORY, directory_runs[child][0][0], 0, 3*child))
+        for number in files[index]:
+            short_name = b'F%07XBIN' % number
+            first = file_runs[number][0][0] if number in file_runs else 0
+            blob.append(lfn_entries(file_name(number), short_name, deleted[number]))
+            blob.append(entry(short_name, ATTR_ARCHIVE, first, sizes[number], 3*(len(directories) + number), deleted[number]))
+        write_runs(directory_runs[index], b''.join(blob))
+    for number, runs in file_runs.items():
+        if deleted[number]:
+            allocator.free(runs)
+
+    fat = allocator.fat.tobytes()
+    for index in range(NUMBER_OF_FATS):
+        image.seek((partition_lba + RESERVED_SECTORS + index*fat_sectors)*SECTOR_SIZE)
+        image.write(fat)
+    free = int(np.count_nonzero(allocator.fat[2:] == FAT_FREE))
+    boot_sector = BOOT_SECTOR_STRUCT.pack(b'\xebX\x90', b'MSWIN4.1', SECTOR_SIZE, sectors_per_cluster, RESERVED_SECTORS, NUMBER_OF_FATS,
+                                          0, 0, 0xF8, 0, 63, 255, partition_lba, total_sectors, fat_sectors, 0, 0, directory_runs[0][0][0],
+                                          FSINFO_SECTOR, BACKUP_BOOT_SECTOR, 0x80, 0x29, (spec.seed*2654435761 + partition_lba) & 0xFFFFFFFF,
+                                          b'SYNTHETIC  ', b'FAT32   ', 0xAA55)
+    fsinfo = FSINFO_STRUCT.pack(0x41615252, 0x61417272, free, min(allocator.cursor, cluster_count + 1), 0xAA550000)
+    for sector, data in ((0, boot_sector), (FSINFO_SECTOR, fsinfo), (BACKUP_BOOT_SECTOR, boot_sector), (BACKUP_BOOT_SECTOR + 1, fsinfo)):
+        image.seek((partition_lba + sector)*SECTOR_SIZE)
+        image.write(data)
+    return file_count, len(directories) - 1, sum(deleted), data_bytes
+
+def dir_name(index):
+    return "Directory {:05d}".format(index)
+
+def file_name(number):
+    return "synthetic file {:07d}.bin".format(number)
+
+def generateImage(path, spec=ImageSpec()):
+    # Writes a (sparse) raw image with an MBR and `spec.partitions` FAT32 partitions, returns a SyntheticImage
+    if not 1 <= spec.partitions <= 4:
+        raise ValueError("A synthetic image has 1 to 4 partitions")
+    if spec.cluster_size % SECTOR_SIZE or not 1 <= spec.cluster_size // SECTOR_SIZE <= 128 or spec.cluster_size & (spec.cluster_size - 1):
+        raise ValueError("The cluster size must be a power of two between 512 and 65536 bytes")
+    if not 0 <= spec.fragmentation < 1 or not 0 <= spec.deleted <= 1:
+        raise ValueError("The fragmentation and the deleted fraction must be between 0 and 1")
+    rng = np.random.default_rng(spec.seed)
+    payload = rng.integers(0, 256, PAYLOAD_SIZE, dtype=np.uint8).tobytes()
+    total_sectors = spec.size_mb*1024*1024 // SECTOR_SIZE
+    share = (total_sectors - PARTITION_ALIGNMENT) // spec.partitions // PARTITION_ALIGNMENT * PARTITION_ALIGNMENT
+    if share < PARTITION_ALIGNMENT:
+        raise ValueError("The synthetic image is too small for {} partitions".format(spec.partitions))
+    partitions, totals = [], [0, 0, 0, 0]
+    entries = []
+    with open(path, 'wb') as image:
+        image.truncate(spec.size_mb*1024*1024)
+        for k in range(spec.partitions):
+            partition_lba = PARTITION_ALIGNMENT + k*share
+            file_count = spec.files // spec.partitions + (k < spec.files % spec.partitions)
+            counts = _writeVolume(image, partition_lba, share, spec, file_count, rng, payload)
+            totals = [total + count for total, count in zip(totals, counts)]
+            partitions.append(partition_lba)
+            entries += [0x80 if k == 0 else 0x00, b'\xfe\xff\xff', 0x0C, b'\xfe\xff\xff', partition_lba, share]
+        entries += [0, b'', 0, b'', 0, 0] * (4 - spec.partitions)
+        image.seek(0)
+        image.write(MBR_STRUCT.pack(*entries, 0xAA55))
+    return SyntheticImage(path, spec, partitions, *totals)
@@ -0,0 +1,272 @@
+import csv
+import heapq
+import io
+import os
+import struct
+import tempfile
+import time
+from collections import namedtuple
+
+import numpy as np
+
+from .directory import ATTR_DIRECTORY, ATTR_LONG_NAME, ATTR_READ_ONLY, ATTR_VOLUME_ID, DELETED_ENTRY, DIR_ENTRY_SIZE, END_OF_DIRECTORY, \
+                       LFN_ENTRY_STRUCT, lfn_checksum, short_name_to_str
+from .fat import FAT_FREE
+from .recovery import DIR_ENTRY_DTYPE, deletedLongName, lfnTail, lfnWindow
+
+# --------------------------------------------------- #
+# MAC timeline of the directory entries               #
+# --------------------------------------------------- #
+
+# Times are in hundredths of a second since the epoch, -1 when the field is empty or invalid. FAT time stamps have no
+# time zone: they are written as if they were UTC. The access time stamp is a date only.
+TimelineEntry = namedtuple('TimelineEntry', ['partition', 'path', 'deleted', 'is_directory', 'read_only', 'size', 'first_cluster', 'offset',
+                                             'modified', 'accessed', 'created'])
+
+TIMELINE_HEADER = ["Date", "MACB", "Size", "Type", "Deleted", "Partition", "Path", "First Cluster", "Entry Offset"]
+DEFAULT_MEMORY_BUDGET = 256*1024*1024
+RUN_BUFFER_SIZE = 1024*1024
+MERGE_BUFFER_SIZE = 64*1024       # Read buffer of each run being merged
+MIN_MEMORY_BUDGET = 1024*1024
+MAX_MERGE_RUNS = 64
+LINE_OVERHEAD = 64          # Approximate memory used by a str object besides its characters
+
+DAYS_IN_MONTH = np.array([0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31], dtype=np.int64)
+
+def decodeTimestamps(dates, times=None, tenths=None):
+    # FAT dates (and times, and creation hundredths) of a whole array of entries -> hundredths of a second since the epoch
+    dates = dates.astype(np.int64)
+    year, month, day = 1980 + (dates >> 9), (dates >> 5) & 0x0F, dates & 0x1F
+    leap = (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+    valid = (month >= 1) & (month <= 12) & (day >= 1) & (day <= DAYS_IN_MONTH[np.clip(month, 0, 12)] + (leap & (month == 2)))
+    # Days since 1970-01-01 of a proleptic Gregorian date (days_from_civil)
+    shifted = year - (month <= 2)
+    era = shifted // 400
+    year_of_era = shifted - era*400
+    day_of_year = (153*((month + 9) % 12) + 2) // 5 + day - 1
+    days = era*146097 + year_of_era*365 + year_of_era // 4 - year_of_era // 100 + day_of_year - 719468
+    stamps = days*8640000
+    if times is not None:
+        times = times.astype(np.int64)
+        hours, minutes, seconds = times >> 11, (times >> 5) & 0x3F, (times & 0x1F)*2
+        valid &= (hours < 24) & (minutes < 60) & (seconds < 60)
+        stamps += (hours*3600 + minutes*60 + seconds)*100
+    if tenths is not None:
+        valid &= tenths < 200
+        stamps += tenths
+    return np.where(valid, stamps, -1)
+
+def formatTimestamp(stamp):
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(stamp // 100)) + ".{:02d}".format(stamp % 100)
+
+def liveLongName(data, index, short_name):
+    # Long name of a live entry from the LFN entries preceding it (last part first on disk)
+    checksum = lfn_checksum(short_name)
+    parts = []
+    while index > 0:
+        index -= 1
+        sequence, name1, attributes, _, lfn_sum, name2, _, name3 = LFN_ENTRY_STRUCT.unpack_from(data, index*DIR_ENTRY_SIZE)
+        if attributes & ATTR_LONG_NAME != ATTR_LONG_NAME or lfn_sum != checksum or sequence == DELETED_ENTRY:
+            break
+        parts.append(name1 + name2 + name3)
+        if sequence & 0x40:
+            return b''.join(parts).decode('utf-16-le', 'replace').split('\x00')[0]
+    return None
+
+def directoryTimeline(volume, cluster_number, runs, path, pending, deleted_directory=False):
+    # Entries (live and deleted) of one directory. Each run of clusters is decoded as a whole array: the time stamps,
+    # sizes and first clusters of all its entries at once, only the names are decoded entry by entry (an LFN set can
+    # start in the previous run, whose last entries are carried over).
+    previous = b''
+    for first, count in runs:
+        data = volume.read_run(first, count)
+        records = np.frombuffer(data, dtype=DIR_ENTRY_DTYPE, count=len(data) // DIR_ENTRY_SIZE)
+        first_bytes = np.frombuffer(data, dtype=np.uint8, count=len(records)*DIR_ENTRY_SIZE)[::DIR_ENTRY_SIZE]
+        end = np.flatnonzero(first_bytes == END_OF_DIRECTORY)
+        limit = end[0] if len(end) else len(records)
+        records, first_bytes = records[:limit], first_bytes[:limit]
+        attributes = records['attributes']
+        mask = ((attributes & ATTR_LONG_NAME) != ATTR_LONG_NAME) & ((attributes & ATTR_VOLUME_ID) == 0) & (first_bytes != ord('.'))
+        deleted = np.ones(limit, dtype=bool) if deleted_directory else first_bytes == DELETED_ENTRY
+        created = decodeTimestamps(records['create_date'], records['create_time'], records['create_tenth'])
+        modified = decodeTimestamps(records['write_date'], records['write_time'])
+        accessed = decodeTimestamps(records['access_date'])
+        clusters = (records['cluster_high'].astype(np.int64) << 16) | records['cluster_low']
+        base = volume.cluster_offset(first)
+        for index in np.flatnonzero(mask).tolist():
+            short_name = bytes(data[index*DIR_ENTRY_SIZE:index*DIR_ENTRY_SIZE+11])
+            is_deleted = bool(deleted[index])
+            if is_deleted:
+                name = deletedLongName(*lfnWindow(previous, data, index), short_name)
+                if name is None:
+                    name = short_name_to_str(short_name, int(records['nt_reserved'][index]))
+                    if short_name[0] == DELETED_ENTRY:
+                        name = '_' + name[1:]   # The first character of the short name is lost
+            else:
+                name = liveLongName(*lfnWindow(previous, data, index), short_name) or short_name_to_str(short_name, int(records['nt_reserved'][index]))
+            entry = TimelineEntry(volume.number, path.rstrip('/') + '/' + name, is_deleted, bool(attributes[index] & ATTR_DIRECTORY),
+                                  bool(attributes[index] & ATTR_READ_ONLY), int(records['size'][index]), int(clusters[index]),
+                                  base + index*DIR_ENTRY_SIZE, int(modified[index]), int(accessed[index]), int(created[index]))
+            yield entry
+            if entry.is_directory and volume.fat.is_valid_cluster(entry.first_cluster):
+                if not is_deleted:
+                    pending.append((entry.first_cluster, entry.path, False))
+                elif volume.fat[entry.first_cluster] == FAT_FREE:
+                    pending.append((entry.first_cluster, entry.path, True))
+        previous = lfnTail(previous, data, limit)
+        del records, first_bytes, attributes
+        data.release()
+        if len(end):
+            return
+
+def timelineEntries(volume):
+    # Yields a TimelineEntry for every entry of every directory, deleted ones included. Deleted subdirectories are
+    # decoded too (first cluster only, their chain is lost) if they still start with a '.' entry.
+    pending = [(volume.boot_sector.root_cluster, '/', False)]
+    visited = set()
+    while pending:
+        cluster_number, path, deleted_directory = pending.pop()
+        if cluster_number in visited:
+            continue
+        visited.add(cluster_number)
+        if deleted_directory:
+            head = volume.read_run(cluster_number, 1)
+            is_directory = bytes(head[:11]) == b'.          '
+            head.release()
+            if is_directory:
+                yield from directoryTimeline(volume, cluster_number, [(cluster_number, 1)], path, pending, deleted_directory=True)
+        else:
+            yield from directoryTimeline(volume, cluster_number, volume.fat.runs(cluster_number), path, pending)
+
+def timelineEvents(entry):
+    # (time, MACB flags) of an entry, the fields holding the same time are merged into one event (FAT has no 'c' time)
+    events = {}
+    for flag, stamp in (('m', entry.modified), ('a', entry.accessed), ('b', entry.created)):
+        if stamp >= 0:
+            events.setdefault(stamp, set()).add(flag)
+    return [(stamp, ''.join(flag if flag in flags else '.' for flag in 'macb')) for stamp, flags in events.items()]
+
+def bodyfileLine(entry, prefix=''):
+    # The Sleuth Kit body format 3: MD5|name|inode|mode|UID|GID|size|atime|mtime|ctime|crtime (the entry offset is the inode)
+    mode = ('d/d' if entry.is_directory else 'r/r') + ('r-xr-xr-x' if entry.read_only else 'rwxrwxrwx')
+    name = prefix + entry.path + (' (deleted)' if entry.deleted else '')
+    seconds = [max(stamp, 0) // 100 for stamp in (entry.accessed, entry.modified)]
+    return "0|{}|{}|{}|0|0|{}|{}|{}|0|{}\n".format(name.replace('|', '\\|'), entry.offset, mode, entry.size, *seconds, max(entry.created, 0) // 100)
+
+def writeBodyfile(entries, output, prefix=''):
+    # Unsorted, like the output of fls -m: mactime sorts it
+    count = 0
+    for entry in entries:
+        output.write(bodyfileLine(entry, prefix))
+        count += 1
+    return count
+
+class ExternalSort:
+    # Sorts lines within a memory budget: the lines are kept in memory until the budget is exceeded, then sorted and
+    # spilled to a file (a sorted run) of a private temporary directory, closed until it is merged. Iterating merges
+    # the runs with the lines still in memory, at most MAX_MERGE_RUNS runs at a time: groups of runs are first merged
+    # into longer runs until few enough are left (a multi-pass merge), so the number of open files stays bounded.
+
+    RECORD = struct.Struct('<I')
+
+    def __init__(self, memory_budget=DEFAULT_MEMORY_BUDGET, directory=None):
+        self.memory_budget = max(memory_budget, MIN_MEMORY_BUDGET)
+        self.directory = directory
+        self.lines = []
+        self.memory = 0
+        self.runs = []
+        self.spilled = 0
+        self._temporary = None
+        self._names = 0
+        self._open = []
+
+    def add(self, line):
+        self.lines.append(line)
+        self.memory += len(line) + LINE_OVERHEAD
+        if self.memory > self.memory_budget:
+            self.spill()
+
+    def _writeRun(self, lines):
+        if self._temporary is None:
+            self._temporary = tempfile.TemporaryDirectory(prefix='fat32parser-sort-', dir=self.directory)
+        self._names += 1
+        path = os.path.join(self._temporary.name, "run{}".format(self._names))
+        with open(path, 'wb', buffering=RUN_BUFFER_SIZE) as run:
+            for line in lines:
+                encoded = line.encode('utf-8', 'surrogatepass')
+                run.write(self.RECORD.pack(len(encoded)))
+                run.write(encoded)
+        return path
+
+    def spill(self):
+        if not self.lines:
+            return
+        self.lines.sort()
+        self.runs.append(self._writeRun(self.lines))
+        self.spilled += 1
+        self.lines = []
+        self.memory = 0
+
+    def _readRun(self, path):
+        with open(path, 'rb', buffering=MERGE_BUFFER_SIZE) as run:
+            self._open.append(run)
+            while True:
+                header = run.read(self.RECORD.size)
+                if len(header) < self.RECORD.size:
+                    break
+                yield run.read(self.RECORD.unpack(header)[0]).decode('utf-8', 'surrogatepass')
+
+    def _closeRuns(self):
+        for run in self._open:
+            run.close()
+        self._open = []
+
+    def __iter__(self):
+        self.lines.sort()
+        if not self.runs:
+            return iter(self.lines)
+        # The lines in memory take one of the MAX_MERGE_RUNS inputs of the last merge
+        while len(self.runs) > MAX_MERGE_RUNS - 1:
+            group, self.runs = self.runs[:MAX_MERGE_RUNS], self.runs[MAX_MERGE_RUNS:]
+            self.runs.append(self._writeRun(heapq.merge(*(self._readRun(path) for path in group))))
+            self._closeRuns()
+            for path in group:
+                os.remove(path)
+        return heapq.merge(self.lines, *(self._readRun(path) for path in self.runs))
+
+    def close(self):
+        self._closeRuns()
+        if self._temporary is not None:
+            self._temporary.cleanup()
+            self._temporary = None
+        self.runs = []
+        self.lines = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def writeTimeline(volumes, output, memory_budget=DEFAULT_MEMORY_BUDGET, temporary_directory=None):
+    # Sorted CSV timeline (one line per time and entry) of the given volumes. The ISO dates lead the lines,
+    # so sorting the lines as strings sorts them chronologically. Returns (entries, events, sorted runs spilled to disk).
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    entries = events = 0
+    with ExternalSort(memory_budget, temporary_directory) as sorter:
+        for volume in volumes:
+            for entry in timelineEntries(volume):
+                entries += 1
+                for stamp, macb in timelineEvents(entry):
+                    writer.writerow([formatTimestamp(stamp), macb, entry.size, 'd' if entry.is_directory else 'f', 'yes' if entry.deleted else 'no',
+                                     entry.partition, entry.path, entry.first_cluster, entry.offset])
+                    sorter.add(buffer.getvalue())
+                    buffer.seek(0)
+                    buffer.truncate()
+                    events += 1
+        runs = sorter.spilled
+        csv.writer(output, lineterminator='\n').writerow(TIMELINE_HEADER)
+        for line in sorter:
+            output.write(line)
+    return entries, events, runs
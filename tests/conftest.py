@@ -0,0 +1,44 @@
+import shutil
+
+import pytest
+
+from fat32parser.analysis import fat32Partitions
+from fat32parser.image import ImageReader
+from fat32parser.structures import decode_mbr
+from fat32parser.synthetic import ImageSpec, generateImage
+
+# ------------------------------------------------- #
+# Synthetic images shared by the tests              #
+# ------------------------------------------------- #
+
+# Small clusters and a high fragmentation: directories span several runs of clusters, so long name sets cross runs
+FRAGMENTED_SPEC = ImageSpec(size_mb=32, cluster_size=512, files=600, file_size=4096, fragmentation=0.5, depth=2, fanout=3, deleted=0.3, seed=7)
+CLEAN_SPEC = ImageSpec(size_mb=16, cluster_size=1024, files=120, file_size=8192, depth=1, fanout=2, seed=3)
+MULTI_SPEC = ImageSpec(size_mb=32, partitions=2, cluster_size=2048, files=200, file_size=8192, fragmentation=0.2, depth=1, fanout=3, seed=5)
+
+def volumes(image):
+    return list(fat32Partitions(image, decode_mbr(image.mbr())))
+
+@pytest.fixture(scope='session')
+def fragmented_image(tmp_path_factory):
+    return generateImage(str(tmp_path_factory.mktemp('images') / 'fragmented.img'), FRAGMENTED_SPEC)
+
+@pytest.fixture(scope='session')
+def clean_image(tmp_path_factory):
+    return generateImage(str(tmp_path_factory.mktemp('images') / 'clean.img'), CLEAN_SPEC)
+
+@pytest.fixture(scope='session')
+def multi_image(tmp_path_factory):
+    return generateImage(str(tmp_path_factory.mktemp('images') / 'multi.img'), MULTI_SPEC)
+
+@pytest.fixture
+def clean_copy(clean_image, tmp_path):
+    # A copy of the clean image that a test may damage
+    path = str(tmp_path / 'damaged.img')
+    shutil.copyfile(clean_image.path, path)
+    return path
+
+@pytest.fixture
+def fragmented_volume(fragmented_image):
+    with ImageReader(fragmented_image.path) as image:
+        yield volumes(image)[0]
@@ -0,0 +1,27 @@
+from fat32parser.carving import CarvedFile, carveVolume
+from fat32parser.image import ImageReader
+
+from conftest import volumes
+
+PLANTED = [
+    ("jpg", b'\xff\xd8\xff\xe0' + b'j'*100 + b'\xff\xd9'),
+    ("png", b'\x89PNG\r\n\x1a\n' + b'p'*100 + b'IEND\xaeB`\x82'),
+    ("gif", b'GIF87a' + b'g'*100 + b'\x00\x3b'),
+    ("gif", b'GIF89a' + b'g'*100 + b'\x00\x3b'),
+    ("pdf", b'%PDF-1.4' + b'd'*100 + b'%%EOF'),
+    ("zip", b'PK\x03\x04' + b'z'*100 + b'PK\x05\x06' + b'\x00'*18),
+]
+
+def test_carve_every_type(clean_copy):
+    with ImageReader(clean_copy) as image:
+        volume = volumes(image)[0]
+        first, count = max(volume.fat.free_runs().tolist(), key=lambda run: run[1])
+        assert count > len(PLANTED)
+        offsets = [volume.cluster_offset(first + index) for index in range(len(PLANTED))]
+    with open(clean_copy, 'r+b') as output:
+        for offset, (_, data) in zip(offsets, PLANTED):
+            output.seek(offset)
+            output.write(data)
+    with ImageReader(clean_copy) as image:
+        carved = sorted(carveVolume(volumes(image)[0]), key=lambda carved: carved.offset)
+    assert carved == [CarvedFile(name, offset, len(data)) for offset, (name, data) in zip(offsets, PLANTED)]
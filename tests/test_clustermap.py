@@ -0,0 +1,71 @@
+import sys
+
+import pytest
+
+from fat32parser import cli
+from fat32parser.clustermap import ClusterMap, parseOffset, whois
+from fat32parser.constants import SECTOR_SIZE
+from fat32parser.image import ImageReader
+from fat32parser.structures import decode_mbr, reservedArea
+
+from conftest import volumes
+
+def test_cluster_map_matches_chains(fragmented_volume):
+    cluster_map = ClusterMap(fragmented_volume)
+    fat = fragmented_volume.fat
+    owned = 0
+    for entry in fragmented_volume.walk():
+        if not fat.is_valid_cluster(entry.first_cluster):
+            continue
+        for position, cluster in enumerate(fat.chain(entry.first_cluster).tolist()):
+            assert cluster_map.paths[cluster_map.owner[cluster]] == entry.path
+            assert cluster_map.position[cluster] == position
+            owned += 1
+    root = fat.chain(fragmented_volume.boot_sector.root_cluster).tolist()
+    assert all(cluster_map.owner[cluster] == 0 for cluster in root)
+    assert owned + len(root) == int((cluster_map.owner != -1).sum())
+
+def test_attribute_file_offsets(fragmented_volume):
+    cluster_map = ClusterMap(fragmented_volume)
+    cluster_size = fragmented_volume.cluster_size
+    files = [entry for entry in fragmented_volume.walk() if not entry.is_directory and entry.size > cluster_size]
+    offsets, expected = [], []
+    for entry in files[:50]:
+        chain = fragmented_volume.fat.chain(entry.first_cluster).tolist()
+        for file_offset in (0, entry.size - 1, len(chain)*cluster_size - 1):
+            offsets.append(fragmented_volume.cluster_offset(chain[file_offset // cluster_size]) + file_offset % cluster_size)
+            expected.append((chain[file_offset // cluster_size], "file" if file_offset < entry.size else "slack", entry.path, file_offset))
+    assert cluster_map.attribute(offsets) == expected
+
+def test_whois_areas(multi_image):
+    with ImageReader(multi_image.path) as image:
+        first, second = volumes(image)
+        free = next(cluster for cluster in range(len(second.fat) - 1, 1, -1) if second.fat[cluster] == 0)
+        entry = next(entry for entry in second.walk() if not entry.is_directory and entry.size)
+        boot_sector = second.boot_sector
+        offsets = [
+            0,
+            SECTOR_SIZE,
+            image.size,
+            second.partition_lba*SECTOR_SIZE,
+            (second.partition_lba + reservedArea(boot_sector))*SECTOR_SIZE + 8,
+            second.cluster_offset(free),
+            second.cluster_offset(entry.first_cluster) + 5,
+        ]
+        results = whois(image, decode_mbr(image.mbr()), offsets)
+        assert [result.area for result in results] == ["mbr", "unpartitioned", "outside the image", "reserved sectors", "FAT 1", "unallocated", "file"]
+        assert [result.partition for result in results[3:]] == [second.number]*4
+        assert (results[-1].path, results[-1].file_offset, results[-1].cluster) == (entry.path, 5, entry.first_cluster)
+        selected = whois(image, decode_mbr(image.mbr()), offsets[-1:], selected=str(first.number))
+        assert selected[0].area == "not selected"
+
+def test_whois_command(multi_image, capsys, monkeypatch):
+    with ImageReader(multi_image.path) as image:
+        volume = volumes(image)[0]
+        entry = next(entry for entry in volume.walk() if not entry.is_directory and entry.size)
+        sector = volume.cluster_offset(entry.first_cluster) // SECTOR_SIZE
+    assert parseOffset("{}s".format(sector)) == sector*SECTOR_SIZE
+    monkeypatch.setattr(sys, 'argv', ['FAT32.py', '-i', multi_image.path, '--whois', "{}s".format(sector), '--fast'])
+    with pytest.raises(SystemExit):
+        cli.main()
+    assert entry.path in capsys.readouterr().out
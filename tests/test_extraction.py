@@ -0,0 +1,31 @@
+from fat32parser.fat import FAT_EOC
+
+def manualRead(volume, first_cluster, size):
+    # Follows the chain one FAT entry at a time and reads it one cluster at a time
+    data = bytearray()
+    cluster = first_cluster
+    while len(data) < size and 2 <= cluster < FAT_EOC:
+        chunk = volume.read_run(cluster, 1)
+        data += chunk
+        chunk.release()
+        cluster = volume.fat[cluster]
+    return bytes(data[:size])
+
+def test_extract_matches_fat_walk(fragmented_volume, tmp_path):
+    files = [entry for entry in fragmented_volume.walk() if not entry.is_directory and entry.size]
+    assert files
+    assert any(len(fragmented_volume.fat.runs(entry.first_cluster)) > 1 for entry in files)
+    for number, entry in enumerate(files):
+        destination = tmp_path / str(number)
+        assert fragmented_volume.extract(entry.first_cluster, entry.size, str(destination)) == entry.size
+        assert destination.read_bytes() == manualRead(fragmented_volume, entry.first_cluster, entry.size), entry.path
+
+def test_extents_cover_the_chain(fragmented_volume):
+    for entry in fragmented_volume.walk():
+        if entry.is_directory or not entry.size:
+            continue
+        chain = fragmented_volume.fat.chain(entry.first_cluster)
+        offsets = [offset for offset, length in fragmented_volume.extents(entry.first_cluster, entry.size)
+                   for offset in range(offset, offset + length, fragmented_volume.cluster_size)]
+        assert offsets == [fragmented_volume.cluster_offset(int(cluster)) for cluster in chain[:len(offsets)]]
+        assert sum(length for _, length in fragmented_volume.extents(entry.first_cluster, entry.size)) == entry.size
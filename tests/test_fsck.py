@@ -0,0 +1,84 @@
+import struct
+import sys
+
+import pytest
+
+from fat32parser import cli
+from fat32parser.fat import FAT_EOC
+from fat32parser.fsck import checkVolume
+from fat32parser.image import ImageReader
+from fat32parser.structures import decode_fsinfo
+
+from conftest import volumes
+
+def chains(path, minimum=3):
+    # Files of the first partition and their chains, the longest first
+    with ImageReader(path) as image:
+        volume = volumes(image)[0]
+        found = [(entry.path, volume.fat.chain(entry.first_cluster).tolist()) for entry in volume.walk() if not entry.is_directory]
+    return sorted([item for item in found if len(item[1]) >= minimum], key=lambda item: -len(item[1]))
+
+def setEntries(path, values):
+    # Writes FAT entries into every FAT copy of the first partition
+    with ImageReader(path) as image:
+        volume = volumes(image)[0]
+        offsets = [image.fat_offset(volume.partition_lba, volume.boot_sector, index) for index in range(volume.boot_sector.num_fats)]
+    with open(path, 'r+b') as output:
+        for offset in offsets:
+            for cluster, value in values.items():
+                output.seek(offset + 4*cluster)
+                output.write(struct.pack('<I', value))
+
+def check(path):
+    with ImageReader(path) as image:
+        volume = volumes(image)[0]
+        return checkVolume(volume, decode_fsinfo(image.fsinfo(volume.partition_lba, volume.boot_sector.fsinfo_sector)))
+
+def runCheck(path, capsys, monkeypatch):
+    monkeypatch.setattr(sys, 'argv', ['FAT32.py', '-i', path, '--check', '--fast'])
+    with pytest.raises(SystemExit):
+        cli.main()
+    return capsys.readouterr().out
+
+def test_clean_volume(clean_image, capsys, monkeypatch):
+    report = check(clean_image.path)
+    assert not len(report.cross_linked) and not len(report.shared_first_clusters)
+    assert not report.looping_clusters and not report.invalid_pointers and not report.lost_clusters
+    assert set(report.mirror_differences.values()) == {0}
+    assert report.fsinfo_free_clusters == report.actual_free_clusters
+    assert report.next_free_cluster_ok
+    assert "No problems found" in runCheck(clean_image.path, capsys, monkeypatch)
+
+def test_planted_loop(clean_copy, capsys, monkeypatch):
+    path, chain = chains(clean_copy)[0]
+    setEntries(clean_copy, {chain[-1]: chain[1]})     # The last cluster points back into the chain
+    report = check(clean_copy)
+    assert report.looping_clusters == len(chain)
+    assert set(report.loop_clusters.tolist()) <= set(chain[1:])
+    assert report.cross_linked.tolist() == [chain[1]]     # chain[1] is reached from chain[0] and from the last cluster
+    assert set(report.mirror_differences.values()) == {0}
+    output = runCheck(clean_copy, capsys, monkeypatch)
+    assert "chains that never end" in output and "problems found" in output
+
+def test_planted_cross_link(clean_copy, capsys, monkeypatch):
+    (_, first), (_, second) = chains(clean_copy)[:2]
+    setEntries(clean_copy, {first[-1]: second[1]})     # The end of one file continues into the middle of another
+    report = check(clean_copy)
+    assert report.cross_linked.tolist() == [second[1]]
+    assert not report.looping_clusters and not report.lost_clusters
+    output = runCheck(clean_copy, capsys, monkeypatch)
+    assert "1 cross-linked clusters" in output and "problems found" in output
+
+def test_planted_lost_chains(clean_copy):
+    _, chain = chains(clean_copy)[0]
+    free = check(clean_copy).actual_free_clusters
+    with ImageReader(clean_copy) as image:
+        fat = volumes(image)[0].fat
+        unused = [cluster for cluster in range(len(fat) - 1, 1, -1) if fat[cluster] == 0][:2]
+    # A chain allocated in free clusters, and the tail of a file cut off from its first cluster
+    setEntries(clean_copy, {unused[1]: unused[0], unused[0]: FAT_EOC, chain[0]: FAT_EOC})
+    report = check(clean_copy)
+    assert sorted(report.lost_chains.tolist()) == sorted([unused[1], chain[1]])
+    assert report.lost_clusters == 2 + len(chain) - 1
+    assert report.actual_free_clusters == free - 2
+    assert report.fsinfo_free_clusters == free
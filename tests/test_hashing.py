@@ -0,0 +1,29 @@
+import hashlib
+import os
+
+from fat32parser.hashing import hashVolume
+from fat32parser.image import ImageReader
+
+from conftest import volumes
+
+def test_hash_truncated_image(clean_copy, tmp_path):
+    with ImageReader(clean_copy) as image:
+        volume = volumes(image)[0]
+        files = [entry for entry in volume.walk() if not entry.is_directory and entry.size]
+        middle = files[len(files) // 2]
+        end = volume.cluster_offset(middle.first_cluster) + 100     # Cuts the image in the middle of a file
+        expected = {}     # The files of the clean image are contiguous: a file keeps its bytes before the cut
+        for number, entry in enumerate(files):
+            volume.extract(entry.first_cluster, entry.size, str(tmp_path / str(number)))
+            expected[entry.path] = (tmp_path / str(number)).read_bytes()[:max(0, end - volume.cluster_offset(entry.first_cluster))]
+    os.truncate(clean_copy, end)
+    with ImageReader(clean_copy) as image:
+        results = {entry.path: (entry, file_hash) for entry, file_hash in hashVolume(volumes(image)[0], ['md5', 'sha256'], jobs=2)}
+    truncated = 0
+    for path, data in expected.items():
+        entry, file_hash = results[path]
+        assert file_hash.hashed == len(data)
+        assert file_hash.truncated == (len(data) < entry.size)
+        assert file_hash.digests == [hashlib.md5(data).hexdigest(), hashlib.sha256(data).hexdigest()]
+        truncated += file_hash.truncated
+    assert results[middle.path][1].hashed == 100 and truncated > 1
@@ -0,0 +1,26 @@
+from fat32parser.directory import ATTR_DIRECTORY
+from fat32parser.recovery import scanDeleted
+from fat32parser.synthetic import file_name
+from fat32parser.timeline import timelineEntries
+
+def expectedName(short_name):
+    # Synthetic short names are 'F' + the file number in hexadecimal + 'BIN', the first byte is lost once deleted
+    return file_name(int(short_name[1:8], 16))
+
+def test_directories_span_several_runs(fragmented_volume):
+    fat = fragmented_volume.fat
+    directories = [fragmented_volume.boot_sector.root_cluster] + [entry.first_cluster for entry in fragmented_volume.walk() if entry.attributes & ATTR_DIRECTORY]
+    assert sum(len(fat.runs(cluster)) > 1 for cluster in directories) > 1
+
+def test_deleted_long_names_across_runs(fragmented_image, fragmented_volume):
+    deleted = [entry for entry, _ in scanDeleted(fragmented_volume)]
+    assert len(deleted) == fragmented_image.deleted
+    for entry in deleted:
+        assert entry.name == expectedName(entry.short_name), entry.path
+
+def test_timeline_long_names_across_runs(fragmented_volume):
+    live = sorted(entry.path for entry in fragmented_volume.walk())
+    deleted = sorted(entry.path for entry, _ in scanDeleted(fragmented_volume))
+    entries = list(timelineEntries(fragmented_volume))
+    assert sorted(entry.path for entry in entries if not entry.deleted) == live
+    assert sorted(entry.path for entry in entries if entry.deleted) == deleted
@@ -0,0 +1,47 @@
+import io
+import os
+import random
+
+from fat32parser import timeline
+from fat32parser.image import ImageReader
+from fat32parser.timeline import ExternalSort, writeTimeline
+
+from conftest import volumes
+
+def randomLines(count, seed=1):
+    rng = random.Random(seed)
+    alphabet = "abcXYZ019 ,|\"-éß中\U0001f600"
+    return ["".join(rng.choice(alphabet) for _ in range(rng.randint(0, 40))) + "\n" for _ in range(count)]
+
+def test_external_sort_tiny_budget(tmp_path, monkeypatch):
+    monkeypatch.setattr(timeline, 'MIN_MEMORY_BUDGET', 0)
+    monkeypatch.setattr(timeline, 'MAX_MERGE_RUNS', 4)      # Several merge passes
+    lines = randomLines(5000)
+    with ExternalSort(memory_budget=2000, directory=str(tmp_path)) as sorter:
+        for line in lines:
+            sorter.add(line)
+        assert sorter.spilled > 4*4
+        assert list(sorter) == sorted(lines)
+        assert len(sorter.runs) < 4
+    assert os.listdir(tmp_path) == []
+
+def test_external_sort_in_memory(tmp_path):
+    lines = randomLines(500, seed=2)
+    with ExternalSort(directory=str(tmp_path)) as sorter:
+        for line in lines:
+            sorter.add(line)
+        assert list(sorter) == sorted(lines)
+        assert sorter.spilled == 0
+    assert os.listdir(tmp_path) == []
+
+def test_timeline_tiny_budget(fragmented_image, tmp_path, monkeypatch):
+    with ImageReader(fragmented_image.path) as image:
+        in_memory = io.StringIO()
+        reference = writeTimeline(volumes(image), in_memory)
+        monkeypatch.setattr(timeline, 'MIN_MEMORY_BUDGET', 0)
+        on_disk = io.StringIO()
+        result = writeTimeline(volumes(image), on_disk, memory_budget=4096, temporary_directory=str(tmp_path))
+    assert reference[2] == 0 and result[2] > timeline.MAX_MERGE_RUNS
+    assert result[:2] == reference[:2]
+    assert on_disk.getvalue() == in_memory.getvalue()
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,45 @@
+import json
+import os
+import shutil
+import sys
+
+import pytest
+
+from fat32parser import cli
+from fat32parser.analysis import imageAnalysis
+from fat32parser.image import ImageReader
+from fat32parser.partitions import discoverPartitions
+from fat32parser.structures import decode_mbr
+
+from conftest import volumes
+
+@pytest.fixture
+def truncated_image(multi_image, tmp_path):
+    # The image ends where its second partition starts: the partition table points past the end of the image
+    path = str(tmp_path / 'truncated.img')
+    shutil.copyfile(multi_image.path, path)
+    os.truncate(path, multi_image.partitions[1]*512)
+    return path
+
+def test_partition_beyond_the_end(truncated_image):
+    with ImageReader(truncated_image) as image:
+        table = discoverPartitions(image, decode_mbr(image.mbr()))
+        assert [partition.number for partition in table.partitions] == [1, 2]
+        assert [warning.field for warning in table.warnings] == ['partitions[2].start_lba']
+        assert [volume.number for volume in volumes(image)] == [1]
+    analysis = imageAnalysis(truncated_image, scan=True)
+    assert [partition.number for partition in analysis.partitions] == [1]
+    assert 'partitions[2].start_lba' in [warning.field for warning in analysis.warnings]
+
+@pytest.mark.parametrize('options', [[], ['--check'], ['--tree'], ['--format', 'json']])
+def test_modes_skip_the_partition(truncated_image, options, capsys, monkeypatch):
+    monkeypatch.setattr(sys, 'argv', ['FAT32.py', '-i', truncated_image, '--fast'] + options)
+    with pytest.raises(SystemExit) as exit:
+        cli.main()
+    assert not exit.value.code
+    output = capsys.readouterr()
+    if options[:1] == ['--format']:
+        assert [partition['number'] for partition in json.loads(output.out)['partitions']] == [1]
+    else:
+        assert "Partition 1" in output.out
+        assert "Partition 2 starts at sector" in output.out + output.err